@@ -1,9 +1,20 @@
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, DECIMAL, MetaData, Table
-from sqlalchemy.schema import ForeignKeyConstraint
-from sqlalchemy.dialects import mysql
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import create_engine, bindparam, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from collections import deque
+from multiprocessing import Manager
+from datetime import datetime
+import argparse
+import hashlib
+import os
 import re
+import time
+from migrations import run_migrations
+from player_identity import LEGACY_ID_ALIAS, NAME_BIRTH_ALIAS, PlayerResolver, fetch_register, load_register
+from schema import STAT_KEY_COLUMNS, metadata
+from season_aggregates import ALL, AGGREGATED_STATS, MULTI_TEAM_PATTERN, PA_COMPONENTS, QUANTILES, RATE_STATS, primary_position
 
 DB_CONFIG = {
     'host':'127.0.0.1',
@@ -15,6 +26,118 @@ DB_CONFIG = {
 
 CSV_FILE_PATH = '2025MLB_STD_Batting.csv'
 
+# Number of rows written per transaction
+DEFAULT_CHUNK_SIZE = 5000
+
+# Number of CSV rows parsed and cleaned at a time; bounds the loader's memory
+DEFAULT_READ_CHUNK_SIZE = 100000
+
+# Season assumed when neither the CSV nor its file name provides one
+FALLBACK_SEASON = 2023
+
+# MySQL error codes for deadlocks / lock wait timeouts, which are retried
+RETRYABLE_MYSQL_ERRORS = (1213, 1205)
+TRANSACTION_ATTEMPTS = 5
+
+# Baseball-Reference export headers -> database schema column names
+COLUMN_RENAMES = {
+    'Player': 'player_name',
+    'Player-additional': 'bbref_id', # Baseball-Reference player ID, used for identity resolution
+    'Team': 'team',
+    'Lg': 'lg',
+    'G': 'games_played',
+    'PA': 'plate_appearances', # Not directly used in DB schema, but useful if needed later
+    'AB': 'at_bats',
+    'R': 'runs',
+    'H': 'hits',
+    '2B': 'doubles',
+    '3B': 'triples',
+    'HR': 'home_runs',
+    'RBI': 'rbi',
+    'SB': 'sb',
+    'CS': 'cs',
+    'BB': 'walks',
+    'SO': 'strikeouts',
+    'BA': 'batting_average', # Not directly used in DB schema, but useful if needed later
+    'OBP': 'obp',
+    'SLG': 'slg',
+    'OPS': 'ops',
+    'OPS+': 'ops_plus',
+    'rOBA': 'roba',
+    'Rbat+': 'rbat_plus',
+    'TB': 'tb',
+    'GIDP': 'gidp',
+    'HBP': 'hbp',
+    'SH': 'sh',
+    'SF': 'sf',
+    'IBB': 'ibb',
+    'Pos': 'position_played',
+    'WAR': 'war',
+    'Age': 'age' # Add age for potential future use or to infer season
+}
+
+# Cleaning spec: every column the loader keeps, mapped to its kind.
+# Columns missing from a CSV are skipped; all other CSV columns are dropped.
+COLUMN_SPEC = {
+    'player_name': 'string',
+    'bbref_id': 'string',
+    'team': 'string',
+    'lg': 'string',
+    'position_played': 'string',
+    'season': 'int',
+    'age': 'int',
+    'games_played': 'int',
+    'at_bats': 'int',
+    'runs': 'int',
+    'hits': 'int',
+    'doubles': 'int',
+    'triples': 'int',
+    'home_runs': 'int',
+    'rbi': 'int',
+    'walks': 'int',
+    'strikeouts': 'int',
+    'sb': 'int',
+    'cs': 'int',
+    'tb': 'int',
+    'gidp': 'int',
+    'hbp': 'int',
+    'sh': 'int',
+    'sf': 'int',
+    'ibb': 'int',
+    'obp': 'decimal',
+    'slg': 'decimal',
+    'ops': 'decimal',
+    'war': 'decimal',
+    'ops_plus': 'decimal',
+    'roba': 'decimal',
+    'rbat_plus': 'decimal'
+}
+
+# Column kind -> (dtype, value used for missing/invalid entries).
+# Counting stats fit comfortably in int32, halving their memory.
+CLEAN_KINDS = {
+    'int': ('int32', 0),
+    'decimal': ('float64', 0.0),
+    'string': (object, 'N/A')
+}
+
+# Columns written to the player_stats table, in insert order
+STAT_COLUMNS = [
+    'player_id', 'season', 'team', 'games_played', 'at_bats', 'runs', 'hits',
+    'doubles', 'triples', 'home_runs', 'rbi', 'walks', 'strikeouts', 'obp',
+    'slg', 'ops', 'war', 'sb', 'cs', 'ops_plus', 'roba', 'rbat_plus', 'tb',
+    'gidp', 'hbp', 'sh', 'sf', 'ibb', 'position_played', 'lg'
+]
+
+# DECIMAL columns and their scale; values are rounded to it before hashing so
+# the hash matches what the database actually stores
+DECIMAL_SCALES = {
+    'obp': 3, 'slg': 3, 'ops': 3, 'war': 2, 'ops_plus': 1, 'roba': 3, 'rbat_plus': 1
+}
+
+# Columns covered by row_hash: everything stored except the key
+HASHED_COLUMNS = [col for col in STAT_COLUMNS if col not in STAT_KEY_COLUMNS]
+
 def generate_player_id(player_name, age=None, team=None, season=None):
     """
     Generates a slug-like player_id from the player's name.
@@ -32,7 +155,7 @@ def generate_player_id(player_name, age=None, team=None, season=None):
     parts = [name_slug]
     if age is not None:
         parts.append(str(age))
-    if team and str(team).strip() != 'N/A': 
+    if team and str(team).strip() != 'N/A':
         parts.append(str(team).lower().replace(' ', '_'))
     if season is not None:
         parts.append(str(season))
@@ -40,68 +163,420 @@ def generate_player_id(player_name, age=None, team=None, season=None):
     full_id = "_".join(parts)
     return full_id[:50] # Truncate to ensure it fits VARCHAR(50)
 
-# --- Function to create SQLAlchemy engine and define tables ---
-def setup_database_schema(db_config):
+def build_db_url(db_config):
     """
-    Sets up the SQLAlchemy engine and defines the table schemas.
+    Builds the SQLAlchemy URL for the MySQL database described by db_config.
     """
-    db_url = f"mysql+pymysql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-    engine = create_engine(db_url, echo=False) 
+    return f"mysql+pymysql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
 
-    metadata = MetaData()
-
-    # Define the players table
-    players_table = Table(
-        'players', metadata,
-        Column('player_id', String(50), primary_key=True),
-        Column('player_name', String(255), nullable=False),
-        Column('primary_position', String(50), nullable=True),
-        Column('mlb_debut_year', Integer, nullable=True)
-    )
+# --- Function to create SQLAlchemy engine and ensure the tables exist ---
+def setup_database_schema(db_config, db_url=None, pool_size=None):
+    """
+    Sets up the SQLAlchemy engine and creates the tables defined in schema.py.
+    If db_url is given it is used instead of the MySQL URL built from db_config
+    (e.g. "sqlite:///local.db" for a local stand-in database). pool_size caps
+    the engine at that many connections (no overflow).
+    """
+    engine_options = {'pool_size': pool_size, 'max_overflow': 0} if pool_size else {}
+    engine = create_engine(db_url or build_db_url(db_config), echo=False, **engine_options)
 
-    # Define the player_stats table
-    player_stats_table = Table(
-        'player_stats', metadata,
-        Column('stat_id', Integer, primary_key=True, autoincrement=True),
-        Column('player_id', String(50), nullable=False),
-        Column('season', Integer, nullable=False),
-        Column('team', String(10), nullable=False),
-        Column('games_played', Integer, nullable=True),
-        Column('at_bats', Integer, nullable=True),
-        Column('runs', Integer, nullable=True),
-        Column('hits', Integer, nullable=True),
-        Column('doubles', Integer, nullable=True),
-        Column('triples', Integer, nullable=True),
-        Column('home_runs', Integer, nullable=True),
-        Column('rbi', Integer, nullable=True),
-        Column('walks', Integer, nullable=True),
-        Column('strikeouts', Integer, nullable=True),
-        Column('obp', DECIMAL(5,3), nullable=True),
-        Column('slg', DECIMAL(5,3), nullable=True),
-        Column('ops', DECIMAL(5,3), nullable=True),
-        Column('war', DECIMAL(5,2), nullable=True),
-        Column('sb', Integer, nullable=True),
-        Column('cs', Integer, nullable=True),
-        Column('ops_plus', DECIMAL(5,1), nullable=True),
-        Column('roba', DECIMAL(5,3), nullable=True),
-        Column('rbat_plus', DECIMAL(5,1), nullable=True),
-        Column('tb', Integer, nullable=True),
-        Column('gidp', Integer, nullable=True),
-        Column('hbp', Integer, nullable=True),
-        Column('sh', Integer, nullable=True),
-        Column('sf', Integer, nullable=True),
-        Column('ibb', Integer, nullable=True),
-        Column('position_played', String(50), nullable=True),
-        Column('lg', String(10), nullable=True),
-        ForeignKeyConstraint(['player_id'], ['players.player_id']) # Foreign key constraint
-    )
     try:
         metadata.create_all(engine)
+        run_migrations(engine)
         print("Database tables ensured to exist.")
     except SQLAlchemyError as e:
         print(f"Error creating tables: {e}")
 
-    return engine, players_table, player_stats_table
+    return engine, metadata.tables
+
+def slugify_names(names):
+    """
+    Vectorized name part of generate_player_id(). The regexes run once per
+    distinct name and are mapped back with the factorized codes, since names
+    repeat heavily across seasons and teams.
+    """
+    codes, uniques = pd.factorize(names, use_na_sentinel=False)
+    slugs = (pd.Series(uniques, dtype=object).str.strip().str.lower()
+             .str.replace(r'[^a-z0-9\s]', '', regex=True)
+             .str.replace(r'\s+', '_', regex=True))
+    return pd.Series(slugs.to_numpy()[codes], index=names.index)
+
+def generate_player_ids(df):
+    """
+    Vectorized generate_player_id(): builds the same slug IDs for a whole
+    cleaned DataFrame with pandas .str operations instead of a per-row apply.
+    """
+    slug = slugify_names(df['player_name'])
+    if 'age' in df.columns:
+        slug = slug + '_' + df['age'].astype(str)
+    if 'team' in df.columns:
+        # Teams are few, so the suffix is likewise built per distinct value
+        codes, teams = pd.factorize(df['team'])
+        teams = pd.Series(teams, dtype=object)
+        suffixes = ('_' + teams.str.lower().str.replace(' ', '_', regex=False)).where(
+            (teams != '') & (teams.str.strip() != 'N/A'), ''
+        )
+        slug = slug + suffixes.to_numpy()[codes]
+    if 'season' in df.columns:
+        slug = slug + '_' + df['season'].astype(str)
+    return slug.str[:50] # Truncate to ensure it fits VARCHAR(50)
+
+def clean_column(values, kind):
+    """
+    Coerces one raw CSV column according to its COLUMN_SPEC kind: numbers are
+    parsed (invalid values become the fill value) and cast to the kind's dtype,
+    strings get missing values filled.
+    """
+    dtype, fill_value = CLEAN_KINDS[kind]
+    if kind == 'string':
+        return values.fillna(fill_value).astype(str)
+    return pd.to_numeric(values, errors='coerce').fillna(fill_value).astype(dtype)
+
+def clean_batting_dataframe(df, season=None):
+    """
+    Renames the Baseball-Reference columns to the database schema, coerces the
+    columns listed in COLUMN_SPEC and generates a player_id for every row.
+    Columns not in COLUMN_SPEC are dropped, so the result holds one compact
+    array per column the loader needs. season is used when the CSV has no
+    'season' column.
+    Returns the cleaned DataFrame (rows without a usable player_id are dropped).
+    """
+    # Rename columns to match database schema conventions where necessary
+    df = df.rename(columns=COLUMN_RENAMES)
+
+    if 'season' not in df.columns:
+        if season is None:
+            print(f"Warning: 'season' column not found. Assuming data is for {FALLBACK_SEASON}. Please verify.")
+            season = FALLBACK_SEASON
+        df['season'] = season
+
+    # Build the cleaned frame in one step from the converted columns
+    df = pd.DataFrame(
+        {col: clean_column(df[col], kind) for col, kind in COLUMN_SPEC.items() if col in df.columns},
+        index=df.index
+    )
+
+    # Generate player_id for each row using multiple columns for uniqueness
+    df['player_id'] = generate_player_ids(df)
+
+    # Drop rows where player_id could not be generated (e.g., missing name after string conversion)
+    df.dropna(subset=['player_id', 'player_name'], inplace=True)
+    return df
+
+def dedupe_stat_lines(df):
+    """
+    Keeps only the first row for each (player_id, season, team, lg) key so a
+    load never writes the same stat line twice.
+    """
+    duplicated = df.duplicated(subset=STAT_KEY_COLUMNS, keep='first')
+    if duplicated.any():
+        print(f"Warning: dropping {int(duplicated.sum())} duplicate stat lines from the input.")
+        df = df[~duplicated]
+    return df
+
+def drop_seen_stat_lines(df, seen):
+    """
+    Drops stat lines whose key an earlier chunk or file of this run already
+    had, keeping the first like IncrementalStatSync does, and adds df's keys
+    to seen. Also catches lines that only collide after identity resolution.
+    """
+    fresh = []
+    for key in zip(*(df[col].tolist() for col in STAT_KEY_COLUMNS)):
+        fresh.append(key not in seen)
+        seen.add(key)
+    if not all(fresh):
+        print(f"Warning: skipping {fresh.count(False)} duplicate stat lines already loaded in this run.")
+        df = df[fresh]
+    return df
+
+def add_row_hashes(df):
+    """
+    Adds a 'row_hash' column: the SHA-1 of the hashed stat columns, rendered
+    the way they are stored (decimals at their column scale).
+    """
+    rendered = None
+    for col in HASHED_COLUMNS:
+        if col in DECIMAL_SCALES:
+            values = (df[col] * 10 ** DECIMAL_SCALES[col]).round().astype('int64').astype(str)
+        else:
+            values = df[col].astype(str)
+        rendered = values if rendered is None else rendered + '|' + values
+    df = df.copy()
+    df['row_hash'] = [hashlib.sha1(line.encode('utf-8')).hexdigest() for line in rendered]
+    return df
+
+def expand_csv_paths(paths):
+    """
+    Expands the given files and directories into a sorted list of CSV files
+    (a directory contributes every *.csv directly inside it).
+    """
+    csv_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            csv_paths.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.csv')
+            ))
+        else:
+            csv_paths.append(path)
+    return csv_paths
+
+def infer_season_from_path(path):
+    """
+    Returns the season a file name starts with (e.g. 2025 for
+    "2025MLB_STD_Batting.csv"), or None.
+    """
+    match = re.match(r'((?:18|19|20)\d{2})(?!\d)', os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+def csv_usecols(column):
+    """
+    read_csv() column filter: only parse the columns the loader keeps.
+    """
+    return column in COLUMN_RENAMES or column in COLUMN_SPEC
+
+def read_clean_chunks(path, read_chunk_size=DEFAULT_READ_CHUNK_SIZE):
+    """
+    Streams a batting CSV in chunks of read_chunk_size rows, yielding each
+    chunk renamed, cleaned, de-duplicated and hashed. Only one chunk is held
+    in memory at a time.
+    """
+    season = infer_season_from_path(path)
+    reader = pd.read_csv(path, chunksize=read_chunk_size, usecols=csv_usecols)
+    for index, raw in enumerate(reader):
+        if index == 0 and 'season' not in raw.columns:
+            if season is None:
+                print(f"Warning: 'season' column not found in {path}. Assuming data is for {FALLBACK_SEASON}. Please verify.")
+                season = FALLBACK_SEASON
+            else:
+                print(f"No 'season' column in {path}; using {season} from the file name.")
+        df = clean_batting_dataframe(raw, season)
+        if not df.empty:
+            yield add_row_hashes(dedupe_stat_lines(df))
+
+def file_sha256(path):
+    """
+    Returns the SHA-256 of a file's contents, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def find_ingested_file(connection, ingested_files_table, sha256):
+    """
+    Returns the most recent manifest row for a file with this content hash, if any.
+    """
+    s = ingested_files_table.select().where(
+        ingested_files_table.c.file_sha256 == sha256
+    ).order_by(ingested_files_table.c.file_id.desc())
+    return connection.execute(s).first()
+
+def record_ingested_file(connection, ingested_files_table, path, sha256, row_count, seasons, summary):
+    """
+    Adds a manifest row describing a completed load.
+    """
+    connection.execute(ingested_files_table.insert().values(
+        file_name=os.path.basename(path),
+        file_sha256=sha256,
+        seasons=','.join(str(season) for season in sorted(seasons)),
+        row_count=row_count,
+        rows_inserted=summary['inserted'],
+        rows_updated=summary['updated'],
+        rows_deleted=summary['deleted'],
+        rows_unchanged=summary['unchanged'],
+        loaded_at=datetime.utcnow()
+    ))
+    connection.commit()
+
+def bump_season_versions(connection, season_versions_table, seasons):
+    """
+    Increments the version (and updated_at) of every season whose stat
+    lines changed, so API caches of those seasons are invalidated.
+    """
+    seasons = sorted(seasons)
+    if not seasons:
+        return
+    t = season_versions_table
+    now = datetime.utcnow()
+
+    def bump():
+        existing = {row.season for row in connection.execute(t.select().where(t.c.season.in_(seasons)))}
+        if existing:
+            connection.execute(t.update().where(t.c.season.in_(existing)).values(
+                version=t.c.version + 1, updated_at=now
+            ))
+        missing = [season for season in seasons if season not in existing]
+        if missing:
+            connection.execute(t.insert(), [{'season': season, 'version': 1, 'updated_at': now} for season in missing])
+
+    write_transaction(connection, bump)
+
+def primary_positions(position_played):
+    """
+    Vectorized season_aggregates.primary_position(), run once per distinct
+    position string.
+    """
+    codes, uniques = pd.factorize(position_played.fillna('N/A'))
+    mapped = [primary_position(value) for value in uniques]
+    return pd.Series(pd.Series(mapped, dtype=object).to_numpy()[codes], index=position_played.index)
+
+def group_summary(df, keys):
+    """
+    Summarizes every stat over the groups of df defined by keys, as a long
+    DataFrame with one row per (group, stat): count, total, mean, sample
+    standard deviation, min/max, quantiles and league_rate. For counting
+    stats league_rate is the group's total per plate appearance; for rate
+    stats it is the plate-appearance weighted mean (the "league average").
+    """
+    grouped = df.groupby(keys)[AGGREGATED_STATS]
+    parts = {
+        'n': grouped.count(),
+        'total': grouped.sum(),
+        'mean': grouped.mean(),
+        'stddev': grouped.std(),
+        'min_value': grouped.min(),
+        'max_value': grouped.max()
+    }
+    quantiles = grouped.quantile([q for _, q in QUANTILES])
+    for column, q in QUANTILES:
+        parts[column] = quantiles.xs(q, level=-1)
+
+    pa_total = df.groupby(keys)['pa'].sum()
+    league_rate = parts['total'].div(pa_total, axis=0)
+    weighted = df[RATE_STATS].mul(df['pa'], axis=0).groupby([df[key] for key in keys]).sum()
+    league_rate[RATE_STATS] = weighted.div(pa_total, axis=0)
+    parts['league_rate'] = league_rate
+
+    # stack() drops NaN cells; 'n' has none, so concat restores them as NaN
+    long = pd.concat({name: part.stack() for name, part in parts.items()}, axis=1)
+    long.index = long.index.set_names(keys + ['stat'])
+    return long.reset_index()
+
+def compute_season_aggregates(df):
+    """
+    Builds aggregate rows (dicts) from a DataFrame of player_stats lines,
+    which may span several seasons. Groups are (season, lg, position) plus
+    the '*' rollups over all leagues and/or all positions. Traded players'
+    combined "2TM" lines are left out (their per-team lines are already
+    counted), as are lines without a plate appearance.
+    """
+    df = df[~df['team'].astype(str).str.match(MULTI_TEAM_PATTERN)].copy()
+    for stat in AGGREGATED_STATS:
+        if stat != 'pa':
+            df[stat] = pd.to_numeric(df[stat], errors='coerce').astype(float)
+    df['pa'] = df[PA_COMPONENTS].fillna(0).sum(axis=1)
+    df = df[df['pa'] > 0]
+    if df.empty:
+        return []
+    df['position'] = primary_positions(df['position_played'])
+    df['lg'] = df['lg'].fillna('N/A')
+
+    frames = []
+    for keys in [['lg', 'position'], ['lg'], ['position'], []]:
+        summary = group_summary(df, ['season'] + keys)
+        for key in ['lg', 'position']:
+            if key not in keys:
+                summary[key] = ALL
+        frames.append(summary)
+    result = pd.concat(frames, ignore_index=True)
+    result = result[result['n'] > 0]
+    result['season'] = result['season'].astype(int)
+    result['n'] = result['n'].astype(int)
+    # NaN (e.g. the stddev of a one-player group) is stored as NULL
+    result = result.astype(object).where(result.notna(), None)
+    return result.to_dict('records')
+
+def load_known_aliases(connection, player_aliases_table):
+    """
+    The name|birth-year aliases recorded by earlier loads, as {alias: player_id}.
+    """
+    t = player_aliases_table
+    rows = connection.execute(select(t.c.alias, t.c.player_id).where(t.c.alias_type == NAME_BIRTH_ALIAS))
+    return {alias: player_id for alias, player_id in rows}
+
+def save_player_identities(connection, players_table, player_stats_table, player_aliases_table,
+                           player_contracts_table, resolver, reloaded_seasons=()):
+    """
+    Writes what identity resolution found during the load in one transaction:
+    upserts the new aliases, backfills players.mlbam_id where it is still
+    empty, moves contracts filed under legacy IDs to the canonical player and
+    deletes players rows left under legacy IDs that no longer have any stat
+    lines. Returns the number of players rows deleted.
+
+    'bulk' and 'row' mode never delete stat lines, so they pass the seasons
+    the run loaded in full as reloaded_seasons: lines of those seasons still
+    filed under a legacy ID were just loaded again under the canonical one
+    and are deleted first, as 'sync' mode's deletes already did.
+    """
+    now = datetime.utcnow()
+    aliases = [{'alias_type': alias_type, 'alias': alias, 'player_id': player_id,
+                'source': source, 'score': score, 'created_at': now}
+               for (alias_type, alias), (player_id, source, score) in sorted(resolver.new_aliases.items())]
+    mlbam_ids = [{'b_player_id': player_id, 'mlbam_id': mlbam_id}
+                 for player_id, mlbam_id in sorted(resolver.mlbam_ids.items())]
+    a, p, st, c = player_aliases_table, players_table, player_stats_table, player_contracts_table
+
+    def save():
+        if aliases:
+            stmt = upsert_statement(connection, a, ['alias_type', 'alias'], ['player_id', 'source', 'score'])
+            connection.execute(stmt, aliases)
+        if mlbam_ids:
+            connection.execute(p.update().where(
+                (p.c.player_id == bindparam('b_player_id')) & p.c.mlbam_id.is_(None)
+            ).values(mlbam_id=bindparam('mlbam_id')), mlbam_ids)
+        legacy_ids = select(a.c.alias).where(a.c.alias_type == LEGACY_ID_ALIAS)
+        if reloaded_seasons:
+            connection.execute(st.delete().where(
+                st.c.player_id.in_(legacy_ids) & st.c.season.in_(sorted(reloaded_seasons))
+            ))
+        # Contracts are loaded outside this repo and reference players, so they
+        # must follow their player before the legacy players row goes away
+        canonical_id = select(a.c.player_id).where(
+            (a.c.alias_type == LEGACY_ID_ALIAS) & (a.c.alias == c.c.player_id)
+        ).scalar_subquery()
+        connection.execute(c.update().where(c.c.player_id.in_(legacy_ids)).values(player_id=canonical_id))
+        return connection.execute(p.delete().where(
+            p.c.player_id.in_(legacy_ids) & ~p.c.player_id.in_(select(st.c.player_id).distinct())
+        )).rowcount
+
+    return write_transaction(connection, save)
+
+def resolve_player_ids(df, resolver):
+    """
+    Identity resolution stage: replaces the generated player_ids of a
+    cleaned DataFrame with canonical ones (unchanged if resolver is None).
+    Two lines can collapse onto one key, so the result is de-duplicated again.
+    """
+    if resolver is None or df is None:
+        return df
+    return dedupe_stat_lines(resolver.resolve(df))
+
+def refresh_season_aggregates(connection, player_stats_table, season_aggregates_table, seasons):
+    """
+    Recomputes the season_aggregates rows of the given seasons from their
+    stat lines and replaces the old rows in one transaction. Seasons are
+    independent, so only the seasons a load changed need refreshing.
+    """
+    seasons = sorted(seasons)
+    if not seasons:
+        return 0
+    t = player_stats_table
+    columns = ['season', 'team', 'lg', 'position_played'] + [col for col in AGGREGATED_STATS if col != 'pa']
+    df = pd.read_sql(select(*[t.c[col] for col in columns]).where(t.c.season.in_(seasons)), connection)
+    rows = compute_season_aggregates(df)
+    now = datetime.utcnow()
+    for row in rows:
+        row['updated_at'] = now
+    a = season_aggregates_table
+
+    def replace():
+        connection.execute(a.delete().where(a.c.season.in_(seasons)))
+        if rows:
+            connection.execute(a.insert(), rows)
+
+    write_transaction(connection, replace)
+    return len(rows)
 
 # Function to insert data into players table
 def insert_player(connection, players_table, player_id, player_name):
@@ -124,7 +599,7 @@ def insert_player(connection, players_table, player_id, player_name):
             print(f"Inserted new player: {player_name} (ID: {player_id})")
         except SQLAlchemyError as e:
             print(f"Error inserting player {player_name} (ID: {player_id}): {e}")
-            connection.rollback() 
+            connection.rollback()
 
 
 # Function to insert data into player_stats table
@@ -141,152 +616,519 @@ def insert_player_stat(connection, player_stats_table, stat_data):
         print(f"Error inserting stats for {stat_data['player_id']} in season {stat_data['season']} (Team: {stat_data['team']}): {e}")
         connection.rollback()
 
+def load_row_by_row(connection, players_table, player_stats_table, df):
+    """
+    Original ingestion path: one players lookup/insert and one player_stats
+    insert (each with its own commit) per DataFrame row.
+    """
+    for index, row in df.iterrows():
+        # Insert into players table first
+        insert_player(connection, players_table, row['player_id'], row['player_name'])
+        stat_data = {col: row[col] for col in STAT_COLUMNS + ['row_hash']}
+        insert_player_stat(connection, player_stats_table, stat_data)
+
+def column_records(df, columns):
+    """
+    Builds a list of row dicts for executemany() from whole DataFrame columns.
+    Column.tolist() converts numpy scalars to native Python types in one pass,
+    which the DB driver needs and which is far cheaper than iterrows().
+    """
+    arrays = [df[col].tolist() for col in columns]
+    return [dict(zip(columns, values)) for values in zip(*arrays)]
+
+def upsert_statement(connection, table, conflict_columns, update_columns):
+    """
+    Returns a batched INSERT ... ON DUPLICATE KEY UPDATE for MySQL
+    (INSERT ... ON CONFLICT DO UPDATE on a SQLite stand-in) for the given table.
+    """
+    if connection.dialect.name == 'sqlite':
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={col: stmt.excluded[col] for col in update_columns}
+        )
+    stmt = mysql.insert(table)
+    return stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in update_columns})
+
+def write_transaction(connection, work, attempts=TRANSACTION_ATTEMPTS):
+    """
+    Runs work() and commits. Deadlocks and lock wait timeouts (which
+    concurrent loaders can hit when they touch the same players rows) are
+    rolled back and retried with exponential backoff; other errors are rolled
+    back and re-raised.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            result = work()
+            connection.commit()
+            return result
+        except OperationalError as e:
+            connection.rollback()
+            code = e.orig.args[0] if e.orig is not None and e.orig.args else None
+            if code not in RETRYABLE_MYSQL_ERRORS or attempt == attempts:
+                raise
+            print(f"Transaction hit MySQL error {code}; retrying ({attempt}/{attempts - 1})")
+            time.sleep(0.1 * 2 ** (attempt - 1))
+        except SQLAlchemyError:
+            connection.rollback()
+            raise
+
+def upsert_players(connection, players_table, df):
+    """
+    Upserts the distinct (player_id, player_name) pairs of df into 'players'
+    with a single batched statement. Rows are sent in player_id order so
+    concurrent loaders lock them in the same order.
+    """
+    players = df[['player_id', 'player_name']].drop_duplicates(subset='player_id', keep='last')
+    players = players.sort_values('player_id')
+    if players.empty:
+        return 0
+    stmt = upsert_statement(connection, players_table, ['player_id'], ['player_name'])
+    connection.execute(stmt, column_records(players, ['player_id', 'player_name']))
+    return len(players)
+
+def bulk_load(connection, players_table, player_stats_table, df, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Set-based ingestion path. For every chunk of chunk_size rows the players
+    are upserted in one statement, the stat lines are upserted on their
+    (player_id, season, team, lg) key with a single executemany() and the
+    transaction is committed once. df must already carry row hashes.
+    Returns the number of player_stats rows written.
+    """
+    stats_upsert = upsert_statement(connection, player_stats_table, STAT_KEY_COLUMNS,
+                                    HASHED_COLUMNS + ['row_hash'])
+    rows_written = 0
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        records = column_records(chunk, STAT_COLUMNS + ['row_hash'])
+
+        def write_chunk():
+            upsert_players(connection, players_table, chunk)
+            connection.execute(stats_upsert, records)
+
+        write_transaction(connection, write_chunk)
+        rows_written += len(chunk)
+        print(f"Committed {rows_written}/{len(df)} stat rows")
+    return rows_written
+
+class IncrementalStatSync:
+    """
+    Diffs incoming stat lines against player_stats and writes only what
+    changed: new keys are inserted, keys whose row_hash differs are updated in
+    place (keeping their stat_id) and, once finish() is called, keys that
+    exist for a loaded season but were not seen in the input are deleted.
+    Existing keys and hashes are read once per season, on first use. One
+    instance can span several apply() calls (chunks and files) so deletions
+    are only decided once the whole input has been seen.
+    """
+
+    def __init__(self, connection, players_table, player_stats_table, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.players_table = players_table
+        self.player_stats_table = player_stats_table
+        self.chunk_size = chunk_size
+        self.existing = {}  # key tuple -> (stat_id, row_hash) for loaded seasons
+        self.loaded_seasons = set()
+        self.seen = set()
+        self.protected_seasons = set()
+        self.deleted_by_season = {}
+        self.summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+        t = player_stats_table
+        self.insert_stmt = t.insert()
+        self.update_stmt = t.update().where(t.c.stat_id == bindparam('b_stat_id')).values(
+            {col: bindparam(col) for col in HASHED_COLUMNS + ['row_hash']}
+        )
+        self.delete_stmt = t.delete().where(t.c.stat_id == bindparam('b_stat_id'))
+
+    def _load_existing(self, seasons):
+        t = self.player_stats_table
+        missing = sorted(set(seasons) - self.loaded_seasons)
+        if not missing:
+            return
+        s = t.select().with_only_columns(
+            t.c.stat_id, t.c.row_hash, *[t.c[col] for col in STAT_KEY_COLUMNS]
+        ).where(t.c.season.in_(missing))
+        for row in self.connection.execute(s):
+            key = tuple(row._mapping[col] for col in STAT_KEY_COLUMNS)
+            self.existing[key] = (row.stat_id, row.row_hash)
+        self.loaded_seasons.update(missing)
+
+    def protect_seasons(self, seasons):
+        """
+        Excludes seasons from deletion, e.g. those of a file that was skipped
+        because it had already been ingested.
+        """
+        self.protected_seasons.update(seasons)
+
+    def diff(self, chunk):
+        """
+        Splits chunk (which must carry row hashes) into (inserts, updates,
+        unchanged count) against the database, marking its keys as seen. A
+        key already seen by an earlier call is skipped, matching
+        dedupe_stat_lines(). Only diff() touches the shared state, so writes
+        can then run on other connections.
+        """
+        self._load_existing(chunk['season'].unique().tolist())
+        inserts, updates, unchanged = [], [], 0
+        for record in column_records(chunk, STAT_COLUMNS + ['row_hash']):
+            key = tuple(record[col] for col in STAT_KEY_COLUMNS)
+            if key in self.seen:
+                print(f"Warning: skipping duplicate stat line {key}.")
+                continue
+            self.seen.add(key)
+            current = self.existing.get(key)
+            if current is None:
+                inserts.append(record)
+            elif current[1] != record['row_hash']:
+                record['b_stat_id'] = current[0]
+                updates.append(record)
+            else:
+                unchanged += 1
+        return inserts, updates, unchanged
+
+    def write(self, connection, chunk, inserts, updates):
+        """
+        Writes one diffed chunk in a single transaction on connection.
+        """
+        if not inserts and not updates:
+            return
+
+        def write_chunk():
+            upsert_players(connection, self.players_table, chunk)
+            if inserts:
+                connection.execute(self.insert_stmt, inserts)
+            if updates:
+                connection.execute(self.update_stmt, updates)
+
+        write_transaction(connection, write_chunk)
+
+    def record(self, inserts, updates, unchanged):
+        """
+        Adds a written chunk to the run summary and returns its counts.
+        """
+        counts = {'inserted': len(inserts), 'updated': len(updates), 'unchanged': unchanged}
+        for name, count in counts.items():
+            self.summary[name] += count
+        return counts
+
+    def apply(self, df):
+        """
+        Inserts or updates the stat lines of df on this instance's
+        connection, committing once per chunk. Returns the counts for df.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        for start in range(0, len(df), self.chunk_size):
+            chunk = df.iloc[start:start + self.chunk_size]
+            inserts, updates, unchanged = self.diff(chunk)
+            self.write(self.connection, chunk, inserts, updates)
+            for name, count in self.record(inserts, updates, unchanged).items():
+                counts[name] += count
+        return counts
+
+    def finish(self):
+        """
+        Deletes stat lines of the loaded (and not protected) seasons that were
+        absent from the input and returns the change summary. Per-season
+        deletion counts are left in deleted_by_season.
+        """
+        season_index = STAT_KEY_COLUMNS.index('season')
+        stale = []
+        for key, (stat_id, _) in self.existing.items():
+            season = key[season_index]
+            if key not in self.seen and season not in self.protected_seasons:
+                stale.append({'b_stat_id': stat_id})
+                self.deleted_by_season[season] = self.deleted_by_season.get(season, 0) + 1
+        if stale:
+            write_transaction(self.connection, lambda: self.connection.execute(self.delete_stmt, stale))
+        self.summary['deleted'] = len(stale)
+        return self.summary
+
+def load_csv_file(connection, players_table, player_stats_table, path, mode,
+                  chunk_size=DEFAULT_CHUNK_SIZE, read_chunk_size=DEFAULT_READ_CHUNK_SIZE, sync=None, resolver=None,
+                  seen=None):
+    """
+    Streams one CSV into the database chunk by chunk with the given mode
+    ('sync' requires an IncrementalStatSync), resolving player identities
+    with resolver if given. In 'row' and 'bulk' mode seen holds the keys
+    loaded so far in the run, so a stat line repeated in a later chunk or
+    file is skipped like in 'sync' mode. Returns the number of stat rows
+    processed, the per-file change counts and the seasons the file contained.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    seasons = set()
+    row_count = 0
+    for df in read_clean_chunks(path, read_chunk_size):
+        df = resolve_player_ids(df, resolver)
+        row_count += len(df)
+        seasons.update(df['season'].unique().tolist())
+        if mode != 'sync' and seen is not None:
+            df = drop_seen_stat_lines(df, seen)
+        if mode == 'row':
+            load_row_by_row(connection, players_table, player_stats_table, df)
+            counts['inserted'] += len(df)
+        elif mode == 'bulk':
+            counts['inserted'] += bulk_load(connection, players_table, player_stats_table, df, chunk_size)
+        else:
+            for name, count in sync.apply(df).items():
+                counts[name] += count
+    return row_count, counts, seasons
+
+def stream_clean_chunks(path, read_chunk_size, chunks):
+    """
+    Process-pool task: reads and cleans a CSV chunk by chunk, putting each
+    cleaned chunk on the chunks queue and None once the file is done (also
+    on error, which then surfaces through the task's future). The queue is
+    bounded, so a file cleaned ahead of its turn waits instead of piling up
+    in memory.
+    """
+    try:
+        for df in read_clean_chunks(path, read_chunk_size):
+            chunks.put(df)
+    finally:
+        chunks.put(None)
+
+def write_stat_chunk(engine, players_table, player_stats_table, chunk, mode, sync=None, diff=None):
+    """
+    Writer-pool task: writes one chunk in one transaction on its own pooled
+    connection. In 'sync' mode diff is the (inserts, updates) the
+    coordinator computed with sync.diff().
+    """
+    with engine.connect() as connection:
+        if mode == 'row':
+            load_row_by_row(connection, players_table, player_stats_table, chunk)
+        elif mode == 'bulk':
+            bulk_load(connection, players_table, player_stats_table, chunk, len(chunk))
+        else:
+            sync.write(connection, chunk, *diff)
+
+def load_files_parallel(engine, players_table, player_stats_table, files, args, sync=None, resolver=None):
+    """
+    Parses and cleans files in a pool of args.workers processes and writes
+    them through args.db_connections writer threads, each holding one pooled
+    connection. Each process reads its file --read-chunk-size rows at a time
+    and hands the cleaned chunks back through a queue that holds at most two
+    of them, so no more than a few chunks per file are in memory at once.
+
+    This process consumes the files in input order and does everything that
+    needs the run's shared state: identity resolution, skipping stat lines
+    already loaded from an earlier file and, in 'sync' mode, diffing against
+    the database. Writers only execute the resulting statements, so no two
+    writers ever insert the same key and the result matches a serial load.
+    Every write transaction upserts its players before the stat lines that
+    reference them, so the players foreign key holds whatever order writes
+    finish in. files is a list of (path, sha256); returns
+    (path, sha256, row_count, counts, seasons) per file, in input order.
+    """
+    loaded_files = []
+    queue = iter(files)
+    seen = set()
+    with Manager() as manager, ProcessPoolExecutor(max_workers=args.workers) as cleaners, \
+            ThreadPoolExecutor(max_workers=args.db_connections) as writers:
+        cleaning = deque()
+        writing = []
+
+        def submit_next_clean():
+            item = next(queue, None)
+            if item is not None:
+                chunks = manager.Queue(maxsize=2)
+                cleaning.append((item, chunks, cleaners.submit(stream_clean_chunks, item[0], args.read_chunk_size,
+                                                                 chunks)))
+
+        def submit_write(chunk, diff=None):
+            nonlocal writing
+            writing = [future for future in writing if not future.done() or future.result()]
+            if len(writing) >= args.db_connections:
+                wait(writing, return_when=FIRST_COMPLETED)
+            writing.append(writers.submit(write_stat_chunk, engine, players_table, player_stats_table,
+                                          chunk, args.mode, sync, diff))
+
+        for _ in range(args.workers):
+            submit_next_clean()
+        while cleaning:
+            (path, sha256), chunks, cleaned = cleaning.popleft()
+            counts = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+            seasons = set()
+            row_count = 0
+            while (df := chunks.get()) is not None:
+                df = resolve_player_ids(df, resolver)
+                row_count += len(df)
+                seasons.update(df['season'].unique().tolist())
+                if args.mode != 'sync':
+                    df = drop_seen_stat_lines(df, seen)
+                for start in range(0, len(df), args.chunk_size):
+                    chunk = df.iloc[start:start + args.chunk_size]
+                    if args.mode == 'sync':
+                        inserts, updates, unchanged = sync.diff(chunk)
+                        for name, count in sync.record(inserts, updates, unchanged).items():
+                            counts[name] += count
+                        if inserts or updates:
+                            submit_write(chunk, (inserts, updates))
+                    else:
+                        counts['inserted'] += len(chunk)
+                        submit_write(chunk)
+            cleaned.result() # re-raises an error from the cleaning process
+            submit_next_clean()
+            print(f"{path}: {row_count} stat rows dispatched to writers")
+            loaded_files.append((path, sha256, row_count, counts, seasons))
+
+        for future in writing:
+            future.result()
+    return loaded_files
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load Baseball-Reference batting CSVs into the MLB dashboard database.")
+    parser.add_argument('csv_paths', nargs='*', default=[CSV_FILE_PATH],
+                        help=f"CSV files and/or directories of season CSVs to load (default: {CSV_FILE_PATH})")
+    parser.add_argument('--mode', choices=['sync', 'bulk', 'row'], default='sync',
+                        help="'sync' writes only inserted/changed/deleted stat lines, 'bulk' upserts every "
+                             "row in batched chunks, 'row' uses the original row-by-row inserts")
+    parser.add_argument('--force', action='store_true',
+                        help="Load files even if the manifest shows identical content was already ingested")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per transaction (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument('--read-chunk-size', type=int, default=DEFAULT_READ_CHUNK_SIZE,
+                        help=f"CSV rows read and cleaned at a time (default: {DEFAULT_READ_CHUNK_SIZE})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes parsing and cleaning files in parallel; 1 loads files serially (default: 1)")
+    parser.add_argument('--db-connections', type=int, default=4,
+                        help="Concurrent DB writers when --workers > 1 (default: 4)")
+    parser.add_argument('--register', default=os.getenv('PLAYER_REGISTER'),
+                        help="Chadwick-style player register CSV used to resolve player identities and MLBAM IDs "
+                             "(default: $PLAYER_REGISTER)")
+    parser.add_argument('--fetch-register', action='store_true',
+                        help="Download the register with pybaseball and save it to --register first")
+    parser.add_argument('--no-resolve', action='store_true',
+                        help="Skip identity resolution and keep the generated name/age/team/season player_ids")
+    parser.add_argument('--rebuild-aggregates', action='store_true',
+                        help="Recompute season_aggregates for every season in player_stats, not only changed ones")
+    parser.add_argument('--db-url', default=None,
+                        help="SQLAlchemy URL overriding DB_CONFIG, e.g. sqlite:///local.db")
+    return parser.parse_args()
+
 # Main script execution
 if __name__ == "__main__":
+    args = parse_args()
+
     # Setup database engine and table objects
-    engine, players_table, player_stats_table = setup_database_schema(DB_CONFIG)
+    parallel = args.workers > 1
+    if parallel and (args.db_url or '').startswith('sqlite') and args.db_connections > 1:
+        # SQLite has a single writer; more threads only time out waiting on its lock
+        print("SQLite allows one writer at a time; using --db-connections 1.")
+        args.db_connections = 1
+    # Parallel writers each hold one connection; the extra one is this process's
+    engine, tables = setup_database_schema(DB_CONFIG, args.db_url,
+                                           pool_size=args.db_connections + 1 if parallel else None)
+    players_table = tables['players']
+    player_stats_table = tables['player_stats']
+    ingested_files_table = tables['ingested_files']
+
+    register = None
+    if args.register and not args.no_resolve:
+        try:
+            if args.fetch_register:
+                fetch_register(args.register)
+            register = load_register(args.register)
+            print(f"Loaded {len(register)} people from the player register {args.register}.")
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"Warning: could not load the player register ({e}); resolving without it.")
 
     if engine:
         # Use a context manager for the connection
         with engine.connect() as conn:
+            csv_path = None
             try:
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(CSV_FILE_PATH)
-                print(f"Loaded {len(df)} rows from {CSV_FILE_PATH}")
-
-                # Rename columns to match database schema conventions where necessary
-                df = df.rename(columns={
-                    'Player': 'player_name',
-                    'Team': 'team',
-                    'Lg': 'lg',
-                    'G': 'games_played',
-                    'PA': 'plate_appearances', # Not directly used in DB schema, but useful if needed later
-                    'AB': 'at_bats',
-                    'R': 'runs',
-                    'H': 'hits',
-                    '2B': 'doubles',
-                    '3B': 'triples',
-                    'HR': 'home_runs',
-                    'RBI': 'rbi',
-                    'SB': 'sb',
-                    'CS': 'cs',
-                    'BB': 'walks',
-                    'SO': 'strikeouts',
-                    'BA': 'batting_average', # Not directly used in DB schema, but useful if needed later
-                    'OBP': 'obp',
-                    'SLG': 'slg',
-                    'OPS': 'ops',
-                    'OPS+': 'ops_plus',
-                    'rOBA': 'roba',
-                    'Rbat+': 'rbat_plus',
-                    'TB': 'tb',
-                    'GIDP': 'gidp',
-                    'HBP': 'hbp',
-                    'SH': 'sh',
-                    'SF': 'sf',
-                    'IBB': 'ibb',
-                    'Pos': 'position_played',
-                    'WAR': 'war',
-                    'Age': 'age' # Add age for potential future use or to infer season
-                })
-
-                if 'season' not in df.columns:
-                    print("Warning: 'season' column not found. Assuming data is for 2023. Please verify.")
-                    df['season'] = 2023 # Default to a recent year, adjust as needed
-
-
-                # Define numerical columns for type conversion and NaN filling
-                numerical_cols_to_fill = [
-                    'games_played', 'at_bats', 'runs', 'hits', 'doubles', 'triples',
-                    'home_runs', 'rbi', 'walks', 'strikeouts', 'sb', 'cs', 'tb',
-                    'gidp', 'hbp', 'sh', 'sf', 'ibb', 'age', 'season' # Added season and age to numerical if they are in CSV
-                ]
-                decimal_cols_to_fill = [
-                    'obp', 'slg', 'ops', 'war', 'ops_plus', 'roba', 'rbat_plus'
-                ]
-
-                # Apply type conversion and NaN filling
-                for col in numerical_cols_to_fill:
-                    if col in df.columns:
-                        # Convert to numeric, coercing errors to NaN, then fill NaN, then convert to int
-                        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
-                for col in decimal_cols_to_fill:
-                    if col in df.columns:
-                        # Convert to numeric, coercing errors to NaN, then fill NaN, then convert to float
-                        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(float)
-
-                # Ensure string columns don't have NaN and are converted to string
-                string_cols = ['player_name', 'team', 'lg', 'position_played']
-                for col in string_cols:
-                    if col in df.columns:
-                        df[col] = df[col].fillna('N/A').astype(str)
-
-                # Generate player_id for each row using multiple columns for uniqueness
-                # Apply across rows (axis=1) to use age, team, and season
-                df['player_id'] = df.apply(
-                    lambda row: generate_player_id(
-                        row['player_name'],
-                        row.get('age'), # .get() to handle cases where 'age' might not be in the CSV
-                        row.get('team'),
-                        row.get('season')
-                    ),
-                    axis=1
-                )
-
-                # Drop rows where player_id could not be generated (e.g., missing name after string conversion)
-                df.dropna(subset=['player_id', 'player_name'], inplace=True)
-                if df.empty:
-                    print("No valid player data to process after cleaning. Exiting.")
-                    exit() # Exit if no data is left
-
-
-                # Iterate over each row in the DataFrame and insert into MySQL
-                for index, row in df.iterrows():
-                    # Extract values for players table
-                    player_id = row['player_id']
-                    player_name = row['player_name']
-
-                    # Insert into players table first
-                    insert_player(conn, players_table, player_id, player_name) # Corrected call here
-
-                    # Prepare data dictionary for player_stats table
-                    # Using a dictionary makes it easier to pass to SQLAlchemy's insert().values()
-                    stat_data = {
-                        'player_id': player_id,
-                        'season': row['season'],
-                        'team': row['team'],
-                        'games_played': row['games_played'],
-                        'at_bats': row['at_bats'],
-                        'runs': row['runs'],
-                        'hits': row['hits'],
-                        'doubles': row['doubles'],
-                        'triples': row['triples'],
-                        'home_runs': row['home_runs'],
-                        'rbi': row['rbi'],
-                        'walks': row['walks'],
-                        'strikeouts': row['strikeouts'],
-                        'obp': row['obp'],
-                        'slg': row['slg'],
-                        'ops': row['ops'],
-                        'war': row['war'],
-                        'sb': row['sb'],
-                        'cs': row['cs'],
-                        'ops_plus': row['ops_plus'],
-                        'roba': row['roba'],
-                        'rbat_plus': row['rbat_plus'],
-                        'tb': row['tb'],
-                        'gidp': row['gidp'],
-                        'hbp': row['hbp'],
-                        'sh': row['sh'],
-                        'sf': row['sf'],
-                        'ibb': row['ibb'],
-                        'position_played': row['position_played'],
-                        'lg': row['lg']
-                    }
-                    insert_player_stat(conn, player_stats_table, stat_data)
+                resolver = None
+                if not args.no_resolve:
+                    resolver = PlayerResolver(register, load_known_aliases(conn, tables['player_aliases']))
+                sync = None
+                if args.mode == 'sync':
+                    sync = IncrementalStatSync(conn, players_table, player_stats_table, args.chunk_size)
+
+                started = time.perf_counter()
+                files = []
+                skipped_seasons = set()
+                for csv_path in expand_csv_paths(args.csv_paths):
+                    sha256 = file_sha256(csv_path)
+                    previous = find_ingested_file(conn, ingested_files_table, sha256)
+                    if previous and not args.force:
+                        print(f"{csv_path} was already ingested on {previous.loaded_at} (same content). Skipping; use --force to reload.")
+                        if previous.seasons:
+                            skipped_seasons.update(int(season) for season in previous.seasons.split(','))
+                            if sync:
+                                sync.protect_seasons(skipped_seasons)
+                        continue
+                    files.append((csv_path, sha256))
+                csv_path = None
+
+                if parallel:
+                    loaded_files = load_files_parallel(engine, players_table, player_stats_table, files, args, sync, resolver)
+                    # The writers committed on their own connections. End the
+                    # transaction the manifest lookups opened on conn, so on
+                    # MySQL (REPEATABLE READ) the sync deletes, identities and
+                    # aggregates below read their rows, not an older snapshot.
+                    conn.commit()
+                else:
+                    loaded_files = []
+                    seen = set()
+                    for csv_path, sha256 in files:
+                        file_started = time.perf_counter()
+                        row_count, counts, seasons = load_csv_file(
+                            conn, players_table, player_stats_table, csv_path, args.mode,
+                            args.chunk_size, args.read_chunk_size, sync, resolver, seen
+                        )
+                        elapsed = time.perf_counter() - file_started
+                        print(f"{csv_path}: {row_count} stat rows in {elapsed:.2f}s ({row_count / max(elapsed, 1e-9):.0f} rows/sec)")
+                        loaded_files.append((csv_path, sha256, row_count, counts, seasons))
+                    csv_path = None
+
+                if sync:
+                    sync.finish()
+                summary = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+                changed_seasons = set(sync.deleted_by_season) if sync else set()
+                for path, sha256, row_count, counts, seasons in loaded_files:
+                    if sync:
+                        # Each season's deletions are attributed to the first file that contained it
+                        counts['deleted'] = sum(sync.deleted_by_season.pop(season, 0) for season in seasons)
+                    if counts['inserted'] or counts['updated'] or counts['deleted']:
+                        changed_seasons.update(seasons)
+                    for name, count in counts.items():
+                        summary[name] += count
+
+                # Derived data first: a file only goes into the manifest (and is
+                # skipped by later loads) once its identities and aggregates are
+                # saved, and API caches are only invalidated once all of it is.
+                if resolver:
+                    # Without sync's deletes, a season's lines under legacy IDs
+                    # would stay next to their reloaded canonical copies
+                    reloaded_seasons = set()
+                    if not sync:
+                        for path, sha256, row_count, counts, seasons in loaded_files:
+                            reloaded_seasons.update(seasons)
+                        reloaded_seasons -= skipped_seasons
+                    pruned = save_player_identities(conn, players_table, player_stats_table, tables['player_aliases'],
+                                                    tables['player_contracts'], resolver, reloaded_seasons)
+                    print("Resolved player identities: " + ", ".join(f"{count} {source}" for source, count in resolver.counts.items())
+                          + f"; {len(resolver.mlbam_ids)} MLBAM IDs, {pruned} legacy players rows removed.")
+                aggregate_seasons = changed_seasons
+                if args.rebuild_aggregates:
+                    aggregate_seasons = set(conn.execute(select(player_stats_table.c.season).distinct()).scalars())
+                aggregate_rows = refresh_season_aggregates(conn, player_stats_table, tables['season_aggregates'], aggregate_seasons)
+                if aggregate_rows:
+                    print(f"Refreshed {aggregate_rows} season aggregates for {len(aggregate_seasons)} season(s).")
+                for path, sha256, row_count, counts, seasons in loaded_files:
+                    record_ingested_file(conn, ingested_files_table, path, sha256, row_count, seasons, counts)
+                bump_season_versions(conn, tables['season_versions'], changed_seasons)
+
+                elapsed = time.perf_counter() - started
+                total_rows = sum(row_count for _, _, row_count, _, _ in loaded_files)
+                print(f"Processed {total_rows} stat rows from {len(loaded_files)} file(s) in {elapsed:.2f}s "
+                      f"({total_rows / max(elapsed, 1e-9):.0f} rows/sec): "
+                      f"{summary['inserted']} inserted, {summary['updated']} updated, "
+                      f"{summary['deleted']} deleted, {summary['unchanged']} unchanged")
 
             except FileNotFoundError:
-                print(f"Error: CSV file not found at {CSV_FILE_PATH}")
+                print(f"Error: CSV file not found at {csv_path}")
             except KeyError as e:
                 print(f"Error: Missing expected column in CSV after renaming/processing: {e}. Please check your CSV file's header names and the rename dictionary.")
             except SQLAlchemyError as e:
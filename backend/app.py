@@ -1,10 +1,26 @@
-from flask import Flask, jsonify
-from sqlalchemy import create_engine, Column, Integer, String, DECIMAL, MetaData, Table, and_, select
-from sqlalchemy.orm import sessionmaker
+from flask import Flask, g, has_request_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import DECIMAL, Integer, and_, event, func, select, text
 from sqlalchemy.exc import SQLAlchemyError
+import math
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from flask_cors import CORS
+from career_stats import career_totals
+from database import DatabaseUnavailable, LazyEngine
+from metrics import CONTENT_TYPE, SIZE_BUCKETS, MetricsRegistry, SlowRequestProfiler
+from player_search import PlayerSearchCache
+from schema import (player_contracts_table, player_stats_table, players_table, season_aggregates_table,
+                    season_versions_table)
+from season_aggregates import (ALL, AGGREGATED_STATS, MULTI_LEAGUE_PATTERN, MULTI_TEAM_PATTERN, PA_COMPONENTS,
+                               primary_position, z_score)
+from season_cache import SeasonCache
+from season_rankings import RankIndexCache, StatRankIndex
+from wire_format import WIRE_FORMATS, FormatUnavailable, compress, encode_columns, negotiate_encoding, to_native
 
 load_dotenv()
 
@@ -19,196 +35,1020 @@ DB_CONFIG = {
     'port': int(os.getenv('DB_PORT', 3306))
 }
 
-DB_URL = f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-
-engine = None
-try:
-    engine = create_engine(DB_URL)
-    with engine.connect() as connection:
-        print("Successfully connected to the database from Flask.")
-except SQLAlchemyError as e:
-    print(f"Error connecting to database from Flask: {e}")
-    engine = None
-
-metadata = MetaData()
-
-players_table = Table(
-    'players', metadata,
-    Column('player_id', String(50), primary_key=True, unique=True),
-    Column('player_name', String(255), nullable=False),
-    Column('primary_position', String(50), nullable=True),
-    Column('mlb_debut_year', Integer, nullable=True),
-    Column('mlbam_id', Integer, unique=True, nullable=True),
-    Column('batting_hand', String(10), nullable=True)
-)
-
-player_stats_table = Table(
-    'player_stats', metadata,
-    Column('stat_id', Integer, primary_key=True, autoincrement=True),
-    Column('player_id', String(50), nullable=False),
-    Column('season', Integer, nullable=False),
-    Column('team', String(10), nullable=False),
-    Column('games_played', Integer, nullable=True),
-    Column('at_bats', Integer, nullable=True),
-    Column('runs', Integer, nullable=True),
-    Column('hits', Integer, nullable=True),
-    Column('doubles', Integer, nullable=True),
-    Column('triples', Integer, nullable=True),
-    Column('home_runs', Integer, nullable=True),
-    Column('rbi', Integer, nullable=True),
-    Column('walks', Integer, nullable=True),
-    Column('strikeouts', Integer, nullable=True),
-    Column('obp', DECIMAL(5,3), nullable=True),
-    Column('slg', DECIMAL(5,3), nullable=True),
-    Column('ops', DECIMAL(5,3), nullable=True),
-    Column('war', DECIMAL(5,2), nullable=True),
-    Column('sb', Integer, nullable=True),
-    Column('cs', Integer, nullable=True),
-    Column('ops_plus', DECIMAL(5,1), nullable=True),
-    Column('roba', DECIMAL(5,3), nullable=True),
-    Column('rbat_plus', DECIMAL(5,1), nullable=True),
-    Column('tb', Integer, nullable=True),
-    Column('gidp', Integer, nullable=True),
-    Column('hbp', Integer, nullable=True),
-    Column('sh', Integer, nullable=True),
-    Column('sf', Integer, nullable=True),
-    Column('ibb', Integer, nullable=True),
-    Column('position_played', String(50), nullable=True),
-    Column('lg', String(10), nullable=True)
-)
-
-player_contracts_table = Table(
-    'player_contracts', metadata,
-    Column('contract_id', Integer, primary_key=True, autoincrement=True),
-    Column('player_id', String(50), nullable=False),
-    Column('contract_start_year', Integer, nullable=True),
-    Column('contract_end_year', Integer, nullable=True),
-    Column('total_value_usd', Integer, nullable=True),
-    Column('avg_annual_value_usd', Integer, nullable=True),
-    Column('current_year_salary_usd', Integer, nullable=True),
-    Column('year_in_contract', Integer, nullable=True),
-    Column('contract_notes', String(1000), nullable=True)
-)
-
-Session = sessionmaker(bind=engine)
+# Upper bound on the serialized season payloads kept in memory
+SEASON_CACHE_MAX_BYTES = int(os.getenv('SEASON_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Number of (season, stat) sorted rank indexes kept in memory
+RANK_INDEX_CACHE_ENTRIES = int(os.getenv('RANK_INDEX_CACHE_ENTRIES', 256))
+# Number of player similarity matrices kept in memory (one per season, plus
+# one for all seasons), and the plate appearances a season needs to be returned
+SIMILARITY_CACHE_ENTRIES = int(os.getenv('SIMILARITY_CACHE_ENTRIES', 16))
+SIMILARITY_MIN_PA = int(os.getenv('SIMILARITY_MIN_PA', 100))
+# Threads shared by all requests for running a player detail request's
+# independent queries at the same time, each on its own pooled connection
+DETAIL_FANOUT_THREADS = int(os.getenv('DETAIL_FANOUT_THREADS', 8))
+# How often the player search index checks whether the loader changed the data
+PLAYER_SEARCH_REFRESH_SECONDS = float(os.getenv('PLAYER_SEARCH_REFRESH_SECONDS', 30))
+# Statcast Parquet store written by statcastdata.py
+STATCAST_STORE_DIR = os.getenv('STATCAST_STORE_DIR',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'statcast_data'))
+
+# Statements slower than this are printed and counted
+SLOW_QUERY_SECONDS = float(os.getenv('SLOW_QUERY_SECONDS', 0.5))
+# Fraction of requests run under cProfile (0 = off); sampled requests slower
+# than SLOW_REQUEST_SECONDS print their profile and are saved to PROFILE_DIR if set
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+SLOW_REQUEST_SECONDS = float(os.getenv('SLOW_REQUEST_SECONDS', 1.0))
+PROFILE_DIR = os.getenv('PROFILE_DIR')
+
+# Connection pool settings, per worker process
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+# Recycle connections before MySQL's wait_timeout closes them server-side
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+# Connection attempts per request while the database is unreachable; the wait
+# between them doubles from DB_CONNECT_BACKOFF up to DB_CONNECT_MAX_BACKOFF seconds
+DB_CONNECT_ATTEMPTS = int(os.getenv('DB_CONNECT_ATTEMPTS', 3))
+DB_CONNECT_BACKOFF = float(os.getenv('DB_CONNECT_BACKOFF', 0.25))
+DB_CONNECT_MAX_BACKOFF = float(os.getenv('DB_CONNECT_MAX_BACKOFF', 5.0))
+
+# DATABASE_URL overrides the MySQL settings above (e.g. sqlite:///local.db)
+DB_URL = os.getenv('DATABASE_URL') or f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+
+def engine_options(db_url):
+    """
+    Keyword arguments for create_engine. SQLite's default pool does not take
+    the queue pool settings, so they only apply to server databases.
+    """
+    if db_url.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING
+    }
+
+season_cache = SeasonCache(SEASON_CACHE_MAX_BYTES)
+rank_index_cache = RankIndexCache(RANK_INDEX_CACHE_ENTRIES)
+similarity_cache = RankIndexCache(SIMILARITY_CACHE_ENTRIES)
+player_search_cache = PlayerSearchCache(PLAYER_SEARCH_REFRESH_SECONDS)
+statcast_store = None
+# Threads start on first use, so creating this before gunicorn forks is safe
+detail_executor = ThreadPoolExecutor(DETAIL_FANOUT_THREADS, thread_name_prefix='player-detail')
+
+# Per-process metrics, exposed at /metrics
+metrics = MetricsRegistry()
+request_duration = metrics.histogram('mlb_api_request_duration_seconds',
+                                     'Request time by route and phase (db, serialize, total).',
+                                     ('route', 'method', 'phase'))
+requests_total = metrics.counter('mlb_api_requests_total', 'Requests by route, method and status.',
+                                 ('route', 'method', 'status'))
+response_bytes = metrics.histogram('mlb_api_response_bytes', 'Response body size by route.', ('route',), SIZE_BUCKETS)
+query_duration = metrics.histogram('mlb_api_db_query_duration_seconds', 'Time spent executing each statement.')
+slow_queries = metrics.counter('mlb_api_db_slow_queries_total', 'Statements slower than SLOW_QUERY_SECONDS.')
+pool_checkout = metrics.histogram('mlb_api_db_pool_checkout_seconds',
+                                  'Time to check a connection out of the pool, including waiting and connecting.')
+profiled_requests = metrics.counter('mlb_api_profiled_requests_total',
+                                    'Requests run under the sampling profiler, by whether they were slow.', ('slow',))
+slow_request_profiler = SlowRequestProfiler(PROFILE_SAMPLE_RATE, SLOW_REQUEST_SECONDS, PROFILE_DIR)
+
+def pool_state():
+    pool = database.engine.pool if database.engine else None
+    states = [('checked_out', 'checkedout'), ('idle', 'checkedin'), ('overflow', 'overflow')]
+    # QueuePool.overflow() is negative while fewer than pool_size connections exist
+    return [({'state': state}, max(0, getattr(pool, method)())) for state, method in states if hasattr(pool, method)]
+
+def cache_stat(field):
+    """
+    Collects one field of every cache's stats() for a callback metric.
+    """
+    def collect():
+        caches = {'season_stats': season_cache.stats(), 'rank_indexes': rank_index_cache.stats(),
+                  'player_search': player_search_cache.stats(), 'similarity': similarity_cache.stats()}
+        return [({'cache': name}, stats[field]) for name, stats in caches.items() if field in stats]
+    return collect
+
+metrics.callback('mlb_api_db_pool_connections', 'Pooled connections by state.', 'gauge', pool_state)
+metrics.callback('mlb_api_db_connect_errors_total', 'Failed attempts to connect to the database.', 'counter',
+                 lambda: [({}, database.connect_errors)])
+metrics.callback('mlb_api_cache_hits_total', 'Cache hits.', 'counter', cache_stat('hits'))
+metrics.callback('mlb_api_cache_misses_total', 'Cache misses.', 'counter', cache_stat('misses'))
+metrics.callback('mlb_api_cache_evictions_total', 'Entries evicted to stay under the size bound.', 'counter',
+                 cache_stat('evictions'))
+metrics.callback('mlb_api_cache_invalidations_total', 'Entries dropped because their season was reloaded.',
+                 'counter', cache_stat('invalidations'))
+metrics.callback('mlb_api_cache_entries', 'Entries currently cached.', 'gauge', cache_stat('entries'))
+metrics.callback('mlb_api_cache_bytes', 'Bytes of cached payloads.', 'gauge', cache_stat('bytes'))
+metrics.callback('mlb_api_player_search_builds_total', 'Player search index builds.', 'counter', cache_stat('builds'))
+
+def add_request_phase(name, seconds):
+    if has_request_context() and 'request_phases' in g:
+        g.request_phases[name] = g.request_phases.get(name, 0.0) + seconds
+
+@contextmanager
+def request_phase(name):
+    """
+    Adds the time spent in the block to the current request's phase total.
+    A block nested in another block of the same phase is counted once.
+    """
+    active = g.setdefault('active_phases', set()) if has_request_context() else None
+    if active is None or name in active:
+        yield
+        return
+    active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        active.discard(name)
+        add_request_phase(name, time.perf_counter() - started)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider, counting its time (jsonify and app.json.dumps)
+    as the request's serialize phase.
+    """
+
+    def dumps(self, obj, **kwargs):
+        with request_phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+app.json = TimedJSONProvider(app)
+
+def compact_dumps(obj):
+    """
+    app.json.dumps without whitespace between items, as jsonify sends it,
+    for bodies that are encoded once and cached.
+    """
+    return app.json.dumps(obj, separators=(',', ':'))
+
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    query_duration.observe(elapsed)
+    add_request_phase('db', elapsed)
+    if elapsed >= SLOW_QUERY_SECONDS:
+        slow_queries.inc()
+        path = request.path if has_request_context() else '-'
+        print(f"Slow query ({elapsed * 1000:.1f} ms) for {path}: {' '.join(statement.split())[:1000]}")
+
+def discard_query_timer(exception_context):
+    started = exception_context.connection.info.get('query_started') if exception_context.connection else None
+    if started:
+        started.pop()
+
+def instrument_engine(engine):
+    """
+    Times every statement the engine runs; called once when it is created.
+    """
+    event.listen(engine, 'before_cursor_execute', start_query_timer)
+    event.listen(engine, 'after_cursor_execute', record_query_time)
+    event.listen(engine, 'handle_error', discard_query_timer)
+
+# Created on the first request, so importing the app (and forking gunicorn
+# workers from a preloaded app) never opens a connection
+database = LazyEngine(DB_URL, engine_options(DB_URL), DB_CONNECT_ATTEMPTS, DB_CONNECT_BACKOFF,
+                      DB_CONNECT_MAX_BACKOFF, on_create=instrument_engine)
+
+def get_engine():
+    return database.get_engine()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.request_phases = {}
+    g.profiler = slow_request_profiler.start(random.random())
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    Records the request's total, db and serialize time, status and payload
+    size under its route pattern, and finishes a sampled profile.
+    """
+    if 'request_started' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    for phase in ('db', 'serialize'):
+        request_duration.observe(g.request_phases.get(phase, 0.0), route=route, method=request.method, phase=phase)
+    request_duration.observe(elapsed, route=route, method=request.method, phase='total')
+    requests_total.inc(route=route, method=request.method, status=str(response.status_code))
+    if not response.direct_passthrough:
+        response_bytes.observe(response.calculate_content_length() or 0, route=route)
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        slow = slow_request_profiler.finish(profiler, f"{request.method} {request.full_path}", elapsed)
+        profiled_requests.inc(slow=str(slow).lower())
+    return response
+
+def get_db():
+    """
+    The current request's database connection, checked out of the pool on
+    first use and reused for the rest of the request. Every route only reads,
+    so it runs in autocommit mode: no ORM session and no BEGIN/ROLLBACK round
+    trips around each query. Raises DatabaseUnavailable (answered with a 503)
+    if the database cannot be reached.
+    """
+    if 'db_connection' not in g:
+        g.db_connection = checkout_connection()
+    return g.db_connection
+
+def checkout_connection():
+    """
+    A new autocommit connection from the pool; the caller closes it.
+    """
+    started = time.perf_counter()
+    connection = database.connect()
+    pool_checkout.observe(time.perf_counter() - started)
+    return connection.execution_options(isolation_level='AUTOCOMMIT')
+
+@app.teardown_appcontext
+def close_db(exception):
+    """
+    Returns the request's connection (if any) to the pool.
+    """
+    connection = g.pop('db_connection', None)
+    if connection is not None:
+        connection.close()
+
+@app.errorhandler(DatabaseUnavailable)
+def database_unavailable(e):
+    response = jsonify({"error": "Database unavailable, try again shortly."})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+    return response
+
+def get_season_version(connection, season):
+    """
+    Returns (version, updated_at) for a season, or (0, None) if the loader
+    has not recorded one yet.
+    """
+    row = connection.execute(season_version_query(season)).fetchone()
+    if not row:
+        return 0, None
+    return row.version, row.updated_at
+
+def cached_response(entry):
+    """
+    Builds a response from a cached payload with a strong ETag and
+    Last-Modified, answering 304 when the request's validators match.
+    """
+    response = app.response_class(entry.body, mimetype=entry.mimetype)
+    if entry.content_encoding:
+        response.headers['Content-Encoding'] = entry.content_encoding
+    response.vary.update(['Accept', 'Accept-Encoding'])
+    response.set_etag(entry.etag)
+    if entry.last_modified:
+        response.last_modified = entry.last_modified
+    response.headers['Cache-Control'] = 'no-cache' # Cacheable, but revalidate every time
+    return response.make_conditional(request)
+
+# player_stats columns the API returns; row_hash is the loader's bookkeeping
+STAT_COLUMNS = [col for col in player_stats_table.columns if col.name != 'row_hash']
+
+# Fields selectable with ?fields= on /api/season_stats
+SEASON_STAT_FIELDS = [col.name for col in STAT_COLUMNS] + ['player_name']
+
+# Numeric stats that can be ranked
+RANKABLE_STATS = [col.name for col in STAT_COLUMNS
+                  if isinstance(col.type, (Integer, DECIMAL)) and col.name not in ('stat_id', 'season')]
+
+# Largest ?top= / ?distribution= accepted by the rank endpoint
+MAX_RANK_RESULTS = 500
+
+# Largest page accepted by /api/players and /api/players/search
+MAX_PLAYERS_PAGE = 1000
+
+# Page size of /api/players when ?after= comes without ?limit=
+DEFAULT_PLAYERS_PAGE = 100
+
+# Largest number of player ids accepted by the batch endpoint
+MAX_BATCH_PLAYERS = 100
+
+# Largest ?k= accepted by the similar players endpoint
+MAX_SIMILAR_PLAYERS = 50
+
+def stats_row_to_dict(row):
+    """
+    Converts a player_stats row (joined with player_name) to a JSON-ready dict.
+    """
+    stats = {}
+    for column in STAT_COLUMNS:
+        stats[column.name] = to_native(getattr(row, column.name))
+    stats['player_name'] = getattr(row, players_table.c.player_name.name)
+    return stats
+
+# --- Statement builders for every route's queries ---
+# Kept separate from the routes so tests/test_query_plans.py can EXPLAIN the
+# exact statements the API runs.
+
+def season_version_query(season):
+    return select(season_versions_table.c.version, season_versions_table.c.updated_at).where(
+        season_versions_table.c.season == season
+    )
+
+def players_list_query(after=None, limit=None):
+    """
+    Players in player_id order; after/limit page through them by key.
+    """
+    stmt = select(players_table.c.player_id, players_table.c.player_name).order_by(players_table.c.player_id)
+    if after is not None:
+        stmt = stmt.where(players_table.c.player_id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+def data_version_query():
+    """
+    Changes whenever the loader bumps any season's version.
+    """
+    return select(func.count(), func.coalesce(func.sum(season_versions_table.c.version), 0)).select_from(
+        season_versions_table
+    )
+
+def player_contract_query(player_id):
+    return select(player_contracts_table).where(
+        player_contracts_table.c.player_id == player_id
+    ).order_by(player_contracts_table.c.contract_start_year.desc())
+
+def player_season_stats_query(player_id, season):
+    """
+    A player's stat lines for one season. A traded player has one line per
+    team plus a combined "2TM"/"3TM" line, which is ordered first.
+    """
+    return select(*STAT_COLUMNS, players_table.c.player_name).join(
+        players_table, player_stats_table.c.player_id == players_table.c.player_id
+    ).filter(
+        and_(player_stats_table.c.player_id == player_id,
+             player_stats_table.c.season == season)
+    ).order_by(player_stats_table.c.team.like('%TM').desc())
+
+def player_stats_query(player_ids, season_from=None, season_to=None):
+    """
+    Stat lines (with player_name) for the given players in one parameterized
+    IN query, optionally limited to a season range, ordered by player and season.
+    """
+    stmt = select(*STAT_COLUMNS, players_table.c.player_name).join(
+        players_table, player_stats_table.c.player_id == players_table.c.player_id
+    ).filter(player_stats_table.c.player_id.in_(player_ids))
+    if season_from is not None:
+        stmt = stmt.filter(player_stats_table.c.season >= season_from)
+    if season_to is not None:
+        stmt = stmt.filter(player_stats_table.c.season <= season_to)
+    return stmt.order_by(player_stats_table.c.player_id, player_stats_table.c.season,
+                         player_stats_table.c.team)
+
+def season_stats_query(season, fields):
+    """
+    The requested fields of every stat line in a season; players is only
+    joined when player_name is among them.
+    """
+    selected = [players_table.c.player_name if field == 'player_name' else player_stats_table.c[field]
+                for field in fields]
+    stmt = select(*selected).select_from(player_stats_table)
+    if 'player_name' in fields:
+        stmt = stmt.join(players_table, player_stats_table.c.player_id == players_table.c.player_id)
+    return stmt.filter(player_stats_table.c.season == season)
+
+def season_aggregates_query(season, lg=None, position=None, stats=None):
+    t = season_aggregates_table
+    stmt = select(*[col for col in t.columns if col.name != 'updated_at']).where(t.c.season == season)
+    if lg is not None:
+        stmt = stmt.where(t.c.lg == lg)
+    if position is not None:
+        stmt = stmt.where(t.c.position == position)
+    if stats:
+        stmt = stmt.where(t.c.stat.in_(stats))
+    return stmt.order_by(t.c.lg, t.c.position, t.c.stat)
+
+def stat_values_query(season, stat):
+    return select(player_stats_table.c.player_id, players_table.c.player_name,
+                  player_stats_table.c.team, player_stats_table.c[stat]).join(
+        players_table, player_stats_table.c.player_id == players_table.c.player_id
+    ).filter(player_stats_table.c.season == season)
+
+def similarity_stats_query(season=None):
+    """
+    The columns the similarity index is built from, for one season or
+    (season None) every season.
+    """
+    from player_similarity import INPUT_COLUMNS # imports numpy, which only this feature needs
+    stmt = select(player_stats_table.c.player_id, players_table.c.player_name, player_stats_table.c.season,
+                  player_stats_table.c.team, *[player_stats_table.c[col] for col in INPUT_COLUMNS]).join(
+        players_table, player_stats_table.c.player_id == players_table.c.player_id
+    )
+    if season is not None:
+        stmt = stmt.filter(player_stats_table.c.season == season)
+    return stmt
+
+def requested_wire_format():
+    """
+    Format for a season-wide response: ?format= wins, otherwise an Accept
+    header asking for one of the binary types, otherwise 'rows'.
+    """
+    fmt = request.args.get('format')
+    if fmt:
+        return fmt
+    for name in ('msgpack', 'arrow'):
+        if request.accept_mimetypes.best == WIRE_FORMATS[name]:
+            return name
+    return 'rows'
+
+def requested_fields():
+    """
+    Parses ?fields=a,b,c into a tuple of known field names (all fields if
+    absent). Raises ValueError naming any unknown field.
+    """
+    fields = request.args.get('fields')
+    if not fields:
+        return tuple(SEASON_STAT_FIELDS)
+    fields = tuple(dict.fromkeys(f.strip() for f in fields.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in SEASON_STAT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or '(none given)'}")
+    return fields
 
 @app.route('/api/players', methods=['GET'])
 def get_players():
-    if not engine:
-        return jsonify({"error": "Database connection not established."}), 500
-    session = Session()
+    """
+    Every player as a plain list, in player_id order. With ?limit= they
+    come one page at a time as {"players": [...], "next_cursor"}; pass
+    next_cursor back as ?after= for the following page (DEFAULT_PLAYERS_PAGE
+    players if ?limit= is left off).
+    """
+    limit = request.args.get('limit', type=int)
+    after = request.args.get('after')
+    if after is not None and limit is None:
+        limit = DEFAULT_PLAYERS_PAGE
+    if limit is not None and not 1 <= limit <= MAX_PLAYERS_PAGE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PLAYERS_PAGE}."}), 400
     try:
-        query = session.query(players_table.c.player_id, players_table.c.player_name)
+        connection = get_db()
         players = []
-        for player_id, player_name in query.all():
+        for player_id, player_name in connection.execute(players_list_query(after, limit)):
             players.append({'player_id': player_id, 'player_name': player_name})
-        return jsonify(players)
+        if limit is None and after is None:
+            return jsonify(players)
+        next_cursor = players[-1]['player_id'] if len(players) == limit else None
+        return jsonify({'players': players, 'next_cursor': next_cursor})
     except SQLAlchemyError as e:
         print(f"Error fetching players: {e}")
         return jsonify({"error": "Could not retrieve players."}), 500
-    finally:
-        session.close()
+
+def player_search_version(connection):
+    return tuple(connection.execute(data_version_query()).fetchone())
+
+def load_player_search_rows():
+    """
+    Every (player_id, player_name) on a connection of its own, as index
+    builds run on a background thread.
+    """
+    with checkout_connection() as connection:
+        return connection.execute(players_list_query()).fetchall()
+
+def player_search_index(connection):
+    return player_search_cache.get(lambda: player_search_version(connection), load_player_search_rows)
+
+def warm_player_search():
+    """
+    Starts building the search index in the background, so the first search
+    does not pay for it; called once per worker (see gunicorn.conf.py).
+    """
+    def current_version():
+        with checkout_connection() as connection:
+            return player_search_version(connection)
+    player_search_cache.warm(current_version, load_player_search_rows)
+
+@app.route('/api/players/search', methods=['GET'])
+def search_players():
+    """
+    Typeahead search over player names: ?q= (accent and case insensitive),
+    ?limit= (default 10) and ?cursor= from the previous page's next_cursor.
+    Names starting with q rank first, then names with a later word starting
+    with q; if nothing matches by prefix, similar names (typos) are returned.
+    """
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    offset = request.args.get('cursor', 0, type=int)
+    if not 1 <= limit <= MAX_PLAYERS_PAGE or offset < 0:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PLAYERS_PAGE} and cursor must be a valid cursor."}), 400
+    try:
+        index = player_search_index(get_db())
+        results, next_offset = index.search(query, limit, offset)
+        return jsonify({'query': query, 'results': results,
+                        'next_cursor': str(next_offset) if next_offset is not None else None})
+    except SQLAlchemyError as e:
+        print(f"Error searching players for '{query}': {e}")
+        return jsonify({"error": "Could not search players."}), 500
+
+def latest_contract(connection, player_id):
+    """
+    The player's most recent contract as a dict, or None.
+    """
+    row = connection.execute(player_contract_query(player_id)).first()
+    if row is None:
+        return None
+    return {
+        'player_id': row.player_id,
+        'contract_start_year': row.contract_start_year,
+        'contract_end_year': row.contract_end_year,
+        'total_value_usd': row.total_value_usd,
+        'avg_annual_value_usd': row.avg_annual_value_usd,
+        'current_year_salary_usd': row.current_year_salary_usd,
+        'year_in_contract': row.year_in_contract,
+        'contract_notes': row.contract_notes
+    }
 
 @app.route('/api/player_contracts/<string:player_id>', methods=['GET'])
 def get_player_contracts(player_id):
-    if not engine:
-        return jsonify({"error": "Database connection not established."}), 500
-    session = Session()
-    try:
-        query = session.query(player_contracts_table).filter(
-            player_contracts_table.c.player_id == player_id
-        ).order_by(player_contracts_table.c.contract_start_year.desc())
-
-        contracts = []
-        for row in query.all():
-            contract_dict = {
-                'player_id': row.player_id,
-                'contract_start_year': row.contract_start_year,
-                'contract_end_year': row.contract_end_year,
-                'total_value_usd': row.total_value_usd,
-                'avg_annual_value_usd': row.avg_annual_value_usd,
-                'current_year_salary_usd': row.current_year_salary_usd,
-                'year_in_contract': row.year_in_contract,
-                'contract_notes': row.contract_notes
-            }
-            contracts.append(contract_dict)
-        if not contracts:
+    try:
+        contract = latest_contract(get_db(), player_id)
+        if contract is None:
             return jsonify({"message": "No contract data found for this player."}), 404
-        return jsonify(contracts[0])
+        return jsonify(contract)
     except SQLAlchemyError as e:
         print(f"Error fetching player contracts for {player_id}: {e}")
         return jsonify({"error": f"Could not retrieve contract data for {player_id}."}), 500
-    finally:
-        session.close()
+
+def player_season_stats(connection, player_id, season):
+    """
+    The player's stat line for a season as a dict (a traded player's
+    combined line), or None.
+    """
+    row = connection.execute(player_season_stats_query(player_id, season)).fetchone()
+    return stats_row_to_dict(row) if row else None
 
 @app.route('/api/player_stats/<string:player_id>/<int:season>', methods=['GET'])
 def get_player_stats_for_season(player_id, season):
-    if not engine:
-        return jsonify({"error": "Database connection not established."}), 500
-    session = Session()
-    try:
-        stmt = select(player_stats_table, players_table.c.player_name).join(
-            players_table, player_stats_table.c.player_id == players_table.c.player_id
-        ).filter(
-            and_(player_stats_table.c.player_id == player_id,
-                 player_stats_table.c.season == season)
-        )
-        result_row = session.execute(stmt).fetchone()
-
-        if not result_row:
+    try:
+        stats = player_season_stats(get_db(), player_id, season)
+        if stats is None:
             return jsonify({"message": "No stats found for this player in the specified season."}), 404
-
-        stats = {}
-        for column in player_stats_table.columns:
-            value = getattr(result_row, column.name)
-            if isinstance(value, type(DECIMAL)):
-                stats[column.name] = float(value)
-            else:
-                stats[column.name] = value
-        stats['player_name'] = getattr(result_row, players_table.c.player_name.name)
-
         return jsonify(stats)
     except SQLAlchemyError as e:
         print(f"Error fetching player stats for {player_id} in {season}: {e}")
         return jsonify({"error": f"Could not retrieve stats for {player_id} in {season}."}), 500
-    finally:
-        session.close()
+
+@app.route('/api/player_stats/batch', methods=['POST'])
+def get_player_stats_batch():
+    """
+    Stats for several players in one request. JSON body:
+    {"player_ids": [...], "season_from": 2015, "season_to": 2025}
+    (the season bounds are optional). Results are grouped by player;
+    ids without any stat lines are listed under "missing".
+    """
+    payload = request.get_json(silent=True) or {}
+    player_ids = payload.get('player_ids')
+    season_from = payload.get('season_from')
+    season_to = payload.get('season_to')
+    if (not isinstance(player_ids, list) or not player_ids
+            or not all(isinstance(player_id, str) for player_id in player_ids)):
+        return jsonify({"error": "player_ids must be a non-empty list of strings."}), 400
+    if len(player_ids) > MAX_BATCH_PLAYERS:
+        return jsonify({"error": f"At most {MAX_BATCH_PLAYERS} player_ids per request."}), 400
+    # bool is a subclass of int, but a JSON true is not a season
+    if any(bound is not None and (isinstance(bound, bool) or not isinstance(bound, int))
+           for bound in (season_from, season_to)):
+        return jsonify({"error": "season_from and season_to must be integers."}), 400
+    player_ids = list(dict.fromkeys(player_ids))
+
+    try:
+        connection = get_db()
+        players = {}
+        for row in connection.execute(player_stats_query(player_ids, season_from, season_to)):
+            stats = stats_row_to_dict(row)
+            player = players.setdefault(stats['player_id'], {'player_name': stats['player_name'], 'seasons': []})
+            player['seasons'].append(stats)
+        return jsonify({
+            'players': players,
+            'missing': [player_id for player_id in player_ids if player_id not in players]
+        })
+    except SQLAlchemyError as e:
+        print(f"Error fetching batch player stats: {e}")
+        return jsonify({"error": "Could not retrieve player stats."}), 500
+
+@app.route('/api/players/<string:player_id>/career', methods=['GET'])
+def get_player_career(player_id):
+    """
+    Every season of a player plus aggregated career totals, in one round
+    trip. Optional ?season_from= / ?season_to= limit the range.
+    """
+    season_from = request.args.get('season_from', type=int)
+    season_to = request.args.get('season_to', type=int)
+    try:
+        connection = get_db()
+        seasons = [stats_row_to_dict(row)
+                   for row in connection.execute(player_stats_query([player_id], season_from, season_to))]
+        if not seasons:
+            return jsonify({"message": "No stats found for this player."}), 404
+        return jsonify({
+            'player_id': player_id,
+            'player_name': seasons[-1]['player_name'],
+            'seasons': seasons,
+            'career': career_totals(seasons)
+        })
+    except SQLAlchemyError as e:
+        print(f"Error fetching career stats for {player_id}: {e}")
+        return jsonify({"error": f"Could not retrieve career stats for {player_id}."}), 500
 
 @app.route('/api/season_stats/<int:season>', methods=['GET'])
 def get_all_player_stats_for_season(season):
-    if not engine:
-        return jsonify({"error": "Database connection not established."}), 500
-    session = Session()
+    """
+    Every player's stats for a season. Optional query parameters:
+    fields   comma separated columns to return (projected in SQL)
+    format   'rows' (default, array of objects), 'columns' (one JSON array
+             per field), 'msgpack' or 'arrow' (binary, column-oriented)
+    Responses are gzip/brotli compressed when the client accepts it.
+    """
+    fmt = requested_wire_format()
+    if fmt not in WIRE_FORMATS:
+        return jsonify({"error": f"Unknown format '{fmt}'. Use one of: {', '.join(WIRE_FORMATS)}."}), 400
     try:
-        stmt = select(player_stats_table, players_table.c.player_name).join(
-            players_table, player_stats_table.c.player_id == players_table.c.player_id
-        ).filter(player_stats_table.c.season == season)
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    encoding = negotiate_encoding(request.accept_encodings)
 
-        results = session.execute(stmt).fetchall()
+    try:
+        connection = get_db()
+        version, updated_at = get_season_version(connection, season)
+        cache_key = (season, fmt, fields, encoding)
+        entry = season_cache.get(cache_key, version)
+        if entry is not None:
+            return cached_response(entry)
+
+        results = connection.execute(season_stats_query(season, fields)).fetchall()
 
         if not results:
             return jsonify({"message": f"No stats found for season {season}."}), 404
 
-        all_stats_data = []
-        stat_column_names = [col.name for col in player_stats_table.columns]
-
-        for row in results:
-            row_dict = {}
-            for col_name in stat_column_names:
-                value = getattr(row, col_name)
-                if isinstance(value, type(DECIMAL)):
-                    row_dict[col_name] = float(value)
-                else:
-                    row_dict[col_name] = value
-            row_dict['player_name'] = getattr(row, players_table.c.player_name.name)
-            all_stats_data.append(row_dict)
-
-        return jsonify(all_stats_data)
+        with request_phase('serialize'):
+            if fmt == 'rows':
+                all_stats_data = [
+                    {field: to_native(value) for field, value in zip(fields, row)} for row in results
+                ]
+                body = compact_dumps(all_stats_data).encode('utf-8')
+            else:
+                columns = {field: [to_native(value) for value in values]
+                           for field, values in zip(fields, zip(*results))}
+                body = encode_columns(columns, len(results), fmt, compact_dumps)
+
+            body, content_encoding = compress(body, encoding)
+        entry = season_cache.put(cache_key, version, body, updated_at,
+                                 mimetype=WIRE_FORMATS[fmt], content_encoding=content_encoding)
+        return cached_response(entry)
+    except FormatUnavailable as e:
+        return jsonify({"error": str(e)}), 406
     except SQLAlchemyError as e:
         print(f"Error fetching all player stats for season {season}: {e}")
         return jsonify({"error": f"Could not retrieve all player stats for season {season}."}), 500
-    finally:
-        session.close()
+
+def build_rank_index(connection, season, stat):
+    """
+    Reads one stat for every player of a season and builds its sorted index,
+    using a traded player's combined line rather than each team's.
+    """
+    values = {}
+    for player_id, player_name, team, value in connection.execute(stat_values_query(season, stat)):
+        if player_id not in values or MULTI_TEAM_PATTERN.match(team or ''):
+            values[player_id] = (player_id, player_name, to_native(value))
+    return StatRankIndex(values.values())
+
+@app.route('/api/season_stats/<int:season>/rank/<string:stat>', methods=['GET'])
+def get_stat_ranking(season, stat):
+    """
+    Leaders and rankings for one stat in a season. Optional query parameters:
+    player_id     also return this player's value, rank and percentile
+    top           number of leaders to return (default 10)
+    order         'desc' (default, higher is better) or 'asc'
+    distribution  return about this many evenly spaced sorted values
+    """
+    if stat not in RANKABLE_STATS:
+        return jsonify({"error": f"Unknown stat '{stat}'. Use one of: {', '.join(RANKABLE_STATS)}."}), 400
+    order = request.args.get('order', 'desc')
+    if order not in ('asc', 'desc'):
+        return jsonify({"error": "order must be 'asc' or 'desc'."}), 400
+    descending = order == 'desc'
+    top = request.args.get('top', 10, type=int)
+    samples = request.args.get('distribution', 0, type=int)
+    if not 0 <= top <= MAX_RANK_RESULTS or not 0 <= samples <= MAX_RANK_RESULTS:
+        return jsonify({"error": f"top and distribution must be between 0 and {MAX_RANK_RESULTS}."}), 400
+    player_id = request.args.get('player_id')
+
+    try:
+        connection = get_db()
+        version, _ = get_season_version(connection, season)
+        index = rank_index_cache.get_or_build(
+            (season, stat), version, lambda: build_rank_index(connection, season, stat)
+        )
+        if not len(index):
+            return jsonify({"message": f"No {stat} values found for season {season}."}), 404
+
+        result = {
+            'season': season,
+            'stat': stat,
+            'order': order,
+            'count': len(index),
+            'leaders': index.leaders(top, descending)
+        }
+        if player_id:
+            result['player'] = index.player(player_id, descending)
+        if samples:
+            result['distribution'] = index.distribution(samples, player_id)
+        return jsonify(result)
+    except SQLAlchemyError as e:
+        print(f"Error ranking {stat} for season {season}: {e}")
+        return jsonify({"error": f"Could not rank {stat} for season {season}."}), 500
+
+@app.route('/api/season_aggregates/<int:season>', methods=['GET'])
+def get_season_aggregates(season):
+    """
+    Precomputed per-stat summaries (n, total, mean, stddev, min/max,
+    quantiles, league_rate) for a season. Optional filters: lg, position
+    ('*' selects the all-leagues / all-positions rollups) and stats (comma
+    separated).
+    """
+    lg = request.args.get('lg')
+    position = request.args.get('position')
+    stats = tuple(stat.strip() for stat in request.args.get('stats', '').split(',') if stat.strip())
+    unknown = [stat for stat in stats if stat not in AGGREGATED_STATS]
+    if unknown:
+        return jsonify({"error": f"Unknown stats: {', '.join(unknown)}."}), 400
+    try:
+        connection = get_db()
+        version, updated_at = get_season_version(connection, season)
+        cache_key = ('aggregates', season, lg, position, stats)
+        entry = season_cache.get(cache_key, version)
+        if entry is not None:
+            return cached_response(entry)
+
+        rows = connection.execute(season_aggregates_query(season, lg, position, stats)).fetchall()
+        if not rows:
+            return jsonify({"message": f"No aggregates found for season {season}."}), 404
+        body = compact_dumps([dict(row._mapping) for row in rows]).encode('utf-8')
+        entry = season_cache.put(cache_key, version, body, updated_at)
+        return cached_response(entry)
+    except SQLAlchemyError as e:
+        print(f"Error fetching aggregates for season {season}: {e}")
+        return jsonify({"error": f"Could not retrieve aggregates for season {season}."}), 500
+
+def season_aggregate_rows(connection, season, lg=ALL, position=ALL):
+    return [dict(row._mapping) for row in connection.execute(season_aggregates_query(season, lg, position))]
+
+def league_comparison(stats, aggregates, scope):
+    """
+    A player's season stats (from player_season_stats) next to one group's
+    aggregate rows: per stat the group mean, median, stddev, league_rate and
+    the player's z-score. None if the group has no aggregates.
+    """
+    if not aggregates:
+        return None
+    stats = dict(stats, pa=sum(stats.get(stat) or 0 for stat in PA_COMPONENTS))
+    comparison = {}
+    for aggregate in aggregates:
+        value = stats.get(aggregate['stat'])
+        comparison[aggregate['stat']] = {
+            'value': value,
+            'mean': aggregate['mean'],
+            'median': aggregate['median'],
+            'stddev': aggregate['stddev'],
+            'league_rate': aggregate['league_rate'],
+            'z_score': z_score(value, aggregate)
+        }
+    return {
+        'player_id': stats['player_id'],
+        'player_name': stats['player_name'],
+        'season': stats['season'],
+        'scope': scope,
+        'lg': aggregates[0]['lg'],
+        'position': aggregates[0]['position'],
+        'stats': comparison
+    }
+
+@app.route('/api/player_stats/<string:player_id>/<int:season>/compare', methods=['GET'])
+def compare_player_to_league(player_id, season):
+    """
+    A player's season next to the precomputed averages: for each stat the
+    group mean, median, stddev, league_rate and the player's z-score.
+    ?scope= picks the comparison group: 'season' (default, everyone),
+    'league' (the player's league) or 'position' (league and primary position).
+    A player traded between leagues is compared with all leagues.
+    """
+    scope = request.args.get('scope', 'season')
+    if scope not in ('season', 'league', 'position'):
+        return jsonify({"error": "scope must be 'season', 'league' or 'position'."}), 400
+    try:
+        connection = get_db()
+        stats = player_season_stats(connection, player_id, season)
+        if stats is None:
+            return jsonify({"message": "No stats found for this player in the specified season."}), 404
+        lg = ALL
+        if scope != 'season' and not MULTI_LEAGUE_PATTERN.match(stats['lg'] or ''):
+            lg = stats['lg']
+        position = primary_position(stats['position_played']) if scope == 'position' else ALL
+        comparison = league_comparison(stats, season_aggregate_rows(connection, season, lg, position), scope)
+        if comparison is None:
+            return jsonify({"message": f"No aggregates found for season {season}."}), 404
+        return jsonify(comparison)
+    except SQLAlchemyError as e:
+        print(f"Error comparing {player_id} in {season}: {e}")
+        return jsonify({"error": f"Could not compare {player_id} in {season}."}), 500
+
+def run_with_connection(query, *args):
+    """
+    Runs query(connection, *args) on a connection of its own, for queries
+    submitted to detail_executor.
+    """
+    with checkout_connection() as connection:
+        return query(connection, *args)
+
+@app.route('/api/player_detail/<string:player_id>/<int:season>', methods=['GET'])
+def get_player_detail(player_id, season):
+    """
+    Everything the player detail page loads, in one round trip: the
+    player's season stats, the comparison with the season's averages (as
+    /compare?scope=season returns it) and the latest contract (null if
+    none). The three queries are independent, so they run at the same time
+    on separate connections and the response takes about as long as the
+    slowest of them.
+    """
+    try:
+        with request_phase('db'):
+            stats_future = detail_executor.submit(run_with_connection, player_season_stats, player_id, season)
+            aggregates_future = detail_executor.submit(run_with_connection, season_aggregate_rows, season)
+            contract_future = detail_executor.submit(run_with_connection, latest_contract, player_id)
+            stats = stats_future.result()
+            aggregates = aggregates_future.result()
+            contract = contract_future.result()
+        if stats is None:
+            return jsonify({"message": "No stats found for this player in the specified season."}), 404
+        return jsonify({
+            'player_id': player_id,
+            'season': season,
+            'stats': stats,
+            'comparison': league_comparison(stats, aggregates, 'season'),
+            'contract': contract
+        })
+    except SQLAlchemyError as e:
+        print(f"Error fetching player detail for {player_id} in {season}: {e}")
+        return jsonify({"error": f"Could not retrieve player detail for {player_id} in {season}."}), 500
+
+def build_similarity_index(connection, season=None):
+    from player_similarity import SimilarityIndex
+    return SimilarityIndex(connection.execute(similarity_stats_query(season)), SIMILARITY_MIN_PA)
+
+@app.route('/api/players/<string:player_id>/similar', methods=['GET'])
+def get_similar_players(player_id):
+    """
+    The k (default 10) player seasons most like this player's ?season=, by
+    distance between standardized rate stats (OBP, SLG, walk, strikeout,
+    home run and steal attempt rates, WAR per 600 PA). ?scope= is 'season'
+    (default, that season's players) or 'all' (every season, each
+    standardized within its own season). Only seasons with at least
+    SIMILARITY_MIN_PA plate appearances are returned.
+    """
+    season = request.args.get('season', type=int)
+    k = request.args.get('k', 10, type=int)
+    scope = request.args.get('scope', 'season')
+    if season is None:
+        return jsonify({"error": "season is required."}), 400
+    if not 1 <= k <= MAX_SIMILAR_PLAYERS:
+        return jsonify({"error": f"k must be between 1 and {MAX_SIMILAR_PLAYERS}."}), 400
+    if scope not in ('season', 'all'):
+        return jsonify({"error": "scope must be 'season' or 'all'."}), 400
+    try:
+        connection = get_db()
+        if scope == 'season':
+            version, _ = get_season_version(connection, season)
+            index = similarity_cache.get_or_build(
+                ('season', season), version, lambda: build_similarity_index(connection, season)
+            )
+        else:
+            version = tuple(connection.execute(data_version_query()).fetchone())
+            index = similarity_cache.get_or_build(('all',), version, lambda: build_similarity_index(connection))
+        result = index.neighbors(player_id, season, k)
+        if result is None:
+            return jsonify({"message": "No stats found for this player in the specified season."}), 404
+        player, similar = result
+        return jsonify({
+            'player': player,
+            'scope': scope,
+            'min_pa': SIMILARITY_MIN_PA,
+            'similar': similar
+        })
+    except SQLAlchemyError as e:
+        print(f"Error finding players similar to {player_id} in {season}: {e}")
+        return jsonify({"error": f"Could not find players similar to {player_id} in {season}."}), 500
+
+def get_statcast_store():
+    """
+    The Statcast store, opened on first use. Only the Statcast routes import
+    statcast_store (and with it pandas and pyarrow).
+    """
+    global statcast_store
+    if statcast_store is None:
+        from statcast_store import StatcastStore
+        statcast_store = StatcastStore(STATCAST_STORE_DIR)
+    return statcast_store
+
+def statcast_unavailable():
+    return jsonify({"error": "pandas and pyarrow are required for Statcast data."}), 503
+
+def statcast_pitcher_response(pitcher_id, season, cache_key, columns, summarize):
+    """
+    Scans one pitcher's season in the Statcast store and returns
+    summarize(pitches) as JSON, cached per store season version.
+    """
+    try:
+        store = get_statcast_store()
+        version, updated_at = store.season_version(season)
+        entry = season_cache.get(cache_key, ('statcast', version))
+        if entry is not None:
+            return cached_response(entry)
+
+        pitches = store.scan(season, columns, pitcher_id)
+        if pitches.empty:
+            return jsonify({"message": f"No Statcast pitches found for pitcher {pitcher_id} in {season}."}), 404
+        payload = {'pitcher': pitcher_id, 'season': season, 'pitches': len(pitches), **summarize(pitches)}
+        body = compact_dumps(payload).encode('utf-8')
+        entry = season_cache.put(cache_key, ('statcast', version), body, updated_at)
+        return cached_response(entry)
+    except (OSError, ValueError) as e:
+        print(f"Error reading Statcast data for pitcher {pitcher_id} in {season}: {e}")
+        return jsonify({"error": f"Could not read Statcast data for pitcher {pitcher_id} in {season}."}), 500
+
+@app.route('/api/statcast/pitchers/<int:pitcher_id>/<int:season>/pitch_mix', methods=['GET'])
+def get_pitch_mix(pitcher_id, season):
+    """
+    A pitcher's pitch mix (pitcher_id is the MLBAM ID): usage per pitch type
+    overall and by batter handedness, with average velocity and spin.
+    """
+    try:
+        from statcast_store import pitch_mix
+    except ImportError:
+        return statcast_unavailable()
+    columns = ['pitch_type', 'pitch_name', 'stand', 'release_speed', 'release_spin_rate']
+    return statcast_pitcher_response(pitcher_id, season, ('statcast_mix', pitcher_id, season), columns,
+                                     lambda pitches: {'pitch_mix': pitch_mix(pitches)})
+
+@app.route('/api/statcast/pitchers/<int:pitcher_id>/<int:season>/distributions', methods=['GET'])
+def get_pitch_distributions(pitcher_id, season):
+    """
+    Velocity and spin distributions per pitch type: summary statistics,
+    quantiles and a histogram. ?stats= limits the output to release_speed
+    and/or release_spin_rate.
+    """
+    try:
+        from statcast_store import DISTRIBUTION_BIN_WIDTHS, pitch_distributions
+    except ImportError:
+        return statcast_unavailable()
+    stats = tuple(stat.strip() for stat in request.args.get('stats', '').split(',') if stat.strip()) \
+        or tuple(DISTRIBUTION_BIN_WIDTHS)
+    unknown = [stat for stat in stats if stat not in DISTRIBUTION_BIN_WIDTHS]
+    if unknown:
+        return jsonify({"error": f"Unknown stats: {', '.join(unknown)}. Use: {', '.join(DISTRIBUTION_BIN_WIDTHS)}."}), 400
+    return statcast_pitcher_response(pitcher_id, season, ('statcast_distributions', pitcher_id, season, stats),
+                                     ['pitch_type', *stats],
+                                     lambda pitches: {stat: pitch_distributions(pitches, stat) for stat in stats})
+
+@app.route('/api/cache_stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({'season_stats': season_cache.stats(), 'rank_indexes': rank_index_cache.stats(),
+                    'player_search': player_search_cache.stats(), 'similarity': similarity_cache.stats()})
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """
+    Liveness: the process is up and serving. Never touches the database.
+    """
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Readiness: 200 once the database answers a query, else 503 with
+    Retry-After, so load balancers and compose hold traffic until then.
+    """
+    try:
+        get_db().execute(text('SELECT 1'))
+    except SQLAlchemyError as e:
+        print(f"Readiness check failed: {e}")
+        return jsonify({'status': 'unavailable', 'error': 'Database query failed.'}), 503
+    return jsonify({'status': 'ready'})
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Request, database, pool and cache metrics in Prometheus text format.
+    """
+    return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    warm_player_search()
+    app.run(debug=os.getenv('FLASK_DEBUG', 'false').lower() in ('1', 'true', 'yes'), host='0.0.0.0', port=5000)
\ No newline at end of file
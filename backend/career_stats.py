@@ -0,0 +1,56 @@
+from season_aggregates import MULTI_TEAM_PATTERN, PA_COMPONENTS
+
+# Counting stats that are summed across seasons
+COUNTING_STATS = [
+    'games_played', 'at_bats', 'runs', 'hits', 'doubles', 'triples', 'home_runs',
+    'rbi', 'walks', 'strikeouts', 'sb', 'cs', 'tb', 'gidp', 'hbp', 'sh', 'sf', 'ibb'
+]
+
+# Index-style rate stats that cannot be rebuilt from the counting stats;
+# their career value is a plate-appearance weighted mean
+WEIGHTED_RATE_STATS = ['ops_plus', 'roba', 'rbat_plus']
+
+
+def season_lines(rows):
+    """
+    Picks the stat lines that make up each season's totals: a traded
+    player's combined "2TM"/"3TM" line if present, otherwise every line of
+    that season. This avoids counting a traded player's season twice.
+    """
+    by_season = {}
+    for row in rows:
+        by_season.setdefault(row['season'], []).append(row)
+    selected = []
+    for season in sorted(by_season):
+        lines = by_season[season]
+        combined = [row for row in lines if MULTI_TEAM_PATTERN.match(row.get('team') or '')]
+        selected.extend(combined[:1] or lines)
+    return selected
+
+
+def plate_appearances(row):
+    return sum(row.get(stat) or 0 for stat in PA_COMPONENTS)
+
+
+def career_totals(rows):
+    """
+    Aggregates per-season stat dicts into career totals: counting stats and
+    WAR are summed, OBP/SLG/OPS are recomputed from the summed components
+    and index stats (OPS+, rOBA, Rbat+) are plate-appearance weighted.
+    """
+    lines = season_lines(rows)
+    totals = {stat: sum(row.get(stat) or 0 for row in lines) for stat in COUNTING_STATS}
+    totals['seasons'] = len({row['season'] for row in lines})
+    totals['war'] = round(sum(row.get('war') or 0 for row in lines), 2)
+
+    on_base_chances = totals['at_bats'] + totals['walks'] + totals['hbp'] + totals['sf']
+    totals['obp'] = round((totals['hits'] + totals['walks'] + totals['hbp']) / on_base_chances, 3) if on_base_chances else None
+    totals['slg'] = round(totals['tb'] / totals['at_bats'], 3) if totals['at_bats'] else None
+    totals['ops'] = round(totals['obp'] + totals['slg'], 3) if totals['obp'] is not None and totals['slg'] is not None else None
+
+    weights = [plate_appearances(row) for row in lines]
+    total_weight = sum(weights)
+    for stat in WEIGHTED_RATE_STATS:
+        weighted = sum((row.get(stat) or 0) * weight for row, weight in zip(lines, weights))
+        totals[stat] = round(weighted / total_weight, 3) if total_weight else None
+    return totals
@@ -0,0 +1,92 @@
+"""
+The API's database engine, created on first use instead of at import.
+
+app.py used to connect while being imported and, if MySQL was not up yet,
+kept engine = None for the life of the process. Now importing app.py never
+touches the database: the engine is created by the first request, each
+connection attempt is retried with exponential backoff, and after a round
+of failed attempts new requests fail fast (503) until the backoff has passed
+instead of each waiting on a database that is down.
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+
+class DatabaseUnavailable(Exception):
+    """
+    No connection could be made. retry_after is the number of seconds until
+    the next connection attempt will be made.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LazyEngine:
+    """
+    Creates the engine on first use and hands out connections, retrying
+    attempts times with a delay doubling from backoff up to max_backoff.
+    on_create(engine) runs once when the engine is created (e.g. to attach
+    event listeners).
+    """
+
+    def __init__(self, url, options=None, attempts=3, backoff=0.25, max_backoff=5.0, on_create=None):
+        self.url = url
+        self.options = options or {}
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_create = on_create
+        self.engine = None # None until the first call to get_engine()
+        self.connect_errors = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._failed_rounds = 0
+        self._retry_at = 0.0
+
+    def get_engine(self):
+        if self.engine is None:
+            with self._lock:
+                if self.engine is None:
+                    engine = create_engine(self.url, **self.options)
+                    if self.on_create:
+                        self.on_create(engine)
+                    self.engine = engine
+        return self.engine
+
+    def delay(self, step):
+        return min(self.backoff * 2 ** step, self.max_backoff)
+
+    def connect(self):
+        """
+        A new connection from the pool. Raises DatabaseUnavailable once every
+        attempt has failed, or straight away while backing off after an
+        earlier failed round.
+        """
+        wait = self._retry_at - time.monotonic()
+        if wait > 0:
+            raise DatabaseUnavailable(f"Database unavailable: {self.last_error}", wait)
+        engine = self.get_engine()
+        for attempt in range(self.attempts):
+            if attempt:
+                time.sleep(self.delay(attempt - 1))
+            try:
+                connection = engine.connect()
+            except OperationalError as e:
+                self.connect_errors += 1
+                self.last_error = e.orig if e.orig is not None else e
+                print(f"Error connecting to database (attempt {attempt + 1} of {self.attempts}): {self.last_error}")
+                continue
+            if self._failed_rounds:
+                print("Reconnected to the database.")
+            self._failed_rounds = 0
+            self._retry_at = 0.0
+            return connection
+        wait = self.delay(self.attempts - 1 + self._failed_rounds)
+        self._failed_rounds += 1
+        self._retry_at = time.monotonic() + wait
+        raise DatabaseUnavailable(f"Database unavailable: {self.last_error}", wait)
@@ -0,0 +1,38 @@
+"""
+Production server settings: gunicorn -c gunicorn.conf.py app:app
+
+app.py is imported once in the master and forked into the workers
+(preload_app), which starts them faster and shares the imported code's
+memory. Importing app.py opens no connections; each worker creates its own
+engine on its first request, so the database can see up to
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+# Each worker can hold DB_POOL_SIZE + DB_MAX_OVERFLOW (15 by default) MySQL
+# connections and MySQL allows 151 by default, so the worker count is capped
+# rather than growing with the host's CPUs: four workers stay at 60, leaving
+# room for the loader. Raise WEB_CONCURRENCY together with max_connections.
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+# Requests mostly wait on MySQL, so each worker also serves a few on threads;
+# keep this at or below DB_POOL_SIZE + DB_MAX_OVERFLOW (a /api/player_detail
+# request holds up to three connections while its queries run in parallel)
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+# Restart workers now and then so slow leaks cannot build up
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = 500
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    # Each worker builds its own player search index; start it before the
+    # first search instead of during it (app is already imported: preload_app)
+    from app import warm_player_search
+    warm_player_search()
@@ -0,0 +1,199 @@
+"""
+Minimal in-process metrics with Prometheus text exposition (format 0.0.4):
+counters, histograms and callback metrics read at scrape time. Values are
+per process, so with several gunicorn workers each worker reports its own.
+"""
+import io
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Histogram buckets for durations, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histogram buckets for response sizes, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    """
+    Renders {name: value} as {name="value",...}, escaped as the format requires.
+    """
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class Counter:
+    """
+    A monotonically increasing value per label combination.
+    """
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """
+    Observations counted into cumulative buckets per label combination,
+    with their sum and count.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * len(self.buckets), 0.0]
+            counts[0][bisect_left(self.buckets, value)] += 1
+            counts[1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(counts[0]), counts[1]) for key, counts in self._values.items()]
+        samples = []
+        for key, bucket_counts, total in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, bucket_counts):
+                cumulative += count
+                samples.append((self.name + '_bucket', {**labels, 'le': format_value(float(bound))}, cumulative))
+            samples.append((self.name + '_sum', labels, total))
+            samples.append((self.name + '_count', labels, cumulative))
+        return samples
+
+
+class CallbackMetric:
+    """
+    A gauge or counter whose samples come from collect() at scrape time,
+    for values other objects already track (pool state, cache statistics).
+    collect returns a list of (labels, value).
+    """
+
+    def __init__(self, name, documentation, kind, collect):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self):
+        return [(self.name, labels, value) for labels, value in self.collect()]
+
+
+class MetricsRegistry:
+    """
+    The metrics of one process, rendered together for /metrics.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, kind, collect):
+        return self._register(CallbackMetric(name, documentation, kind, collect))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Every metric in Prometheus text format.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class SlowRequestProfiler:
+    """
+    Profiles a sample of requests with cProfile and reports the ones that
+    turn out slow. A request cannot be profiled after the fact, so the
+    sample_rate fraction of requests runs under the profiler and only those
+    slower than slow_seconds are printed (and saved to output_dir as .prof
+    files, if set). sample_rate 0 turns profiling off.
+    """
+
+    def __init__(self, sample_rate, slow_seconds, output_dir=None, top=25):
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.output_dir = output_dir
+        self.top = top
+
+    def start(self, random_value):
+        """
+        Returns an enabled profiler if this request is sampled, else None.
+        """
+        if self.sample_rate <= 0 or random_value >= self.sample_rate:
+            return None
+        import cProfile # only imported once profiling is turned on
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError: # another profiler is already active on this thread
+            return None
+        return profiler
+
+    def finish(self, profiler, label, elapsed):
+        """
+        Stops profiler and reports it if the request took at least
+        slow_seconds. Returns True when it was reported.
+        """
+        profiler.disable()
+        if elapsed < self.slow_seconds:
+            return False
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.top)
+        print(f"Slow request {label} took {elapsed * 1000:.1f} ms; profile:\n{stream.getvalue()}")
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            safe_label = ''.join(ch if ch.isalnum() else '_' for ch in label).strip('_')
+            profiler.dump_stats(os.path.join(self.output_dir, f'{int(time.time() * 1000)}_{safe_label}.prof'))
+        return True
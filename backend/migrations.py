@@ -0,0 +1,161 @@
+"""
+Versioned schema migrations for databases created by an older init.sql or
+loader. Each migration runs once, in order, and is recorded in the
+schema_migrations table. Migrations inspect the schema before changing it,
+so they are no-ops on a database that init.sql already created in its
+current form.
+
+    python migrations.py                      # MySQL from the .env settings
+    python migrations.py --db-url sqlite:///local.db
+"""
+import argparse
+import datetime
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, inspect, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+migrations_metadata = MetaData()
+
+schema_migrations_table = Table(
+    'schema_migrations', migrations_metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+def index_names(inspector, table):
+    """
+    Names of a table's indexes and unique constraints.
+    """
+    names = {idx['name'] for idx in inspector.get_indexes(table)}
+    names.update(con['name'] for con in inspector.get_unique_constraints(table))
+    return names
+
+
+def add_incremental_sync_schema(conn):
+    """
+    Adds the columns and unique key that incremental loads rely on:
+    ingested_files.seasons, player_stats.row_hash and uq_player_stats_line.
+    Duplicate stat lines left behind by earlier append-only loads are removed
+    first, keeping the oldest stat_id of each line so row IDs stay stable.
+    """
+    inspector = inspect(conn)
+    key = 'player_id, season, team, lg'
+    if 'seasons' not in {col['name'] for col in inspector.get_columns('ingested_files')}:
+        conn.execute(text("ALTER TABLE ingested_files ADD COLUMN seasons VARCHAR(1000) NULL"))
+    if 'row_hash' not in {col['name'] for col in inspector.get_columns('player_stats')}:
+        conn.execute(text("ALTER TABLE player_stats ADD COLUMN row_hash CHAR(40) NULL"))
+        print("Added player_stats.row_hash column.")
+    if 'uq_player_stats_line' not in index_names(inspector, 'player_stats'):
+        result = conn.execute(text(
+            "DELETE FROM player_stats WHERE stat_id NOT IN ("
+            f"SELECT keep_id FROM (SELECT MIN(stat_id) AS keep_id FROM player_stats GROUP BY {key}) AS keepers)"
+        ))
+        if result.rowcount:
+            print(f"Removed {result.rowcount} duplicate player_stats rows.")
+        conn.execute(text(f"CREATE UNIQUE INDEX uq_player_stats_line ON player_stats ({key})"))
+        print("Added unique key uq_player_stats_line.")
+
+
+def add_api_access_path_indexes(conn):
+    """
+    Indexes for the API's access paths. Lookups by player (and season) are
+    already served by the leading columns of uq_player_stats_line; this adds
+    the season-wide path (season, player_id) used by /api/season_stats and the
+    rank endpoint, and (player_id, contract_start_year) matching the contract
+    lookup's filter and ORDER BY.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    wanted = [
+        ('player_stats', 'ix_player_stats_season', 'season, player_id'),
+        ('player_contracts', 'ix_player_contracts_player_start', 'player_id, contract_start_year')
+    ]
+    for table, name, columns in wanted:
+        if table in tables and name not in index_names(inspector, table):
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+            print(f"Added index {name} on {table} ({columns}).")
+
+
+def add_player_identity_schema(conn):
+    """
+    Adds players.mlbam_id, which identity resolution backfills from the
+    player register, with a unique index so one MLBAM ID maps to one player.
+    player_aliases is a new table, created by the loader like the others.
+    """
+    inspector = inspect(conn)
+    if 'players' not in inspector.get_table_names():
+        return
+    if 'mlbam_id' not in {col['name'] for col in inspector.get_columns('players')}:
+        conn.execute(text("ALTER TABLE players ADD COLUMN mlbam_id INT NULL"))
+        print("Added players.mlbam_id column.")
+    unique_columns = [idx['column_names'] for idx in inspector.get_indexes('players') if idx['unique']]
+    unique_columns += [con['column_names'] for con in inspector.get_unique_constraints('players')]
+    if ['mlbam_id'] not in unique_columns:
+        conn.execute(text("CREATE UNIQUE INDEX uq_players_mlbam_id ON players (mlbam_id)"))
+        print("Added unique index uq_players_mlbam_id.")
+
+
+def add_players_batting_hand(conn):
+    """
+    Adds players.batting_hand, which init.sql and the API always had but
+    loader-created databases lacked before the tables moved to schema.py.
+    """
+    inspector = inspect(conn)
+    if 'players' not in inspector.get_table_names():
+        return
+    if 'batting_hand' not in {col['name'] for col in inspector.get_columns('players')}:
+        conn.execute(text("ALTER TABLE players ADD COLUMN batting_hand VARCHAR(10) NULL"))
+        print("Added players.batting_hand column.")
+
+
+# (version, name, function) in the order they must run; never renumber
+MIGRATIONS = [
+    (1, 'incremental_sync_schema', add_incremental_sync_schema),
+    (2, 'api_access_path_indexes', add_api_access_path_indexes),
+    (3, 'player_identity_schema', add_player_identity_schema),
+    (4, 'players_batting_hand', add_players_batting_hand)
+]
+
+
+def run_migrations(engine):
+    """
+    Applies every migration not yet recorded in schema_migrations, each in
+    its own transaction. Returns the versions applied.
+    """
+    migrations_metadata.create_all(engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations_table.c.version)).scalars())
+
+    newly_applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(schema_migrations_table.insert().values(
+                version=version, name=name, applied_at=datetime.datetime.now()
+            ))
+        print(f"Applied migration {version}: {name}")
+        newly_applied.append(version)
+    return newly_applied
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument('--db-url', default=os.getenv('DATABASE_URL'),
+                        help="SQLAlchemy URL to migrate instead of the MySQL database from .env.")
+    args = parser.parse_args()
+    db_url = args.db_url or (
+        f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST', 'mysql_db')}:"
+        f"{os.getenv('DB_PORT', 3306)}/{os.getenv('DB_DATABASE', 'baseball_analytics')}"
+    )
+    try:
+        applied = run_migrations(create_engine(db_url))
+        print(f"{len(applied)} migration(s) applied." if applied else "Schema is up to date.")
+    except SQLAlchemyError as e:
+        print(f"Error applying migrations: {e}")
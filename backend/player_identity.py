@@ -0,0 +1,237 @@
+"""
+Player identity resolution: maps Baseball-Reference batting rows to one
+canonical player_id per player, so every season and team of a player is
+stored under the same key.
+
+A row is resolved, in order of preference, from
+  1. its Baseball-Reference ID (the "Player-additional" CSV column),
+  2. an alias recorded by an earlier load (name + birth year),
+  3. an exact name match in the offline player register,
+  4. a fuzzy name match in the register (difflib, batched per season),
+  5. otherwise a name + birth year slug, which is still stable across
+     seasons and teams.
+Two players sharing a name and birth year in one season cannot be told
+apart by steps 2-5, so such rows keep their generated (legacy) IDs.
+
+The register is a Chadwick Bureau people file (the data behind pybaseball's
+playerid_lookup): key_bbref, key_mlbam, name_first, name_last, birth_year,
+mlb_played_first, mlb_played_last.
+"""
+import difflib
+import os
+
+import pandas as pd
+
+from player_search import normalize_name
+
+REGISTER_COLUMNS = ['key_bbref', 'key_mlbam', 'name_first', 'name_last', 'birth_year',
+                    'mlb_played_first', 'mlb_played_last']
+
+# Name suffixes ignored when matching, since sources disagree on them
+SUFFIX_TOKENS = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+# Minimum difflib ratio for a fuzzy register match
+FUZZY_CUTOFF = 0.85
+
+# Alias types stored in player_aliases
+LEGACY_ID_ALIAS = 'legacy_id'
+NAME_BIRTH_ALIAS = 'name_birth'
+
+
+def identity_name_key(name):
+    """
+    Normalized name used for matching: accents, punctuation, handedness
+    markers and suffixes removed ("Ronald Acuña Jr.*" -> "ronald acuna").
+    """
+    return ' '.join(token for token in normalize_name(name).split() if token not in SUFFIX_TOKENS)
+
+
+def load_register(path):
+    """
+    Reads a Chadwick-style register CSV into a DataFrame of REGISTER_COLUMNS
+    plus 'name_key', dropping people who never played in MLB.
+    """
+    register = pd.read_csv(path, usecols=lambda column: column in REGISTER_COLUMNS, dtype={'key_bbref': str})
+    register = register.dropna(subset=['name_last'])
+    register = register[register['key_bbref'].notna() | register['key_mlbam'].notna()]
+    register['name_key'] = (register['name_first'].fillna('') + ' ' + register['name_last']).map(identity_name_key)
+    return register.reset_index(drop=True)
+
+
+def fetch_register(path):
+    """
+    Downloads the Chadwick register with pybaseball (optional dependency)
+    and saves it to path, so later loads work offline.
+    """
+    try:
+        from pybaseball import chadwick_register
+    except ImportError:
+        raise RuntimeError("pybaseball is not installed; download the register CSV manually instead.")
+    register = chadwick_register()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    register[[col for col in REGISTER_COLUMNS if col in register.columns]].to_csv(path, index=False)
+    return path
+
+
+def has_bbref_id(row):
+    bbref_id = row.get('bbref_id')
+    return bool(bbref_id) and bbref_id != 'N/A'
+
+
+def canonical_register_id(person):
+    """
+    A register row's canonical player_id: its bbref ID, else its MLBAM ID.
+    """
+    if isinstance(person['key_bbref'], str) and person['key_bbref']:
+        return person['key_bbref']
+    return f"mlbam_{int(person['key_mlbam'])}"
+
+
+class PlayerResolver:
+    """
+    Resolves cleaned batting DataFrames to canonical player_ids. Aliases it
+    discovers are collected in new_aliases and MLBAM IDs in mlbam_ids, for
+    the loader to write once the load is done.
+    """
+
+    def __init__(self, register=None, known_aliases=None):
+        """
+        register: DataFrame from load_register(), or None.
+        known_aliases: {name_birth alias: player_id} from earlier loads.
+        """
+        self.known_aliases = dict(known_aliases or {})
+        self.new_aliases = {}
+        self.mlbam_ids = {}
+        self.counts = {'bbref': 0, 'alias': 0, 'register': 0, 'fuzzy': 0, 'name_birth': 0, 'legacy': 0}
+        self.register = register
+        self.by_name = {}
+        self.mlbam_by_id = {}
+        if register is not None:
+            for person in register.to_dict('records'):
+                self.by_name.setdefault(person['name_key'], []).append(person)
+                if pd.notna(person['key_mlbam']):
+                    self.mlbam_by_id[canonical_register_id(person)] = int(person['key_mlbam'])
+
+    def _candidates(self, people, season, birth_year):
+        """
+        Register people consistent with a row's season and estimated birth
+        year (Baseball-Reference ages are as of June 30, so allow one year).
+        """
+        matches = []
+        for person in people:
+            first, last = person['mlb_played_first'], person['mlb_played_last']
+            if pd.notna(first) and pd.notna(last) and not first <= season <= last:
+                continue
+            if birth_year is not None and pd.notna(person['birth_year']) and abs(person['birth_year'] - birth_year) > 1:
+                continue
+            matches.append(person)
+        return matches
+
+    def _fuzzy_lookup(self, unresolved):
+        """
+        Batch fuzzy matching: for each season, the unresolved names are
+        compared with the names of register people active that season only.
+        unresolved: {(name_key, season, birth_year)}; returns {same key: (person, ratio)}.
+        """
+        found = {}
+        if self.register is None:
+            return found
+        by_season = {}
+        for key in unresolved:
+            by_season.setdefault(key[1], []).append(key)
+        played_first = self.register['mlb_played_first']
+        played_last = self.register['mlb_played_last']
+        for season, keys in by_season.items():
+            active = self.register[(played_first.isna() | (played_first <= season)) &
+                                   (played_last.isna() | (played_last >= season))]
+            names = active['name_key'].unique().tolist()
+            for name_key, _, birth_year in keys:
+                for match in difflib.get_close_matches(name_key, names, n=3, cutoff=FUZZY_CUTOFF):
+                    people = self._candidates(self.by_name[match], season, birth_year)
+                    if len(people) == 1:
+                        ratio = difflib.SequenceMatcher(None, name_key, match).ratio()
+                        found[(name_key, season, birth_year)] = (people[0], ratio)
+                        break
+        return found
+
+    def _record(self, alias_type, alias, player_id, source, score=None):
+        if alias != player_id:
+            self.new_aliases[(alias_type, alias[:100])] = (player_id, source, score)
+
+    def resolve(self, df):
+        """
+        Returns df with player_id replaced by canonical IDs. Works on the
+        distinct (name, bbref_id, season, age) combinations, not on every row.
+        """
+        columns = [col for col in ['player_name', 'bbref_id', 'season', 'age'] if col in df.columns]
+        rows = {}
+        legacy_ids = {}
+        resolved = {}
+        pending = {}
+        for row in df[columns + ['player_id']].drop_duplicates().to_dict('records'):
+            key = tuple(row[col] for col in columns)
+            # Legacy IDs also encode the team, so one key can have several
+            legacy_ids.setdefault(key, []).append(row['player_id'])
+            if key in rows:
+                continue
+            rows[key] = row
+            name_key = identity_name_key(row['player_name'])
+            season = int(row['season'])
+            birth_year = season - int(row['age']) if row.get('age') else None
+            row['alias'] = f"{name_key}|{birth_year}" if birth_year else None
+            row['lookup'] = (name_key, season, birth_year)
+
+        # Rows without a bbref ID that share a name and birth year within a
+        # season but differ otherwise (e.g. one bats left, "Name*") are two
+        # people. Every later step would merge them, so they keep their
+        # generated IDs.
+        shared = {}
+        for key, row in rows.items():
+            if row['alias'] and not has_bbref_id(row):
+                shared.setdefault(row['lookup'], []).append(key)
+        ambiguous = {lookup for lookup, keys in shared.items() if len(keys) > 1}
+        for name_key, season, birth_year in sorted(ambiguous):
+            print(f"Warning: several players named '{name_key}' born in {birth_year} played in {season}; "
+                  f"keeping their generated IDs instead of merging them by name and birth year.")
+
+        for key, row in rows.items():
+            name_key, season, birth_year = row['lookup']
+            if has_bbref_id(row):
+                resolved[key] = (row['bbref_id'], 'bbref', None)
+            elif row['lookup'] in ambiguous:
+                resolved[key] = (row['player_id'], 'legacy', None)
+            elif row['alias'] in self.known_aliases:
+                resolved[key] = (self.known_aliases[row['alias']], 'alias', None)
+            else:
+                people = self._candidates(self.by_name.get(name_key, []), season, birth_year)
+                if len(people) == 1:
+                    resolved[key] = (canonical_register_id(people[0]), 'register', None)
+                else:
+                    pending[key] = row['lookup']
+
+        fuzzy = self._fuzzy_lookup(set(pending.values()))
+        for key, lookup in pending.items():
+            name_key, _, birth_year = lookup
+            if lookup in fuzzy:
+                person, ratio = fuzzy[lookup]
+                resolved[key] = (canonical_register_id(person), 'fuzzy', round(ratio, 3))
+            elif birth_year is not None:
+                resolved[key] = (f"{'_'.join(name_key.split())}_{birth_year}"[:50], 'name_birth', None)
+            else:
+                resolved[key] = (rows[key]['player_id'], 'legacy', None)
+
+        for key, (player_id, source, score) in resolved.items():
+            row = rows[key]
+            self.counts[source] += 1
+            for legacy_id in legacy_ids[key]:
+                self._record(LEGACY_ID_ALIAS, legacy_id, player_id, source, score)
+            if row['alias'] and source != 'legacy':
+                self.known_aliases.setdefault(row['alias'], player_id)
+                self._record(NAME_BIRTH_ALIAS, row['alias'], player_id, source, score)
+            if player_id in self.mlbam_by_id:
+                self.mlbam_ids[player_id] = self.mlbam_by_id[player_id]
+
+        keys = zip(*[df[col] for col in columns])
+        df = df.copy()
+        df['player_id'] = [resolved[key][0] for key in keys]
+        return df
@@ -0,0 +1,241 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+# Rank of each kind of match; lower sorts first
+FULL_PREFIX, WORD_PREFIX, FUZZY = 0, 1, 2
+
+# Fraction of the query's trigrams a name must share to be a fuzzy match
+MIN_TRIGRAM_SIMILARITY = 0.4
+
+# Most names a fuzzy query scores; common trigrams are shared by tens of
+# thousands of names, so counting every posting would dominate the query
+MAX_FUZZY_CANDIDATES = 1000
+
+
+def normalize_name(name):
+    """
+    Lower-cases name and strips accents and punctuation, so "José Ramírez Jr."
+    and "jose ramirez jr" normalize to the same key.
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^a-z0-9\s]', ' ', stripped.lower()).split())
+
+
+def trigrams(text):
+    """
+    Trigrams of each word of text, padded so word starts weigh more.
+    """
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PlayerSearchIndex:
+    """
+    In-memory typeahead index over (player_id, player_name) pairs.
+
+    Prefix lookups binary-search two sorted key lists, one of whole
+    normalized names and one of every later word of each name, and only
+    touch the entries they return. Queries that match no prefix fall back
+    to trigram similarity, which tolerates typos.
+    """
+
+    def __init__(self, rows):
+        players = sorted((normalize_name(name), player_id, name) for player_id, name in rows)
+        self.player_ids = [player_id for _, player_id, _ in players]
+        self.player_names = [name for _, _, name in players]
+        self.names = [key for key, _, _ in players]
+        # Whole names are already sorted; later words map back to their player
+        words = sorted((word, position) for position, key in enumerate(self.names)
+                       for word in key.split()[1:])
+        self.words = [word for word, _ in words]
+        self.word_positions = [position for _, position in words]
+        # Trigrams index distinct names only: one name covers many player_ids
+        self.distinct_names = sorted(set(self.names))
+        self.trigram_postings = {}
+        for name_id, key in enumerate(self.distinct_names):
+            for gram in trigrams(key):
+                self.trigram_postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_matches(self, query):
+        """
+        Yields (position, rank) for names starting with query, then for names
+        with a later word starting with it, each group in alphabetical order.
+        """
+        start = bisect_left(self.names, query)
+        for position in range(start, len(self.names)):
+            if not self.names[position].startswith(query):
+                break
+            yield position, FULL_PREFIX
+        start = bisect_left(self.words, query)
+        for i in range(start, len(self.words)):
+            if not self.words[i].startswith(query):
+                break
+            yield self.word_positions[i], WORD_PREFIX
+
+    def _fuzzy_matches(self, query, wanted):
+        """
+        Up to wanted (position, rank) pairs for names sharing at least
+        MIN_TRIGRAM_SIMILARITY of the query's trigrams, most similar first.
+
+        A name sharing that many trigrams must contain one of the query's
+        rarest len(grams) - needed + 1 trigrams, so only those postings are
+        read for candidates (rarest first, stopping at MAX_FUZZY_CANDIDATES);
+        the commoner trigrams are looked up per candidate by binary search.
+        """
+        grams = trigrams(query)
+        needed = math.ceil(MIN_TRIGRAM_SIMILARITY * len(grams))
+        postings = sorted((self.trigram_postings.get(gram, []) for gram in grams), key=len)
+        shared = Counter()
+        read = 0
+        while read <= len(grams) - needed and len(shared) < MAX_FUZZY_CANDIDATES:
+            shared.update(postings[read])
+            read += 1
+        if len(shared) > MAX_FUZZY_CANDIDATES:
+            shared = Counter(dict(shared.most_common(MAX_FUZZY_CANDIDATES)))
+        # Postings are built in name_id order, so they are sorted
+        for posting in postings[read:]:
+            for name_id in shared:
+                i = bisect_left(posting, name_id)
+                if i < len(posting) and posting[i] == name_id:
+                    shared[name_id] += 1
+        ranked = sorted((-count, name_id) for name_id, count in shared.items() if count >= needed)
+        matches = []
+        for _, name_id in ranked:
+            key = self.distinct_names[name_id]
+            start, end = bisect_left(self.names, key), bisect_right(self.names, key)
+            matches.extend((position, FUZZY) for position in range(start, end))
+            if len(matches) >= wanted:
+                break
+        return matches[:wanted]
+
+    def search(self, query, limit=10, offset=0):
+        """
+        Returns (results, next_offset) for query; next_offset is None on the
+        last page. Results are dicts with player_id, player_name and match
+        ('prefix', 'word' or 'fuzzy').
+        """
+        query = normalize_name(query)
+        if not query:
+            return [], None
+        wanted = offset + limit + 1 # one extra to know whether another page exists
+        matches = []
+        seen = set()
+        for position, rank in self._prefix_matches(query):
+            if position not in seen:
+                seen.add(position)
+                matches.append((position, rank))
+                if len(matches) == wanted:
+                    break
+        if not matches and len(query) >= 3:
+            matches = self._fuzzy_matches(query, wanted)
+
+        page = matches[offset:offset + limit]
+        results = [{
+            'player_id': self.player_ids[position],
+            'player_name': self.player_names[position],
+            'match': ('prefix', 'word', 'fuzzy')[rank]
+        } for position, rank in page]
+        next_offset = offset + limit if len(matches) > offset + limit else None
+        return results, next_offset
+
+
+class PlayerSearchCache:
+    """
+    Holds the current PlayerSearchIndex and rebuilds it when the loader has
+    changed the data. The version check is a query, so it runs at most once
+    every refresh_seconds; searches in between use the index as is.
+
+    Builds take a couple of seconds for a full player table, so after the
+    first one they run on a background thread while searches keep using the
+    old index; warm() starts the first one when a worker boots.
+    """
+
+    def __init__(self, refresh_seconds):
+        self.refresh_seconds = refresh_seconds
+        self._index = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._building = None
+        self.builds = 0
+
+    def _build(self, version, load_rows):
+        index = PlayerSearchIndex(load_rows())
+        with self._lock:
+            self._index = index
+            self._version = version
+            self.builds += 1
+
+    def _build_in_background(self, current_version, load_rows):
+        try:
+            self._build(current_version(), load_rows)
+        except Exception as e:
+            print(f"Error building the player search index: {e}")
+        finally:
+            with self._lock:
+                self._building = None
+
+    def _start_build(self, current_version, load_rows):
+        """
+        Starts a background build unless one is already running; returns
+        the running build's thread. Call with the lock held.
+        """
+        if self._building is None:
+            self._building = threading.Thread(target=self._build_in_background,
+                                              args=(current_version, load_rows),
+                                              name='player-search-index', daemon=True)
+            self._building.start()
+        return self._building
+
+    def warm(self, current_version, load_rows):
+        """
+        Builds the first index on a background thread. Both callables run
+        on that thread, so they must open their own database connection.
+        """
+        with self._lock:
+            if self._index is None:
+                return self._start_build(current_version, load_rows)
+        return None
+
+    def get(self, current_version, load_rows):
+        """
+        Returns the index, first calling current_version() if the last check
+        is older than refresh_seconds. When the version differs, load_rows()
+        is called on a background thread (so it must open its own
+        connection) and the old index is returned until the new one is
+        ready. The first index has no old one to fall back on, so the
+        caller waits for it (joining the build warm() started, if any).
+        """
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.refresh_seconds:
+            return self._index
+        version = current_version()
+        if self._index is None:
+            with self._lock:
+                building = self._start_build(lambda: version, load_rows)
+            building.join()
+            if self._index is None:
+                # The build failed; repeat it here so the caller sees the error
+                self._build(version, load_rows)
+        else:
+            with self._lock:
+                if version != self._version:
+                    self._start_build(lambda: version, load_rows)
+        self._checked_at = time.monotonic()
+        return self._index
+
+    def stats(self):
+        return {'players': len(self._index) if self._index is not None else 0,
+                'version': self._version, 'builds': self.builds}
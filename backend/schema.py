@@ -0,0 +1,136 @@
+"""
+Table definitions shared by the API (app.py) and the loader
+(MySQL_loader.py), matching db_init/init.sql. Databases created by older
+versions are brought up to date by migrations.py.
+"""
+from sqlalchemy import BigInteger, Column, DECIMAL, DateTime, Float, Integer, MetaData, String, Table, Text
+from sqlalchemy.schema import ForeignKeyConstraint, Index, UniqueConstraint
+
+# A stat line is identified by these columns (unique key uq_player_stats_line)
+STAT_KEY_COLUMNS = ['player_id', 'season', 'team', 'lg']
+
+metadata = MetaData()
+
+players_table = Table(
+    'players', metadata,
+    Column('player_id', String(50), primary_key=True),
+    Column('player_name', String(255), nullable=False),
+    Column('primary_position', String(50), nullable=True),
+    Column('mlb_debut_year', Integer, nullable=True),
+    Column('mlbam_id', Integer, unique=True, nullable=True), # backfilled from the player register
+    Column('batting_hand', String(10), nullable=True)
+)
+
+# Other identifiers a canonical player_id has been resolved from: legacy
+# generated IDs and name|birth-year keys, which later loads reuse
+player_aliases_table = Table(
+    'player_aliases', metadata,
+    Column('alias_type', String(20), primary_key=True),
+    Column('alias', String(100), primary_key=True),
+    Column('player_id', String(50), nullable=False, index=True),
+    Column('source', String(20), nullable=False), # bbref, alias, register, fuzzy, name_birth, legacy
+    Column('score', Float, nullable=True), # fuzzy match ratio
+    Column('created_at', DateTime, nullable=False)
+)
+
+player_stats_table = Table(
+    'player_stats', metadata,
+    Column('stat_id', Integer, primary_key=True, autoincrement=True),
+    Column('player_id', String(50), nullable=False),
+    Column('season', Integer, nullable=False),
+    Column('team', String(10), nullable=False),
+    Column('games_played', Integer, nullable=True),
+    Column('at_bats', Integer, nullable=True),
+    Column('runs', Integer, nullable=True),
+    Column('hits', Integer, nullable=True),
+    Column('doubles', Integer, nullable=True),
+    Column('triples', Integer, nullable=True),
+    Column('home_runs', Integer, nullable=True),
+    Column('rbi', Integer, nullable=True),
+    Column('walks', Integer, nullable=True),
+    Column('strikeouts', Integer, nullable=True),
+    Column('obp', DECIMAL(5,3), nullable=True),
+    Column('slg', DECIMAL(5,3), nullable=True),
+    Column('ops', DECIMAL(5,3), nullable=True),
+    Column('war', DECIMAL(5,2), nullable=True),
+    Column('sb', Integer, nullable=True),
+    Column('cs', Integer, nullable=True),
+    Column('ops_plus', DECIMAL(5,1), nullable=True),
+    Column('roba', DECIMAL(5,3), nullable=True),
+    Column('rbat_plus', DECIMAL(5,1), nullable=True),
+    Column('tb', Integer, nullable=True),
+    Column('gidp', Integer, nullable=True),
+    Column('hbp', Integer, nullable=True),
+    Column('sh', Integer, nullable=True),
+    Column('sf', Integer, nullable=True),
+    Column('ibb', Integer, nullable=True),
+    Column('position_played', String(50), nullable=True),
+    Column('lg', String(10), nullable=True),
+    Column('row_hash', String(40), nullable=True), # SHA-1 of the hashed stat columns, loader bookkeeping
+    ForeignKeyConstraint(['player_id'], ['players.player_id']),
+    UniqueConstraint(*STAT_KEY_COLUMNS, name='uq_player_stats_line'),
+    Index('ix_player_stats_season', 'season', 'player_id') # season-wide API queries
+)
+
+# Loaded outside this repo; the API only reads it
+player_contracts_table = Table(
+    'player_contracts', metadata,
+    Column('contract_id', Integer, primary_key=True, autoincrement=True),
+    Column('player_id', String(50), nullable=False),
+    Column('contract_start_year', Integer, nullable=True),
+    Column('contract_end_year', Integer, nullable=True),
+    Column('total_value_usd', BigInteger, nullable=True),
+    Column('avg_annual_value_usd', BigInteger, nullable=True),
+    Column('current_year_salary_usd', BigInteger, nullable=True),
+    Column('year_in_contract', Integer, nullable=True),
+    Column('contract_notes', Text, nullable=True),
+    ForeignKeyConstraint(['player_id'], ['players.player_id']),
+    Index('ix_player_contracts_player_start', 'player_id', 'contract_start_year')
+)
+
+# Manifest of every CSV file that has been loaded
+ingested_files_table = Table(
+    'ingested_files', metadata,
+    Column('file_id', Integer, primary_key=True, autoincrement=True),
+    Column('file_name', String(255), nullable=False),
+    Column('file_sha256', String(64), nullable=False, index=True),
+    Column('seasons', String(1000), nullable=True), # comma separated seasons in the file
+    Column('row_count', Integer, nullable=False),
+    Column('rows_inserted', Integer, nullable=False),
+    Column('rows_updated', Integer, nullable=False),
+    Column('rows_deleted', Integer, nullable=False),
+    Column('rows_unchanged', Integer, nullable=False),
+    Column('loaded_at', DateTime, nullable=False)
+)
+
+# Per-season change counter, bumped by the loader; the API uses it to
+# invalidate cached seasons
+season_versions_table = Table(
+    'season_versions', metadata,
+    Column('season', Integer, primary_key=True),
+    Column('version', Integer, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+# Per-season summaries of every stat by league and primary position
+# ('*' = all), rebuilt by the loader for each season a load changes
+season_aggregates_table = Table(
+    'season_aggregates', metadata,
+    Column('season', Integer, primary_key=True, autoincrement=False),
+    Column('lg', String(10), primary_key=True),
+    Column('position', String(10), primary_key=True),
+    Column('stat', String(20), primary_key=True),
+    Column('n', Integer, nullable=False),
+    Column('total', Float, nullable=True),
+    Column('mean', Float, nullable=True),
+    Column('stddev', Float, nullable=True),
+    Column('min_value', Float, nullable=True),
+    Column('p10', Float, nullable=True),
+    Column('p25', Float, nullable=True),
+    Column('median', Float, nullable=True),
+    Column('p75', Float, nullable=True),
+    Column('p90', Float, nullable=True),
+    Column('max_value', Float, nullable=True),
+    Column('league_rate', Float, nullable=True),
+    Column('updated_at', DateTime, nullable=False)
+)
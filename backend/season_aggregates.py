@@ -0,0 +1,49 @@
+import re
+
+# Stats summarized per (season, lg, position) group. 'pa' is derived.
+COUNTING_STATS = [
+    'games_played', 'at_bats', 'runs', 'hits', 'doubles', 'triples', 'home_runs',
+    'rbi', 'walks', 'strikeouts', 'sb', 'cs', 'tb', 'gidp', 'hbp', 'sh', 'sf', 'ibb', 'pa'
+]
+RATE_STATS = ['obp', 'slg', 'ops', 'war', 'ops_plus', 'roba', 'rbat_plus']
+AGGREGATED_STATS = COUNTING_STATS + RATE_STATS
+
+PA_COMPONENTS = ['at_bats', 'walks', 'hbp', 'sf', 'sh']
+
+# Quantiles stored per group, as (column, q)
+QUANTILES = [('p10', 0.10), ('p25', 0.25), ('median', 0.50), ('p75', 0.75), ('p90', 0.90)]
+
+# Group value meaning "all leagues" / "all positions"
+ALL = '*'
+
+# Baseball-Reference position codes (the first one listed is the primary position)
+POSITION_CODES = {
+    '1': 'P', '2': 'C', '3': '1B', '4': '2B', '5': '3B', '6': 'SS',
+    '7': 'LF', '8': 'CF', '9': 'RF', 'D': 'DH', 'H': 'PH', 'O': 'OF'
+}
+
+# Baseball-Reference marks a traded player's combined line with e.g. "2TM"
+MULTI_TEAM_PATTERN = re.compile(r'^\d+TM$')
+
+# ...and the league of a line combining teams from both leagues with e.g. "2LG",
+# which has no aggregate group of its own
+MULTI_LEAGUE_PATTERN = re.compile(r'^\d+LG$')
+
+
+def primary_position(position_played):
+    """
+    Maps a Baseball-Reference position string (e.g. "*8/H9") to the player's
+    primary position ("CF"); unknown or empty values map to 'N/A'.
+    """
+    code = (position_played or '').lstrip('*')[:1]
+    return POSITION_CODES.get(code, 'N/A')
+
+
+def z_score(value, aggregate):
+    """
+    Standard score of value against an aggregate row, or None when the group
+    has no spread.
+    """
+    if value is None or not aggregate.get('stddev'):
+        return None
+    return (value - aggregate['mean']) / aggregate['stddev']
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class CachedPayload:
+    """
+    A serialized response body together with its content headers and the
+    validators sent for it.
+    """
+
+    def __init__(self, body, version, last_modified=None, mimetype='application/json', content_encoding=None):
+        self.body = body
+        self.version = version
+        self.last_modified = last_modified
+        self.mimetype = mimetype
+        self.content_encoding = content_encoding
+        self.etag = hashlib.sha1(body).hexdigest()
+
+
+class SeasonCache:
+    """
+    Thread-safe LRU cache of serialized season payloads, bounded by the total
+    size of the cached bodies. Each entry remembers the season version it was
+    built from (see the season_versions table), so an entry whose season has
+    since been reloaded is treated as a miss and dropped.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        """
+        Returns the CachedPayload for key if it was built from version, else None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version != version:
+                self._remove(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, version, body, last_modified=None, **content_headers):
+        """
+        Caches body for key and returns its CachedPayload (content_headers are
+        passed on to it). Bodies larger than the whole cache are returned
+        without being stored.
+        """
+        entry = CachedPayload(body, version, last_modified, **content_headers)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(body) > self.max_bytes:
+                return entry
+            self._entries[key] = entry
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
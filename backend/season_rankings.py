@@ -0,0 +1,133 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+
+class StatRankIndex:
+    """
+    One season's values of one stat, sorted ascending, with the matching
+    player ids and names. Ranks and percentiles are answered with binary
+    search, so each lookup is O(log n) once the index is built.
+    """
+
+    def __init__(self, rows):
+        """
+        rows: iterable of (player_id, player_name, value); None values are skipped.
+        """
+        ordered = sorted((row for row in rows if row[2] is not None), key=lambda row: row[2])
+        self.player_ids = [row[0] for row in ordered]
+        self.player_names = [row[1] for row in ordered]
+        self.values = [row[2] for row in ordered]
+        self.position_by_player = {player_id: position for position, player_id in enumerate(self.player_ids)}
+
+    def __len__(self):
+        return len(self.values)
+
+    def rank(self, value, descending=True):
+        """
+        1-based rank of value; tied values share the best rank.
+        """
+        if descending:
+            return len(self.values) - bisect_right(self.values, value) + 1
+        return bisect_left(self.values, value) + 1
+
+    def percentile(self, value, descending=True):
+        """
+        Percentage of players whose value is worse than or equal to value.
+        """
+        if descending:
+            at_or_below = bisect_right(self.values, value)
+        else:
+            at_or_below = len(self.values) - bisect_left(self.values, value)
+        return 100.0 * at_or_below / len(self.values)
+
+    def entry(self, position, descending=True):
+        value = self.values[position]
+        return {
+            'player_id': self.player_ids[position],
+            'player_name': self.player_names[position],
+            'value': value,
+            'rank': self.rank(value, descending)
+        }
+
+    def leaders(self, count, descending=True):
+        """
+        The top count entries, best first.
+        """
+        count = min(count, len(self.values))
+        if descending:
+            positions = range(len(self.values) - 1, len(self.values) - 1 - count, -1)
+        else:
+            positions = range(count)
+        return [self.entry(position, descending) for position in positions]
+
+    def player(self, player_id, descending=True):
+        """
+        Rank and percentile of one player, or None if they have no value.
+        """
+        position = self.position_by_player.get(player_id)
+        if position is None:
+            return None
+        result = self.entry(position, descending)
+        result['percentile'] = self.percentile(result['value'], descending)
+        return result
+
+    def distribution(self, samples, include_player_id=None):
+        """
+        Down-samples the sorted values to about samples evenly spaced entries
+        (always keeping the minimum, the maximum and include_player_id), in
+        ascending order.
+        """
+        n = len(self.values)
+        if samples >= n:
+            positions = list(range(n))
+        else:
+            step = (n - 1) / max(samples - 1, 1)
+            positions = sorted({round(i * step) for i in range(samples)})
+        position = self.position_by_player.get(include_player_id)
+        if position is not None and position not in positions:
+            positions = sorted(positions + [position])
+        return [{
+            'player_id': self.player_ids[position],
+            'player_name': self.player_names[position],
+            'value': self.values[position]
+        } for position in positions]
+
+
+class RankIndexCache:
+    """
+    Thread-safe LRU of StatRankIndex objects keyed by (season, stat). Like
+    SeasonCache, entries built from an older season version are rebuilt.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, version, build):
+        """
+        Returns the cached index for key at version, calling build() to
+        create it on a miss.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        index = build()
+        with self._lock:
+            self._entries[key] = (version, index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
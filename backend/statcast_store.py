@@ -0,0 +1,400 @@
+"""
+Local columnar store for Statcast pitch-level data.
+
+Pitches are kept as Parquet files partitioned by season and game date,
+
+    <root>/season=2023/game_date=2023-04-01/part-0.parquet
+
+so a query for one season only opens that season's files and an append only
+rewrites the dates it touches. A JSON manifest (<root>/_manifest.json)
+records which date ranges are fully covered, which CSV exports have been
+imported (by SHA-256) and a version per season, so no range is ever fetched
+twice and API caches can tell when a season changed.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Statcast CSV columns kept in the store and their dtypes. game_date and
+# season become partition keys instead of columns.
+STATCAST_COLUMNS = {
+    'game_pk': 'Int32',
+    'at_bat_number': 'Int16',
+    'pitch_number': 'Int16',
+    'inning': 'Int8',
+    'pitcher': 'Int32',
+    'batter': 'Int32',
+    'player_name': 'string',
+    'p_throws': 'string',
+    'stand': 'string',
+    'pitch_type': 'string',
+    'pitch_name': 'string',
+    'release_speed': 'float32',
+    'release_spin_rate': 'float32',
+    'release_extension': 'float32',
+    'pfx_x': 'float32',
+    'pfx_z': 'float32',
+    'plate_x': 'float32',
+    'plate_z': 'float32',
+    'zone': 'Int8',
+    'balls': 'Int8',
+    'strikes': 'Int8',
+    'description': 'string',
+    'events': 'string'
+}
+
+# A pitch is identified by its game, plate appearance and pitch number
+PITCH_KEY = ['game_pk', 'at_bat_number', 'pitch_number']
+
+PARTITIONING = ds.partitioning(pa.schema([('game_date', pa.string())]), flavor='hive')
+
+MANIFEST_NAME = '_manifest.json'
+
+# Days per pybaseball request when fetching; each chunk is recorded as
+# covered as soon as it is stored, so an interrupted fetch resumes
+FETCH_CHUNK_DAYS = 7
+
+# An empty chunk that ended at least this many days ago is taken to be off
+# days (e.g. the off-season) and covered; a more recent one may just not be
+# published yet, so it is fetched again next time
+EMPTY_CHUNK_SETTLE_DAYS = 7
+
+# Histogram bin widths for the distribution endpoint
+DISTRIBUTION_BIN_WIDTHS = {'release_speed': 1.0, 'release_spin_rate': 50.0}
+
+# Quantiles reported per pitch type, as (name, q)
+DISTRIBUTION_QUANTILES = [('p10', 0.10), ('p25', 0.25), ('median', 0.50), ('p75', 0.75), ('p90', 0.90)]
+
+
+def to_date(value):
+    """
+    Accepts a date, datetime or 'YYYY-MM-DD' string and returns a date.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def merge_ranges(ranges):
+    """
+    Sorts (start, end) date ranges and merges overlapping or adjacent ones.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(start, end, covered):
+    """
+    The parts of [start, end] (inclusive) not inside any merged covered range.
+    """
+    missing = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def split_range(start, end, days):
+    """
+    Splits [start, end] into consecutive ranges of at most days days.
+    """
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=days - 1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def clean_pitches(df):
+    """
+    Keeps the STATCAST_COLUMNS of a raw Statcast frame (CSV export or
+    pybaseball result), casts them and adds a normalized game_date string.
+    Rows without a pitch key or date are dropped.
+    """
+    df = df.reindex(columns=['game_date'] + list(STATCAST_COLUMNS))
+    df['game_date'] = pd.to_datetime(df['game_date'], errors='coerce').dt.strftime('%Y-%m-%d')
+    df = df.dropna(subset=['game_date'] + PITCH_KEY)
+    for column, dtype in STATCAST_COLUMNS.items():
+        if dtype.startswith(('Int', 'float')):
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+        df[column] = df[column].astype(dtype)
+    return df.reset_index(drop=True)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StatcastStore:
+    """
+    Reads and appends the partitioned Parquet store under root. Appends are
+    meant to come from one process at a time (the statcastdata.py CLI); the
+    API only reads, and picks up a rewritten manifest on the next call.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._manifest = None
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+
+    # Manifest
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def manifest(self):
+        """
+        The manifest as a dict, re-read whenever the file has changed.
+        """
+        with self._lock:
+            try:
+                mtime = os.stat(self.manifest_path).st_mtime_ns
+            except FileNotFoundError:
+                return {'ranges': [], 'files': {}, 'seasons': {}}
+            if mtime != self._manifest_mtime:
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def covered_ranges(self):
+        return [(to_date(start), to_date(end)) for start, end in self.manifest()['ranges']]
+
+    def season_version(self, season):
+        """
+        (version, updated_at) of a season's pitches; version is 0 for a
+        season that was never written.
+        """
+        entry = self.manifest()['seasons'].get(str(season))
+        if not entry:
+            return 0, None
+        return entry['version'], datetime.fromisoformat(entry['updated_at'])
+
+    # Writing
+
+    def _partition_dir(self, game_date):
+        return os.path.join(self.root, f'season={game_date[:4]}', f'game_date={game_date}')
+
+    def append(self, df, covered=None, source=None):
+        """
+        Stores cleaned pitches (see clean_pitches), merging each game date
+        with what the store already holds for it; a pitch already stored is
+        replaced by the new copy. covered=(start, end) marks that date range
+        as complete, and source=(sha256, file name) records an imported file.
+        Returns the number of pitches written.
+        """
+        for game_date, pitches in df.groupby('game_date', sort=True):
+            partition = self._partition_dir(game_date)
+            path = os.path.join(partition, 'part-0.parquet')
+            pitches = pitches.drop(columns='game_date')
+            if os.path.exists(path):
+                existing = pq.read_table(path).to_pandas()
+                pitches = pd.concat([existing, pitches], ignore_index=True)
+            # Sorted by pitcher, so row group statistics let scans skip other pitchers
+            pitches = pitches.drop_duplicates(PITCH_KEY, keep='last').sort_values(['pitcher'] + PITCH_KEY)
+            os.makedirs(partition, exist_ok=True)
+            table = pa.Table.from_pandas(pitches, preserve_index=False)
+            pq.write_table(table, path + '.tmp', compression='zstd')
+            os.replace(path + '.tmp', path)
+
+        manifest = json.loads(json.dumps(self.manifest()))
+        now = datetime.now().isoformat(timespec='seconds')
+        for season in sorted(set(df['game_date'].str[:4])):
+            entry = manifest['seasons'].setdefault(season, {'version': 0})
+            entry['version'] += 1
+            entry['updated_at'] = now
+        if covered:
+            self._add_covered_range(manifest, covered)
+        if source:
+            sha256, name = source
+            manifest['files'][sha256] = {'name': name, 'pitches': len(df), 'imported_at': now}
+        self._save_manifest(manifest)
+        return len(df)
+
+    def _add_covered_range(self, manifest, covered):
+        ranges = self.covered_ranges() + [(to_date(covered[0]), to_date(covered[1]))]
+        manifest['ranges'] = [[start.isoformat(), end.isoformat()] for start, end in merge_ranges(ranges)]
+
+    def mark_covered(self, start, end):
+        """
+        Records [start, end] as complete without storing any pitches.
+        """
+        manifest = json.loads(json.dumps(self.manifest()))
+        self._add_covered_range(manifest, (start, end))
+        self._save_manifest(manifest)
+
+    def import_csv(self, path, complete=False):
+        """
+        Imports a Statcast CSV export (e.g. a Baseball Savant search
+        download). Files already imported are skipped by content hash.
+        complete=True marks the file's date span as fully covered; leave it
+        off for filtered exports such as a single pitcher's pitches.
+        Returns the number of pitches written (0 when skipped).
+        """
+        sha256 = file_sha256(path)
+        if sha256 in self.manifest()['files']:
+            print(f"Skipping {path}: identical content was already imported.")
+            return 0
+        raw = pd.read_csv(path, usecols=lambda column: column == 'game_date' or column in STATCAST_COLUMNS,
+                          low_memory=False)
+        df = clean_pitches(raw)
+        covered = (df['game_date'].min(), df['game_date'].max()) if complete and len(df) else None
+        return self.append(df, covered, (sha256, os.path.basename(path)))
+
+    def fetch(self, start, end, fetcher=None):
+        """
+        Downloads the pitches of [start, end] that are not covered yet, in
+        FETCH_CHUNK_DAYS chunks, with fetcher(start_dt, end_dt) -> DataFrame
+        (default: pybaseball.statcast, an optional dependency).
+        Only dates before today are fetched, since today's games are not
+        final. A chunk that comes back empty is only marked as covered once
+        it ended EMPTY_CHUNK_SETTLE_DAYS ago: until then an off day and a
+        not yet published download look the same, so it is fetched again.
+        Returns {'pitches', 'chunks', 'empty_chunks'}: pitches written,
+        chunks requested and how many of them came back empty.
+        """
+        if fetcher is None:
+            try:
+                from pybaseball import statcast
+            except ImportError:
+                raise RuntimeError("pybaseball is not installed; import downloaded CSV exports instead.")
+            fetcher = lambda start_dt, end_dt: statcast(start_dt=start_dt, end_dt=end_dt)
+        summary = {'pitches': 0, 'chunks': 0, 'empty_chunks': 0}
+        end = min(to_date(end), date.today() - timedelta(days=1))
+        settled = date.today() - timedelta(days=EMPTY_CHUNK_SETTLE_DAYS)
+        for gap_start, gap_end in missing_ranges(to_date(start), end, self.covered_ranges()):
+            for chunk_start, chunk_end in split_range(gap_start, gap_end, FETCH_CHUNK_DAYS):
+                summary['chunks'] += 1
+                raw = fetcher(chunk_start.isoformat(), chunk_end.isoformat())
+                df = clean_pitches(raw if raw is not None else pd.DataFrame())
+                if df.empty:
+                    summary['empty_chunks'] += 1
+                    if chunk_end <= settled:
+                        self.mark_covered(chunk_start, chunk_end)
+                        print(f"No pitches for {chunk_start} to {chunk_end}; marked as covered (no games).")
+                    else:
+                        print(f"No pitches returned for {chunk_start} to {chunk_end} yet; leaving it uncovered.")
+                    continue
+                summary['pitches'] += self.append(df, (chunk_start, chunk_end))
+                print(f"Stored {len(df)} pitches for {chunk_start} to {chunk_end}.")
+        return summary
+
+    # Reading
+
+    def scan(self, season, columns, pitcher=None):
+        """
+        Reads columns for one season (optionally one pitcher) into a
+        DataFrame. Only that season's partitions are opened and the pitcher
+        filter is pushed down to the Parquet reader.
+        """
+        season_dir = os.path.join(self.root, f'season={season}')
+        if not os.path.isdir(season_dir):
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(season_dir, format='parquet', partitioning=PARTITIONING)
+        row_filter = ds.field('pitcher') == pitcher if pitcher is not None else None
+        return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+
+def pitch_mix(df):
+    """
+    Usage per pitch type: pitches, share of all pitches, share against
+    left- and right-handed batters, average velocity and spin. Most used first.
+    """
+    df = df.dropna(subset=['pitch_type'])
+    if df.empty:
+        return []
+    df = df.astype({'release_speed': 'float64', 'release_spin_rate': 'float64'})
+    grouped = df.groupby('pitch_type')
+    mix = pd.DataFrame({
+        'pitch_name': grouped['pitch_name'].first(),
+        'pitches': grouped.size(),
+        'avg_speed': grouped['release_speed'].mean(),
+        'avg_spin': grouped['release_spin_rate'].mean()
+    })
+    mix['usage'] = mix['pitches'] / len(df)
+    by_stand = df.groupby(['pitch_type', 'stand']).size().unstack(fill_value=0)
+    for stand, column in (('L', 'usage_vs_lhb'), ('R', 'usage_vs_rhb')):
+        counts = by_stand[stand] if stand in by_stand else pd.Series(0, index=by_stand.index)
+        mix[column] = counts / counts.sum() if counts.sum() else 0.0
+    mix = mix.sort_values('pitches', ascending=False).reset_index()
+    return json_records(mix.round({'avg_speed': 1, 'avg_spin': 0, 'usage': 4, 'usage_vs_lhb': 4, 'usage_vs_rhb': 4}))
+
+
+def pitch_distributions(df, stat):
+    """
+    Distribution of one stat (release_speed or release_spin_rate) per pitch
+    type: n, mean, stddev, min/max, DISTRIBUTION_QUANTILES and a histogram
+    with DISTRIBUTION_BIN_WIDTHS[stat]-wide bins as [[bin start, count], ...].
+    """
+    df = df.dropna(subset=['pitch_type', stat])
+    if df.empty:
+        return {}
+    values = df[stat].astype('float64')
+    grouped = values.groupby(df['pitch_type'])
+    summary = pd.DataFrame({
+        'n': grouped.size(),
+        'mean': grouped.mean(),
+        'stddev': grouped.std(),
+        'min': grouped.min(),
+        'max': grouped.max()
+    })
+    for name, q in DISTRIBUTION_QUANTILES:
+        summary[name] = grouped.quantile(q)
+
+    width = DISTRIBUTION_BIN_WIDTHS[stat]
+    bins = (values // width * width).rename('bin')
+    histogram = bins.groupby([df['pitch_type'], bins]).size()
+
+    distributions = {}
+    for pitch_type, row in zip(summary.index, json_records(summary.round(2))):
+        counts = histogram.loc[pitch_type]
+        row['histogram'] = [[float(start), int(count)] for start, count in counts.items()]
+        distributions[pitch_type] = row
+    return distributions
+
+
+def json_records(df):
+    """
+    DataFrame rows as dicts of plain Python values, with NaN as None.
+    """
+    df = df.astype(object).where(df.notna(), None)
+    return [{key: value.item() if hasattr(value, 'item') else value for key, value in row.items()}
+            for row in df.to_dict('records')]
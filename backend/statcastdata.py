@@ -1,4 +1,81 @@
-from pybaseball import  playerid_lookup
-from pybaseball import  statcast_pitcher
+"""
+Statcast pitch-level ingestion into the local Parquet store (see
+statcast_store.py).
 
-print(playerid_lookup('kershaw', 'clayton'))
+    python statcastdata.py import exports/*.csv [--complete]
+    python statcastdata.py fetch 2023-03-30 2023-10-01
+    python statcastdata.py coverage
+    python statcastdata.py lookup kershaw clayton
+
+'fetch' and 'lookup' need pybaseball; 'import' works offline on Baseball
+Savant CSV downloads. Date ranges already in the store are never fetched again,
+and neither are ranges without games once they are a week old.
+"""
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+
+from statcast_store import StatcastStore
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'statcast_data')
+
+
+def lookup_player(last, first):
+    """
+    Prints pybaseball's player ID lookup; key_mlbam is the Statcast pitcher/batter ID.
+    """
+    try:
+        from pybaseball import playerid_lookup
+    except ImportError:
+        raise RuntimeError("pybaseball is not installed.")
+    print(playerid_lookup(last, first))
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Ingest Statcast pitch data into the local Parquet store.")
+    parser.add_argument('--store', default=os.getenv('STATCAST_STORE_DIR', DEFAULT_STORE_DIR),
+                        help="Store directory (default: $STATCAST_STORE_DIR or backend/statcast_data)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="Import Statcast CSV exports")
+    import_parser.add_argument('csv_paths', nargs='+')
+    import_parser.add_argument('--complete', action='store_true',
+                               help="The exports are unfiltered, so their date span counts as fully covered")
+    fetch_parser = commands.add_parser('fetch', help="Download missing dates with pybaseball")
+    fetch_parser.add_argument('start', help="YYYY-MM-DD")
+    fetch_parser.add_argument('end', help="YYYY-MM-DD")
+    commands.add_parser('coverage', help="Show covered date ranges and season versions")
+    lookup_parser = commands.add_parser('lookup', help="Look up a player's IDs with pybaseball")
+    lookup_parser.add_argument('last')
+    lookup_parser.add_argument('first')
+    args = parser.parse_args()
+
+    store = StatcastStore(args.store)
+    start_time = time.perf_counter()
+    try:
+        if args.command == 'import':
+            total = 0
+            for path in args.csv_paths:
+                written = store.import_csv(path, args.complete)
+                print(f"{path}: {written} pitches stored.")
+                total += written
+            print(f"Imported {total} pitches in {time.perf_counter() - start_time:.2f}s.")
+        elif args.command == 'fetch':
+            summary = store.fetch(args.start, args.end)
+            if not summary['chunks']:
+                print(f"{args.start} to {args.end} is already covered.")
+            else:
+                print(f"Fetched {summary['pitches']} pitches in {summary['chunks']} chunk(s), "
+                      f"{summary['empty_chunks']} of them empty, in {time.perf_counter() - start_time:.2f}s.")
+        elif args.command == 'coverage':
+            for start, end in store.covered_ranges():
+                print(f"covered {start} to {end}")
+            for season, entry in sorted(store.manifest()['seasons'].items()):
+                print(f"season {season}: version {entry['version']}, updated {entry['updated_at']}")
+            print(f"{len(store.manifest()['files'])} CSV file(s) imported.")
+        else:
+            lookup_player(args.last, args.first)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
@@ -0,0 +1,179 @@
+"""
+Shared helpers and fixtures. The backend modules import each other by
+name (they run from backend/ in the container), so backend/ goes on the
+path first.
+
+Databases are SQLite files loaded by running MySQL_loader.py on small
+Baseball-Reference style CSVs, the same way a real database is loaded.
+
+    cd backend && pip install -r requirements-dev.txt && python -m pytest
+"""
+import csv
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+BATTING_HEADERS = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR',
+                   'RBI', 'SB', 'CS', 'BB', 'SO', 'BA', 'OBP', 'SLG', 'OPS', 'OPS+', 'rOBA', 'Rbat+', 'TB',
+                   'GIDP', 'HBP', 'SH', 'SF', 'IBB', 'Pos', 'Player-additional']
+
+# Values of every column batting_line() is not given
+BATTING_DEFAULTS = {
+    'WAR': 3.0, 'G': 150, 'PA': 600, 'AB': 530, 'R': 80, 'H': 150, '2B': 30, '3B': 2, 'HR': 20, 'RBI': 80,
+    'SB': 10, 'CS': 3, 'BB': 60, 'SO': 120, 'BA': '.283', 'OBP': '.360', 'SLG': '.480', 'OPS': '.840',
+    'OPS+': 125, 'rOBA': '.360', 'Rbat+': 125, 'TB': 254, 'GIDP': 10, 'HBP': 5, 'SH': 0, 'SF': 5, 'IBB': 4,
+    'Pos': '*8'
+}
+
+# (player, bbref ID, age, team, league, overrides) per season. Jazz
+# Chisholm Jr. is traded across leagues in 2024: a combined "2TM"/"2LG" line
+# plus one line per team.
+SEASONS = {
+    2023: [
+        ('Mike Trout', 'troutmi01', 31, 'LAA', 'AL', {'HR': 40, 'WAR': 6.1}),
+        ('Aaron Judge', 'judgeaa01', 31, 'NYY', 'AL', {'HR': 37, 'WAR': 5.5, 'Pos': '*9'}),
+        ('Juan Soto*', 'sotoju01', 24, 'SDP', 'NL', {'HR': 35, 'WAR': 5.0, 'Pos': '*7'}),
+        ('Freddie Freeman*', 'freemfr01', 33, 'LAD', 'NL', {'HR': 29, 'WAR': 6.0, 'Pos': '*3'})
+    ],
+    2024: [
+        ('Mike Trout', 'troutmi01', 32, 'LAA', 'AL', {'HR': 10, 'WAR': 1.0, 'PA': 126, 'AB': 110}),
+        ('Aaron Judge', 'judgeaa01', 32, 'NYY', 'AL', {'HR': 58, 'WAR': 10.8, 'Pos': '*9'}),
+        ('Juan Soto*', 'sotoju01', 25, 'NYY', 'AL', {'HR': 41, 'WAR': 7.9, 'Pos': '*9'}),
+        ('Freddie Freeman*', 'freemfr01', 34, 'LAD', 'NL', {'HR': 22, 'WAR': 4.3, 'Pos': '*3'}),
+        ('José Ramírez#', 'ramirjo01', 31, 'CLE', 'AL', {'HR': 39, 'WAR': 6.9, 'Pos': '*5'}),
+        ('Jazz Chisholm Jr.*', 'chishja01', 26, '2TM', '2LG', {'HR': 24, 'WAR': 3.9, 'Pos': '*85'}),
+        ('Jazz Chisholm Jr.*', 'chishja01', 26, 'MIA', 'NL', {'HR': 13, 'WAR': 1.8, 'Pos': '*8'}),
+        ('Jazz Chisholm Jr.*', 'chishja01', 26, 'NYY', 'AL', {'HR': 11, 'WAR': 2.1, 'Pos': '*5'})
+    ]
+}
+
+SUMMARY_PATTERN = re.compile(r'(\d+) inserted, (\d+) updated, (\d+) deleted, (\d+) unchanged')
+
+
+def batting_line(player, bbref_id, age, team, lg, overrides=None):
+    return dict(BATTING_DEFAULTS, Player=player, Age=age, Team=team, Lg=lg,
+                **{'Player-additional': bbref_id}, **(overrides or {}))
+
+
+def write_batting_csv(path, lines):
+    """
+    Writes batting_line() dicts as a Baseball-Reference export.
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, BATTING_HEADERS)
+        writer.writeheader()
+        for rank, line in enumerate(lines, 1):
+            writer.writerow(dict(line, Rk=rank))
+    return path
+
+
+def write_season_csv(directory, season, lines=None, name=None):
+    lines = lines if lines is not None else [batting_line(*line) for line in SEASONS[season]]
+    return write_batting_csv(os.path.join(directory, name or f'{season}MLB_STD_Batting.csv'), lines)
+
+
+def run_loader(db_url, *args):
+    """
+    Runs MySQL_loader.py against db_url and returns its output. The summary
+    counts are in .counts as {'inserted': n, ...}.
+    """
+    completed = subprocess.run([sys.executable, 'MySQL_loader.py', '--db-url', db_url, *args],
+                               cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    output = completed.stdout
+    assert 'error occurred' not in output, output
+    match = SUMMARY_PATTERN.search(output)
+    counts = dict(zip(['inserted', 'updated', 'deleted', 'unchanged'], map(int, match.groups()))) if match else None
+    return LoaderOutput(output, counts)
+
+
+class LoaderOutput(str):
+    def __new__(cls, output, counts):
+        result = super().__new__(cls, output)
+        result.counts = counts
+        return result
+
+
+def season_player_id(client, season, player_name):
+    """
+    The player_id of a player's line in a season, looked up through the API.
+    """
+    rows = client.get(f'/api/season_stats/{season}?fields=player_id,player_name').get_json()
+    return next(row['player_id'] for row in rows if row['player_name'] == player_name)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    A fresh SQLite database with the current schema, as the loader creates it.
+    """
+    from migrations import run_migrations
+    from schema import metadata
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    metadata.create_all(engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def connection(engine):
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.fixture(scope='session')
+def seeded_db_path(tmp_path_factory):
+    """
+    A database loaded from SEASONS. Tests that write to it use api_db_url,
+    which copies it.
+    """
+    directory = tmp_path_factory.mktemp('seeded')
+    csv_dir = directory / 'csv'
+    csv_dir.mkdir()
+    for season in SEASONS:
+        write_season_csv(csv_dir, season)
+    path = directory / 'seeded.db'
+    run_loader(f'sqlite:///{path}', str(csv_dir))
+    return path
+
+
+@pytest.fixture
+def api_db_url(seeded_db_path, tmp_path):
+    path = tmp_path / 'api.db'
+    shutil.copy(seeded_db_path, path)
+    return f'sqlite:///{path}'
+
+
+@pytest.fixture
+def client(api_db_url, monkeypatch, tmp_path):
+    """
+    A test client for app.py on a copy of the seeded database, with empty
+    caches and an empty Statcast store.
+    """
+    import app
+    from database import LazyEngine
+    from player_search import PlayerSearchCache
+    from season_cache import SeasonCache
+    from season_rankings import RankIndexCache
+    from statcast_store import StatcastStore
+
+    database = LazyEngine(api_db_url, on_create=app.instrument_engine)
+    monkeypatch.setattr(app, 'database', database)
+    monkeypatch.setattr(app, 'season_cache', SeasonCache(app.SEASON_CACHE_MAX_BYTES))
+    monkeypatch.setattr(app, 'rank_index_cache', RankIndexCache(app.RANK_INDEX_CACHE_ENTRIES))
+    monkeypatch.setattr(app, 'similarity_cache', RankIndexCache(app.SIMILARITY_CACHE_ENTRIES))
+    monkeypatch.setattr(app, 'player_search_cache', PlayerSearchCache(0))
+    monkeypatch.setattr(app, 'statcast_store', StatcastStore(str(tmp_path / 'statcast')))
+    yield app.app.test_client()
+    if database.engine is not None:
+        database.engine.dispose()
@@ -0,0 +1,63 @@
+import pytest
+
+from career_stats import career_totals
+
+
+def test_career_totals_count_a_traded_season_once():
+    line = {'at_bats': 100, 'hits': 30, 'walks': 10, 'hbp': 0, 'sf': 0, 'sh': 0, 'tb': 50, 'war': 1.0,
+            'ops_plus': 100}
+    totals = career_totals([dict(line, season=2023, team='NYY'),
+                            dict(line, season=2024, team='2TM', hits=40, tb=60, war=2.0, ops_plus=130),
+                            dict(line, season=2024, team='MIA'),
+                            dict(line, season=2024, team='NYY')])
+    assert (totals['seasons'], totals['at_bats'], totals['hits'], totals['war']) == (2, 200, 70, 3.0)
+    assert totals['obp'] == round(90 / 220, 3)
+    assert totals['slg'] == 0.55
+    assert totals['ops_plus'] == 115.0
+
+
+def test_batch_groups_seasons_by_player_and_lists_missing_ids(client):
+    response = client.post('/api/player_stats/batch', json={
+        'player_ids': ['judgeaa01', 'chishja01', 'nobody01', 'judgeaa01'], 'season_from': 2024
+    })
+    assert response.status_code == 200
+    result = response.get_json()
+    assert [line['home_runs'] for line in result['players']['judgeaa01']['seasons']] == [58]
+    assert sorted(line['team'] for line in result['players']['chishja01']['seasons']) == ['2TM', 'MIA', 'NYY']
+    assert result['missing'] == ['nobody01']
+
+
+def test_batch_with_an_empty_season_range_finds_nobody(client):
+    result = client.post('/api/player_stats/batch', json={
+        'player_ids': ['judgeaa01'], 'season_from': 2025, 'season_to': 2030
+    }).get_json()
+    assert result == {'players': {}, 'missing': ['judgeaa01']}
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'player_ids': []},
+    {'player_ids': ['judgeaa01', 7]},
+    {'player_ids': [f'player{i}' for i in range(101)]},
+    {'player_ids': ['judgeaa01'], 'season_from': '2024'},
+    {'player_ids': ['judgeaa01'], 'season_from': True},
+    {'player_ids': ['judgeaa01'], 'season_to': 2024.5}
+])
+def test_batch_rejects_invalid_bodies(client, payload):
+    assert client.post('/api/player_stats/batch', json=payload).status_code == 400
+
+
+def test_career_route_totals_every_season(client):
+    response = client.get('/api/players/judgeaa01/career')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert [line['season'] for line in result['seasons']] == [2023, 2024]
+    assert (result['career']['home_runs'], result['career']['seasons']) == (95, 2)
+
+    traded = client.get('/api/players/chishja01/career').get_json()
+    assert traded['career']['home_runs'] == 24
+
+
+def test_career_route_answers_404_without_stats(client):
+    assert client.get('/api/players/nobody01/career').status_code == 404
+    assert client.get('/api/players/judgeaa01/career?season_from=2025').status_code == 404
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import text
+
+import database
+from database import DatabaseUnavailable, LazyEngine
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    The delays LazyEngine sleeps between attempts, recorded instead of slept.
+    """
+    recorded = []
+    monkeypatch.setattr(database.time, 'sleep', recorded.append)
+    return recorded
+
+
+def unreachable_url(tmp_path):
+    # SQLite cannot create a file in a directory that does not exist
+    return f"sqlite:///{tmp_path / 'missing' / 'api.db'}"
+
+
+def test_delay_doubles_up_to_max_backoff():
+    engine = LazyEngine('sqlite://', backoff=0.25, max_backoff=1.0)
+    assert [engine.delay(step) for step in range(4)] == [0.25, 0.5, 1.0, 1.0]
+
+
+def test_connect_retries_then_fails_fast_until_the_backoff_has_passed(tmp_path, sleeps):
+    engine = LazyEngine(unreachable_url(tmp_path), attempts=3, backoff=0.25, max_backoff=5.0)
+
+    with pytest.raises(DatabaseUnavailable) as failure:
+        engine.connect()
+    assert engine.connect_errors == 3
+    assert sleeps == [0.25, 0.5]
+    assert failure.value.retry_after == 1.0
+
+    # Within the backoff no attempt is made
+    with pytest.raises(DatabaseUnavailable) as fast_failure:
+        engine.connect()
+    assert engine.connect_errors == 3
+    assert 0 < fast_failure.value.retry_after <= 1.0
+    engine.engine.dispose()
+
+
+def test_connect_recovers_once_the_database_is_reachable(tmp_path, sleeps):
+    engine = LazyEngine(unreachable_url(tmp_path), attempts=2, backoff=0.0)
+    with pytest.raises(DatabaseUnavailable):
+        engine.connect()
+
+    (tmp_path / 'missing').mkdir()
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT 1')).scalar() == 1
+    assert engine.connect_errors == 2
+    engine.engine.dispose()
+
+
+@pytest.fixture
+def unreachable_client(tmp_path, monkeypatch, sleeps):
+    import app
+    unreachable = LazyEngine(unreachable_url(tmp_path), attempts=2, backoff=5.0, max_backoff=5.0,
+                             on_create=app.instrument_engine)
+    monkeypatch.setattr(app, 'database', unreachable)
+    yield app.app.test_client(), unreachable
+    unreachable.engine.dispose()
+
+
+def test_unreachable_database_answers_503_with_retry_after(unreachable_client):
+    client, unreachable = unreachable_client
+
+    response = client.get('/api/players')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '5'
+    assert response.get_json() == {'error': 'Database unavailable, try again shortly.'}
+    assert unreachable.connect_errors == 2
+
+    # The next request fails fast instead of retrying
+    readiness = client.get('/readyz')
+    assert readiness.status_code == 503
+    assert 'Retry-After' in readiness.headers
+    assert unreachable.connect_errors == 2
+    assert client.get('/healthz').status_code == 200
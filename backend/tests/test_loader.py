@@ -0,0 +1,161 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from MySQL_loader import drop_seen_stat_lines
+from conftest import SEASONS, batting_line, run_loader, write_season_csv
+
+
+def query(db_url, sql, **params):
+    engine = create_engine(db_url)
+    with engine.connect() as connection:
+        rows = connection.execute(text(sql), params).fetchall()
+    engine.dispose()
+    return rows
+
+
+def stat_lines(db_url):
+    return query(db_url, "SELECT player_id, season, team, lg, home_runs, war, row_hash FROM player_stats "
+                         "ORDER BY player_id, season, team")
+
+
+def home_runs(db_url, player_name):
+    return query(db_url, "SELECT s.home_runs FROM player_stats s JOIN players p ON p.player_id = s.player_id "
+                         "WHERE p.player_name = :name", name=player_name)
+
+
+def season_version(db_url, season):
+    return query(db_url, "SELECT version FROM season_versions WHERE season = :season", season=season)[0][0]
+
+
+def manifest(db_url):
+    return query(db_url, "SELECT rows_inserted, rows_updated, rows_deleted, rows_unchanged FROM ingested_files "
+                         "ORDER BY file_id")
+
+
+def test_drop_seen_stat_lines_keeps_first_occurrence_across_chunks():
+    seen = set()
+    first = pd.DataFrame({'player_id': ['a', 'b'], 'season': [2024, 2024], 'team': ['NYY', 'BOS'],
+                          'lg': ['AL', 'AL'], 'home_runs': [1, 2]})
+    second = pd.DataFrame({'player_id': ['b', 'c'], 'season': [2024, 2024], 'team': ['BOS', 'BOS'],
+                           'lg': ['AL', 'AL'], 'home_runs': [9, 3]})
+    assert len(drop_seen_stat_lines(first, seen)) == 2
+    assert drop_seen_stat_lines(second, seen)['player_id'].tolist() == ['c']
+
+
+def test_sync_load_then_unchanged_file_is_skipped_by_manifest(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'loader.db'}"
+    path = write_season_csv(tmp_path, 2024)
+
+    first = run_loader(db_url, path)
+    assert first.counts == {'inserted': len(SEASONS[2024]), 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    assert season_version(db_url, 2024) == 1
+    lines = stat_lines(db_url)
+
+    second = run_loader(db_url, path)
+    assert 'already ingested' in second
+    assert len(manifest(db_url)) == 1
+    assert stat_lines(db_url) == lines
+    assert season_version(db_url, 2024) == 1
+
+
+def test_sync_reload_counts_updates_and_deletes(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'loader.db'}"
+    path = write_season_csv(tmp_path, 2024)
+    run_loader(db_url, path)
+
+    lines = [batting_line(*line) for line in SEASONS[2024] if line[0] != 'Freddie Freeman*']
+    lines[1]['HR'] = 62 # Aaron Judge
+    write_season_csv(tmp_path, 2024, lines)
+    reload = run_loader(db_url, path)
+
+    assert reload.counts == {'inserted': 0, 'updated': 1, 'deleted': 1, 'unchanged': len(lines) - 1}
+    assert manifest(db_url)[-1] == (0, 1, 1, len(lines) - 1)
+    assert home_runs(db_url, 'Aaron Judge') == [(62,)]
+    assert len(stat_lines(db_url)) == len(lines)
+    assert season_version(db_url, 2024) == 2
+
+
+def test_forced_reload_of_same_content_changes_nothing(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'loader.db'}"
+    path = write_season_csv(tmp_path, 2024)
+    run_loader(db_url, path)
+    lines = stat_lines(db_url)
+
+    reload = run_loader(db_url, '--force', path)
+    assert reload.counts == {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': len(SEASONS[2024])}
+    assert stat_lines(db_url) == lines
+    assert season_version(db_url, 2024) == 1
+
+
+def test_small_read_chunks_load_the_same_lines(tmp_path):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    for season in SEASONS:
+        write_season_csv(csv_dir, season)
+
+    default_url = f"sqlite:///{tmp_path / 'default.db'}"
+    chunked_url = f"sqlite:///{tmp_path / 'chunked.db'}"
+    default = run_loader(default_url, str(csv_dir))
+    chunked = run_loader(chunked_url, '--read-chunk-size', '2', str(csv_dir))
+
+    assert default.counts == chunked.counts
+    assert default.counts['inserted'] == sum(len(lines) for lines in SEASONS.values())
+    assert stat_lines(chunked_url) == stat_lines(default_url)
+
+
+def test_lines_of_skipped_files_are_not_deleted(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'loader.db'}"
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    # One season split across two exports
+    lines = [batting_line(*line) for line in SEASONS[2024]]
+    write_season_csv(csv_dir, 2024, lines[:3], name='2024MLB_STD_Batting_a.csv')
+    write_season_csv(csv_dir, 2024, lines[3:], name='2024MLB_STD_Batting_b.csv')
+    run_loader(db_url, str(csv_dir))
+
+    lines[3]['HR'] = 40 # Freddie Freeman
+    write_season_csv(csv_dir, 2024, lines[3:], name='2024MLB_STD_Batting_b.csv')
+    reload = run_loader(db_url, str(csv_dir))
+
+    assert 'already ingested' in reload
+    assert reload.counts == {'inserted': 0, 'updated': 1, 'deleted': 0, 'unchanged': len(lines) - 4}
+    assert len(stat_lines(db_url)) == len(lines)
+
+
+@pytest.mark.parametrize('mode', ['bulk', 'sync'])
+def test_parallel_load_matches_serial_with_lines_repeated_across_files(tmp_path, mode):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    for season in SEASONS:
+        write_season_csv(csv_dir, season)
+    # A second export of part of 2024 repeats stat lines of the first
+    write_season_csv(csv_dir, 2024, [batting_line(*line) for line in SEASONS[2024][:3]],
+                     name='2024MLB_STD_Batting_part.csv')
+
+    serial_url = f"sqlite:///{tmp_path / 'serial.db'}"
+    parallel_url = f"sqlite:///{tmp_path / 'parallel.db'}"
+    serial = run_loader(serial_url, '--mode', mode, str(csv_dir))
+    parallel = run_loader(parallel_url, '--mode', mode, '--workers', '2', str(csv_dir))
+
+    assert parallel.counts == serial.counts
+    assert serial.counts['inserted'] == sum(len(lines) for lines in SEASONS.values())
+    assert stat_lines(parallel_url) == stat_lines(serial_url)
+
+
+def test_bulk_reload_with_resolution_replaces_lines_under_legacy_ids(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'loader.db'}"
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    for season in SEASONS:
+        write_season_csv(csv_dir, season)
+    run_loader(db_url, '--mode', 'bulk', '--no-resolve', str(csv_dir))
+    legacy_ids = {player_id for player_id, *_ in stat_lines(db_url)}
+
+    run_loader(db_url, '--mode', 'bulk', '--force', str(csv_dir))
+
+    lines = stat_lines(db_url)
+    assert len(lines) == sum(len(season_lines) for season_lines in SEASONS.values())
+    assert {player_id for player_id, *_ in lines} == {line[1] for season_lines in SEASONS.values()
+                                                      for line in season_lines}
+    assert not legacy_ids & {player_id for player_id, in query(db_url, "SELECT player_id FROM players")}
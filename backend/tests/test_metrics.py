@@ -0,0 +1,72 @@
+import pytest
+
+from metrics import CONTENT_TYPE, MetricsRegistry, format_labels
+
+
+def sample_values(text):
+    """
+    {'name{labels}': value} for every sample line of a rendered registry.
+    """
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            values[series] = float(value)
+    return values
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 0.5, 1.0))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(value, route='/a')
+
+    values = sample_values(registry.render())
+    # A value equal to a bucket's bound counts in that bucket (le means <=)
+    assert values['latency_seconds_bucket{route="/a",le="0.1"}'] == 2
+    assert values['latency_seconds_bucket{route="/a",le="0.5"}'] == 3
+    assert values['latency_seconds_bucket{route="/a",le="1"}'] == 3
+    assert values['latency_seconds_bucket{route="/a",le="+Inf"}'] == 4
+    assert values['latency_seconds_sum{route="/a"}'] == pytest.approx(2.45)
+    assert values['latency_seconds_count{route="/a"}'] == 4
+
+
+def test_render_writes_help_type_and_counter_samples():
+    registry = MetricsRegistry()
+    counter = registry.counter('requests_total', 'Requests.', ('status',))
+    counter.inc(status='200')
+    counter.inc(2, status='200')
+    registry.callback('entries', 'Entries.', 'gauge', lambda: [({'cache': 'season'}, 7)])
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{status="200"} 3',
+        '# HELP entries Entries.',
+        '# TYPE entries gauge',
+        'entries{cache="season"} 7'
+    ]
+
+
+def test_label_values_are_escaped():
+    assert format_labels({}) == ''
+    assert format_labels({'path': 'C:\\dir', 'query': 'say "hi"\nnow'}) == \
+        '{path="C:\\\\dir",query="say \\"hi\\"\\nnow"}'
+
+    registry = MetricsRegistry()
+    registry.counter('hits_total', 'Hits.', ('route',)).inc(route='/api/"quoted"')
+    assert 'hits_total{route="/api/\\"quoted\\""} 1' in registry.render()
+
+
+def test_metrics_route_reports_request_series(client):
+    assert client.get('/api/players').status_code == 200
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == CONTENT_TYPE
+    values = sample_values(response.get_data(as_text=True))
+    for phase in ('db', 'serialize', 'total'):
+        assert values[f'mlb_api_request_duration_seconds_count{{route="/api/players",method="GET",phase="{phase}"}}'] >= 1
+    assert values['mlb_api_requests_total{route="/api/players",method="GET",status="200"}'] >= 1
+    assert values['mlb_api_response_bytes_count{route="/api/players"}'] >= 1
+    assert values['mlb_api_db_query_duration_seconds_count'] >= 1
@@ -0,0 +1,67 @@
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from conftest import season_player_id
+from schema import player_contracts_table
+
+
+def add_contract(db_url, player_id, **values):
+    engine = create_engine(db_url)
+    with engine.begin() as connection:
+        connection.execute(player_contracts_table.insert().values(player_id=player_id, **values))
+    engine.dispose()
+
+
+def test_player_detail_combines_stats_comparison_and_contract(client, api_db_url):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    add_contract(api_db_url, judge, contract_start_year=2017, contract_end_year=2022, total_value_usd=10_000_000)
+    add_contract(api_db_url, judge, contract_start_year=2023, contract_end_year=2031, total_value_usd=360_000_000)
+
+    response = client.get(f'/api/player_detail/{judge}/2024')
+    assert response.status_code == 200
+    detail = response.get_json()
+    assert (detail['player_id'], detail['season']) == (judge, 2024)
+    assert detail['stats']['home_runs'] == 58
+    assert detail['comparison'] == client.get(f'/api/player_stats/{judge}/2024/compare?scope=season').get_json()
+    # The latest contract only
+    assert detail['contract']['contract_start_year'] == 2023
+    assert detail['contract']['total_value_usd'] == 360_000_000
+
+
+def test_player_detail_runs_its_queries_on_the_detail_executor(client, monkeypatch):
+    import app
+    calls = []
+    run_with_connection = app.run_with_connection
+
+    def recording_run(query, *args):
+        calls.append((query.__name__, threading.current_thread().name))
+        return run_with_connection(query, *args)
+
+    monkeypatch.setattr(app, 'run_with_connection', recording_run)
+    trout = season_player_id(client, 2024, 'Mike Trout')
+    detail = client.get(f'/api/player_detail/{trout}/2024').get_json()
+
+    assert detail['contract'] is None
+    assert sorted(name for name, _ in calls) == ['latest_contract', 'player_season_stats', 'season_aggregate_rows']
+    assert all(thread.startswith('player-detail') for _, thread in calls)
+
+
+def test_player_detail_404s_without_a_season_line(client):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    assert client.get(f'/api/player_detail/{judge}/2025').status_code == 404
+    assert client.get('/api/player_detail/nobody01/2024').status_code == 404
+
+
+def test_player_detail_500s_when_one_query_fails(client, monkeypatch):
+    import app
+
+    def failing_contract(connection, player_id):
+        raise OperationalError('SELECT ... FROM player_contracts', {}, Exception('lost connection'))
+
+    monkeypatch.setattr(app, 'latest_contract', failing_contract)
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    response = client.get(f'/api/player_detail/{judge}/2024')
+    assert response.status_code == 500
+    assert response.get_json() == {'error': f'Could not retrieve player detail for {judge} in 2024.'}
@@ -0,0 +1,101 @@
+import pandas as pd
+from sqlalchemy import select
+
+from MySQL_loader import save_player_identities
+from player_identity import PlayerResolver, load_register
+from schema import (player_aliases_table, player_contracts_table, player_stats_table, players_table)
+
+
+def batting_rows(rows):
+    return pd.DataFrame(rows, columns=['player_name', 'bbref_id', 'season', 'age', 'player_id'])
+
+
+def test_sources_are_tried_in_order_of_precedence(tmp_path):
+    register_path = tmp_path / 'people.csv'
+    pd.DataFrame([
+        ['troutmi01', 545361, 'Mike', 'Trout', 1991, 2011, 2024],
+        ['ramirjo01', 608070, 'José', 'Ramírez', 1992, 2013, 2024],
+        ['freemfr01', 518692, 'Freddie', 'Freeman', 1989, 2010, 2024]
+    ], columns=['key_bbref', 'key_mlbam', 'name_first', 'name_last', 'birth_year', 'mlb_played_first',
+                'mlb_played_last']).to_csv(register_path, index=False)
+    resolver = PlayerResolver(load_register(register_path), known_aliases={'freddie freeman|1990': 'freeman_alias'})
+
+    df = resolver.resolve(batting_rows([
+        ['Mike Trout', 'troutmi02', 2024, 32, 'mike_trout_32_laa_2024'], # bbref ID beats the register
+        ['Freddie Freeman*', 'N/A', 2024, 34, 'freddie_freeman_34_lad_2024'], # known alias beats the register
+        ['Jose Ramirez#', 'N/A', 2024, 31, 'jose_ramirez_31_cle_2024'], # exact register name
+        ['Mike Trouut', 'N/A', 2023, 31, 'mike_trouut_31_laa_2023'], # fuzzy register name
+        ['Ann Lee', 'N/A', 2024, 30, 'ann_lee_30_sea_2024'], # name + birth year slug
+        ['Bo Nobody', 'N/A', 2024, 0, 'bo_nobody_sea_2024'] # no age (cleaned to 0): generated ID
+    ]))
+
+    assert df['player_id'].tolist() == ['troutmi02', 'freeman_alias', 'ramirjo01', 'troutmi01', 'ann_lee_1994',
+                                        'bo_nobody_sea_2024']
+    assert resolver.counts == {'bbref': 1, 'alias': 1, 'register': 1, 'fuzzy': 1, 'name_birth': 1, 'legacy': 1}
+    assert resolver.mlbam_ids == {'ramirjo01': 608070, 'troutmi01': 545361}
+    assert resolver.new_aliases[('name_birth', 'mike trouut|1992')][1:] == ('fuzzy', 0.952)
+
+
+def test_name_birth_slug_is_stable_across_seasons_and_teams():
+    resolver = PlayerResolver()
+    df = resolver.resolve(batting_rows([
+        ['Ann Lee', 'N/A', 2023, 29, 'ann_lee_29_sea_2023'],
+        ['Ann Lee', 'N/A', 2024, 30, 'ann_lee_30_nyy_2024']
+    ]))
+    assert df['player_id'].tolist() == ['ann_lee_1994', 'ann_lee_1994']
+    assert resolver.known_aliases['ann lee|1994'] == 'ann_lee_1994'
+
+
+def test_same_name_and_birth_year_in_one_season_keeps_generated_ids():
+    resolver = PlayerResolver()
+    df = resolver.resolve(batting_rows([
+        ['John Smith*', 'N/A', 2024, 25, 'john_smith_25_nyy_2024'],
+        ['John Smith', 'N/A', 2024, 25, 'john_smith_25_bos_2024']
+    ]))
+    assert df['player_id'].tolist() == ['john_smith_25_nyy_2024', 'john_smith_25_bos_2024']
+    assert not any(alias_type == 'name_birth' for alias_type, _ in resolver.new_aliases)
+
+
+def test_save_player_identities_moves_contracts_before_pruning_legacy_players(connection):
+    connection.execute(players_table.insert(), [
+        {'player_id': 'ann_lee_30_sea_2024', 'player_name': 'Ann Lee'},
+        {'player_id': 'ann_lee_1994', 'player_name': 'Ann Lee'}
+    ])
+    connection.execute(player_stats_table.insert().values(player_id='ann_lee_1994', season=2024, team='SEA', lg='AL'))
+    connection.execute(player_contracts_table.insert().values(
+        player_id='ann_lee_30_sea_2024', contract_start_year=2024, contract_end_year=2026
+    ))
+    connection.commit()
+    resolver = PlayerResolver()
+    resolver.resolve(batting_rows([['Ann Lee', 'N/A', 2024, 30, 'ann_lee_30_sea_2024']]))
+
+    pruned = save_player_identities(connection, players_table, player_stats_table, player_aliases_table,
+                                    player_contracts_table, resolver)
+
+    assert pruned == 1
+    assert connection.execute(select(player_contracts_table.c.player_id)).scalars().all() == ['ann_lee_1994']
+    assert connection.execute(select(players_table.c.player_id)).scalars().all() == ['ann_lee_1994']
+
+
+def test_save_player_identities_drops_legacy_stat_lines_of_reloaded_seasons(connection):
+    connection.execute(players_table.insert(), [
+        {'player_id': 'ann_lee_30_sea_2024', 'player_name': 'Ann Lee'},
+        {'player_id': 'ann_lee_1994', 'player_name': 'Ann Lee'}
+    ])
+    connection.execute(player_stats_table.insert(), [
+        {'player_id': 'ann_lee_30_sea_2024', 'season': 2023, 'team': 'SEA', 'lg': 'AL'},
+        {'player_id': 'ann_lee_30_sea_2024', 'season': 2024, 'team': 'SEA', 'lg': 'AL'},
+        {'player_id': 'ann_lee_1994', 'season': 2024, 'team': 'SEA', 'lg': 'AL'}
+    ])
+    connection.commit()
+    resolver = PlayerResolver()
+    resolver.resolve(batting_rows([['Ann Lee', 'N/A', 2024, 30, 'ann_lee_30_sea_2024']]))
+
+    pruned = save_player_identities(connection, players_table, player_stats_table, player_aliases_table,
+                                    player_contracts_table, resolver, reloaded_seasons={2024})
+
+    # 2023 was not reloaded, so its line (and the legacy player) stay
+    assert pruned == 0
+    lines = connection.execute(select(player_stats_table.c.player_id, player_stats_table.c.season)
+                               .order_by(player_stats_table.c.season)).all()
+    assert lines == [('ann_lee_30_sea_2024', 2023), ('ann_lee_1994', 2024)]
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+import player_search
+from player_search import PlayerSearchCache, PlayerSearchIndex, normalize_name
+
+PLAYERS = [('ramirjo01', 'José Ramírez#'), ('ramirha02', 'Harold Ramírez'), ('judgeaa01', 'Aaron Judge'),
+           ('troutmi01', 'Mike Trout'), ('chishja01', 'Jazz Chisholm Jr.*')]
+
+
+def ids(results):
+    return [result['player_id'] for result in results]
+
+
+def test_names_are_normalized_without_accents_markers_or_case():
+    assert normalize_name('José Ramírez#') == 'jose ramirez'
+    assert normalize_name('  Jazz Chisholm Jr.* ') == 'jazz chisholm jr'
+
+
+def test_full_name_prefixes_rank_before_later_word_prefixes():
+    index = PlayerSearchIndex(PLAYERS + [('ramosxx01', 'Ramon Laureano')])
+    results, next_offset = index.search('Ram')
+    assert ids(results) == ['ramosxx01', 'ramirha02', 'ramirjo01']
+    assert [result['match'] for result in results] == ['prefix', 'word', 'word']
+    assert next_offset is None
+
+
+def test_typos_fall_back_to_trigram_matches():
+    results, _ = PlayerSearchIndex(PLAYERS).search('aaron juge')
+    assert ids(results) == ['judgeaa01']
+    assert results[0]['match'] == 'fuzzy'
+
+
+def test_pages_follow_the_returned_offset():
+    index = PlayerSearchIndex(PLAYERS)
+    first, next_offset = index.search('ramirez', limit=1)
+    second, last_offset = index.search('ramirez', limit=1, offset=next_offset)
+    assert ids(first + second) == ['ramirha02', 'ramirjo01']
+    assert last_offset is None
+
+
+def wait_for_builds(cache, builds):
+    deadline = time.monotonic() + 5
+    while cache.stats()['builds'] < builds and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_fuzzy_candidates_are_capped_to_the_rarest_trigrams(monkeypatch):
+    monkeypatch.setattr(player_search, 'MAX_FUZZY_CANDIDATES', 5)
+    namesakes = [(f'aaron{i:02d}', f'Aaron Smith{chr(97 + i % 26)}') for i in range(50)]
+    results, _ = PlayerSearchIndex(PLAYERS + namesakes).search('aaron juge', limit=1)
+    assert ids(results) == ['judgeaa01']
+
+
+def test_cache_rebuilds_in_the_background_when_the_version_changes():
+    cache = PlayerSearchCache(0)
+    version = [1]
+    release = threading.Event()
+
+    def slow_rows():
+        release.wait(5)
+        return PLAYERS[:1]
+
+    first = cache.get(lambda: version[0], lambda: PLAYERS)
+    assert cache.get(lambda: version[0], slow_rows) is first
+    version[0] = 2
+    # The old index keeps serving until the new one is built
+    assert cache.get(lambda: version[0], slow_rows) is first
+    release.set()
+    wait_for_builds(cache, 2)
+    assert cache.stats() == {'players': 1, 'version': 2, 'builds': 2}
+    assert len(cache.get(lambda: version[0], slow_rows)) == 1
+
+
+def test_warm_builds_the_first_index_ahead_of_the_first_search():
+    cache = PlayerSearchCache(60)
+    cache.warm(lambda: 1, lambda: PLAYERS).join()
+    assert cache.warm(lambda: 1, lambda: PLAYERS) is None
+    assert len(cache.get(lambda: 1, lambda: [])) == len(PLAYERS)
+    assert cache.stats()['builds'] == 1
+
+
+def test_first_search_raises_when_the_index_cannot_be_built():
+    def failing_rows():
+        raise RuntimeError('database is down')
+
+    cache = PlayerSearchCache(0)
+    with pytest.raises(RuntimeError):
+        cache.get(lambda: 1, failing_rows)
+    assert len(cache.get(lambda: 1, lambda: PLAYERS)) == len(PLAYERS)
+
+
+def test_search_route(client):
+    response = client.get('/api/players/search?q=jose ram')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['query'] == 'jose ram'
+    assert [(match['player_name'], match['match']) for match in result['results']] == [('José Ramírez#', 'prefix')]
+    assert result['next_cursor'] is None
+    assert client.get('/api/players/search?q=a&limit=0').status_code == 400
+
+
+def test_players_after_cursor_defaults_to_a_page_in_player_id_order(client, monkeypatch):
+    import app
+    everyone = client.get('/api/players').get_json()
+    assert [player['player_id'] for player in everyone] == sorted(player['player_id'] for player in everyone)
+    monkeypatch.setattr(app, 'DEFAULT_PLAYERS_PAGE', 2)
+    page = client.get(f"/api/players?after={everyone[0]['player_id']}").get_json()
+    assert page['players'] == everyone[1:3]
+    assert page['next_cursor'] == everyone[2]['player_id']
+    assert client.get('/api/players?limit=0').status_code == 400
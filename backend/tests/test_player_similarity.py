@@ -0,0 +1,106 @@
+import pytest
+
+from conftest import season_player_id
+from player_similarity import SimilarityIndex
+
+
+def season_row(player_id, season, at_bats=500, walks=50, strikeouts=100, home_runs=20, obp=0.330, slg=0.450,
+               war=3.0, team='NYY'):
+    """
+    A similarity input row: player_id, player_name, season, team, then INPUT_COLUMNS.
+    """
+    return (player_id, player_id.title(), season, team, at_bats, walks, 5, 5, 0, strikeouts, home_runs, 10, 3,
+            obp, slg, war)
+
+
+ROWS = [
+    season_row('slugger', 2024, home_runs=45, slg=0.600, obp=0.380, war=7.0),
+    season_row('masher', 2024, home_runs=40, slg=0.580, obp=0.370, war=6.0),
+    season_row('average', 2024),
+    season_row('slap', 2024, home_runs=2, slg=0.320, obp=0.310, war=0.5, strikeouts=60),
+    # A slugger's twin with too few plate appearances to be returned
+    season_row('callup', 2024, at_bats=40, walks=4, home_runs=4, slg=0.600, obp=0.380, war=0.6),
+    season_row('slugger', 2023, home_runs=44, slg=0.590, obp=0.375, war=6.5)
+]
+
+
+def names(similar):
+    return [(entry['player_id'], entry['season']) for entry in similar]
+
+
+def test_neighbors_are_closest_first_and_exclude_the_player_itself():
+    player, similar = SimilarityIndex(ROWS).neighbors('slugger', 2024, 2)
+    assert (player['player_id'], player['season']) == ('slugger', 2024)
+    assert names(similar) == [('masher', 2024), ('average', 2024)]
+    assert similar[0]['distance'] <= similar[1]['distance']
+
+
+def test_k_is_capped_at_the_qualified_seasons_of_other_players():
+    _, similar = SimilarityIndex(ROWS).neighbors('slugger', 2024, 50)
+    # Neither the callup (too few PA) nor slugger's own 2023 season
+    assert sorted(names(similar)) == [('average', 2024), ('masher', 2024), ('slap', 2024)]
+
+
+def test_seasons_below_min_pa_can_be_queried_but_are_not_returned():
+    index = SimilarityIndex(ROWS, min_pa=100)
+    player, similar = index.neighbors('callup', 2024, 10)
+    assert player['pa'] == 54
+    assert ('callup', 2024) not in names(index.neighbors('masher', 2024, 10)[1])
+    assert similar[0]['player_id'] == 'slugger'
+    assert ('callup', 2024) in names(SimilarityIndex(ROWS, min_pa=50).neighbors('masher', 2024, 10)[1])
+
+
+def test_traded_players_are_compared_on_their_combined_line():
+    rows = ROWS + [season_row('traded', 2024, team='2TM', home_runs=30),
+                   season_row('traded', 2024, team='MIA', at_bats=250, home_runs=20),
+                   season_row('traded', 2024, team='NYY', at_bats=250, home_runs=10)]
+    player, _ = SimilarityIndex(rows).neighbors('traded', 2024, 1)
+    assert player['team'] == '2TM'
+
+
+def test_unknown_player_seasons_have_no_neighbors():
+    index = SimilarityIndex(ROWS)
+    assert index.neighbors('nobody', 2024, 5) is None
+    assert index.neighbors('masher', 2023, 5) is None
+
+
+def test_similar_route(client):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+
+    response = client.get(f'/api/players/{judge}/similar?season=2024&k=2')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['player']['player_name'] == 'Aaron Judge'
+    assert result['scope'] == 'season'
+    assert len(result['similar']) == 2
+    assert all(entry['player_id'] != judge and entry['season'] == 2024 for entry in result['similar'])
+
+    # Every other 2024 player qualifies; across seasons neither Judge season is returned
+    assert len(client.get(f'/api/players/{judge}/similar?season=2024&k=50').get_json()['similar']) == 5
+    everyone = client.get(f'/api/players/{judge}/similar?season=2024&k=50&scope=all').get_json()['similar']
+    assert {entry['season'] for entry in everyone} == {2023, 2024}
+    assert all(entry['player_id'] != judge for entry in everyone)
+
+
+def test_similar_route_leaves_out_seasons_below_min_pa(client, monkeypatch):
+    import app
+    monkeypatch.setattr(app, 'SIMILARITY_MIN_PA', 200)
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    result = client.get(f'/api/players/{judge}/similar?season=2024&k=50').get_json()
+    assert result['min_pa'] == 200
+    # Mike Trout's 2024 had 180 plate appearances
+    assert 'Mike Trout' not in [entry['player_name'] for entry in result['similar']]
+    assert len(result['similar']) == 4
+
+
+@pytest.mark.parametrize('query', ['k=0', 'k=51', 'scope=career', ''])
+def test_similar_route_rejects_invalid_parameters(client, query):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    season = '' if query == '' else 'season=2024&'
+    assert client.get(f'/api/players/{judge}/similar?{season}{query}').status_code == 400
+
+
+def test_similar_route_404s_without_a_season_line(client):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    assert client.get('/api/players/nobody01/similar?season=2024').status_code == 404
+    assert client.get(f'/api/players/{judge}/similar?season=2025').status_code == 404
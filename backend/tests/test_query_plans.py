@@ -0,0 +1,114 @@
+"""
+Query plan regression tests for the API.
+
+Runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) on the statements the routes in
+app.py execute, built by the same statement builder functions, and fails if
+any of them reads a table with a full scan. By default they run against the
+seeded SQLite database; set QUERY_PLAN_DATABASE_URL to check a loaded MySQL
+database instead (on a near-empty one MySQL may prefer a scan regardless).
+
+    QUERY_PLAN_DATABASE_URL=mysql+pymysql://user:pw@127.0.0.1:3307/baseball_analytics \
+        python -m pytest tests/test_query_plans.py
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, select
+
+import app
+
+# Tables a statement is meant to read in full, by statement name
+EXPECTED_SCANS = {
+    'players_list': {'players'}, # /api/players returns every player
+    'data_version': {'season_versions'}, # one row per season
+    'similarity_all_seasons': {'player_stats'} # builds the all-seasons similarity index
+}
+
+
+def route_statements(sample_player_id, sample_season):
+    """
+    (name, statement) for every query the API routes run.
+    """
+    return [
+        ('season_version', app.season_version_query(sample_season)),
+        ('players_list', app.players_list_query()),
+        ('players_page', app.players_list_query(sample_player_id, 100)),
+        ('data_version', app.data_version_query()),
+        ('player_contract', app.player_contract_query(sample_player_id)),
+        ('player_season_stats', app.player_season_stats_query(sample_player_id, sample_season)),
+        ('player_stats_batch', app.player_stats_query([sample_player_id, 'other_player'],
+                                                      sample_season - 5, sample_season)),
+        ('player_career', app.player_stats_query([sample_player_id])),
+        ('season_stats_all_fields', app.season_stats_query(sample_season, tuple(app.SEASON_STAT_FIELDS))),
+        ('season_stats_projected', app.season_stats_query(sample_season, ('player_id', 'war'))),
+        ('stat_values', app.stat_values_query(sample_season, 'war')),
+        ('similarity_season', app.similarity_stats_query(sample_season)),
+        ('similarity_all_seasons', app.similarity_stats_query()),
+        ('season_aggregates', app.season_aggregates_query(sample_season)),
+        ('season_aggregates_group', app.season_aggregates_query(sample_season, '*', '*', ('obp', 'war')))
+    ]
+
+STATEMENT_NAMES = [name for name, _ in route_statements('sample_player', 2023)]
+
+
+def explain(connection, statement):
+    """
+    Returns the plan rows for statement as a list of dicts.
+    """
+    dialect = connection.dialect
+    compiled = statement.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    result = connection.exec_driver_sql(prefix + str(compiled), params)
+    return [dict(row._mapping) for row in result]
+
+
+def full_scans(dialect_name, plan):
+    """
+    Names of the tables a plan reads with a full table scan.
+    MySQL reports access type ALL; SQLite reports "SCAN <table>" without
+    an index.
+    """
+    scanned = set()
+    for row in plan:
+        if dialect_name == 'sqlite':
+            detail = row['detail']
+            if detail.startswith('SCAN ') and 'INDEX' not in detail:
+                scanned.add(detail.split()[1])
+        elif row.get('type') == 'ALL':
+            scanned.add(row['table'])
+    return scanned
+
+
+@pytest.fixture(scope='module')
+def plan_connection(seeded_db_path):
+    engine = create_engine(os.getenv('QUERY_PLAN_DATABASE_URL') or f'sqlite:///{seeded_db_path}')
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def statements(plan_connection):
+    sample = plan_connection.execute(
+        select(app.player_stats_table.c.player_id, app.player_stats_table.c.season).limit(1)
+    ).fetchone()
+    player_id, season = sample if sample else ('sample_player', 2023)
+    return dict(route_statements(player_id, season))
+
+
+def test_full_scans_are_detected():
+    plan = [{'detail': 'SCAN player_stats'}, {'detail': 'SEARCH players USING INDEX sqlite_autoindex_players_1'},
+            {'detail': 'SCAN season_aggregates USING INDEX ix_season'}]
+    assert full_scans('sqlite', plan) == {'player_stats'}
+    assert full_scans('mysql', [{'table': 'players', 'type': 'ALL'}, {'table': 'player_stats', 'type': 'ref'}]) \
+        == {'players'}
+
+
+@pytest.mark.parametrize('name', STATEMENT_NAMES)
+def test_route_statement_uses_an_index(plan_connection, statements, name):
+    plan = explain(plan_connection, statements[name])
+    scans = full_scans(plan_connection.dialect.name, plan) - EXPECTED_SCANS.get(name, set())
+    assert not scans, f"{name} falls back to a full scan of {', '.join(sorted(scans))}: {plan}"
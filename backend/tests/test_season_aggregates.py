@@ -0,0 +1,46 @@
+import pandas as pd
+
+from MySQL_loader import compute_season_aggregates
+from season_aggregates import primary_position, z_score
+from conftest import season_player_id
+
+
+def test_primary_position_is_the_first_listed():
+    assert primary_position('*8/H9') == 'CF'
+    assert primary_position('D') == 'DH'
+    assert primary_position(None) == 'N/A'
+
+
+def test_z_score_needs_a_spread():
+    assert z_score(12, {'mean': 10, 'stddev': 2}) == 1.0
+    assert z_score(12, {'mean': 10, 'stddev': None}) is None
+
+
+def test_combined_lines_of_traded_players_are_not_counted_twice():
+    line = {'season': 2024, 'position_played': '*8', 'at_bats': 100, 'walks': 0, 'hbp': 0, 'sf': 0, 'sh': 0,
+            'home_runs': 0}
+    df = pd.DataFrame([dict(line, team='2TM', lg='2LG', home_runs=10),
+                       dict(line, team='MIA', lg='NL', home_runs=4),
+                       dict(line, team='NYY', lg='AL', home_runs=6)]).reindex(
+        columns=['season', 'team', 'lg', 'position_played', 'games_played', 'at_bats', 'runs', 'hits', 'doubles',
+                 'triples', 'home_runs', 'rbi', 'walks', 'strikeouts', 'sb', 'cs', 'tb', 'gidp', 'hbp', 'sh', 'sf',
+                 'ibb', 'obp', 'slg', 'ops', 'war', 'ops_plus', 'roba', 'rbat_plus'])
+    rows = {(row['lg'], row['position'], row['stat']): row for row in compute_season_aggregates(df)}
+    assert rows[('*', '*', 'home_runs')]['total'] == 10
+    assert rows[('*', '*', 'home_runs')]['n'] == 2
+    assert ('2LG', '*', 'home_runs') not in rows
+
+
+def test_compare_uses_the_players_league_and_position(client):
+    judge = season_player_id(client, 2024, 'Aaron Judge')
+    result = client.get(f'/api/player_stats/{judge}/2024/compare?scope=position').get_json()
+    assert (result['lg'], result['position']) == ('AL', 'RF')
+    assert result['stats']['home_runs']['value'] == 58
+
+
+def test_players_traded_across_leagues_are_compared_with_all_leagues(client):
+    for scope in ('league', 'position'):
+        response = client.get(f'/api/player_stats/chishja01/2024/compare?scope={scope}')
+        assert response.status_code == 200
+        assert response.get_json()['lg'] == '*'
+        assert response.get_json()['stats']['home_runs']['value'] == 24
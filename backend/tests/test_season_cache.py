@@ -0,0 +1,87 @@
+from sqlalchemy import create_engine, text
+
+from season_cache import SeasonCache
+
+
+def test_entries_from_an_older_version_are_dropped():
+    cache = SeasonCache(1000)
+    cache.put(2024, 1, b'body')
+    assert cache.get(2024, 1).body == b'body'
+    assert cache.get(2024, 2) is None
+    assert cache.get(2024, 1) is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_least_recently_used_entries_are_evicted_to_stay_under_max_bytes():
+    cache = SeasonCache(10)
+    cache.put('a', 1, b'1234')
+    cache.put('b', 1, b'1234')
+    cache.get('a', 1)
+    cache.put('c', 1, b'1234')
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) is not None
+    assert cache.stats()['bytes'] == 8
+    cache.put('huge', 1, b'x' * 11)
+    assert cache.get('huge', 1) is None
+
+
+def reload_season(db_url, season, player_name, **values):
+    """
+    What the loader does to a season: changes a player's stat lines and
+    bumps the season's version.
+    """
+    engine = create_engine(db_url)
+    with engine.begin() as connection:
+        assignments = ', '.join(f'{column} = :{column}' for column in values)
+        connection.execute(text(
+            f"UPDATE player_stats SET {assignments} WHERE season = :season "
+            "AND player_id IN (SELECT player_id FROM players WHERE player_name = :player_name)"
+        ), dict(values, season=season, player_name=player_name))
+        connection.execute(text("UPDATE season_versions SET version = version + 1 WHERE season = :season"),
+                           {'season': season})
+    engine.dispose()
+
+
+def war_of(rows, player_name):
+    return [float(row['war']) for row in rows if row['player_name'] == player_name]
+
+
+def test_season_stats_answer_304_until_the_season_is_reloaded(client, api_db_url):
+    first = client.get('/api/season_stats/2024')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    cached = client.get('/api/season_stats/2024', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    reload_season(api_db_url, 2024, 'Aaron Judge', home_runs=62)
+    reloaded = client.get('/api/season_stats/2024', headers={'If-None-Match': etag})
+    assert reloaded.status_code == 200
+    assert reloaded.headers['ETag'] != etag
+    assert any(row['home_runs'] == 62 for row in reloaded.get_json())
+    assert client.get('/api/cache_stats').get_json()['season_stats']['invalidations'] == 1
+
+
+def test_a_stale_entry_is_never_served_for_a_bumped_season(client, api_db_url):
+    assert war_of(client.get('/api/season_stats/2024').get_json(), 'Mike Trout') == [1.0]
+    reload_season(api_db_url, 2024, 'Mike Trout', war=2.5)
+    assert war_of(client.get('/api/season_stats/2024').get_json(), 'Mike Trout') == [2.5]
+
+
+def test_each_format_is_cached_under_its_own_etag(client):
+    rows = client.get('/api/season_stats/2024')
+    columns = client.get('/api/season_stats/2024?format=columns')
+    assert rows.headers['ETag'] != columns.headers['ETag']
+    assert client.get('/api/season_stats/2024?format=columns',
+                      headers={'If-None-Match': columns.headers['ETag']}).status_code == 304
+
+
+def test_season_aggregates_are_cached_with_validators(client):
+    first = client.get('/api/season_aggregates/2024?lg=*&position=*&stats=home_runs')
+    assert first.status_code == 200
+    assert first.get_json()[0]['total'] == 194
+    assert b', ' not in first.data and b'": ' not in first.data
+    assert client.get('/api/season_aggregates/2024?lg=*&position=*&stats=home_runs',
+                      headers={'If-None-Match': first.headers['ETag']}).status_code == 304
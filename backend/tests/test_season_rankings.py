@@ -0,0 +1,61 @@
+from season_rankings import RankIndexCache, StatRankIndex
+
+
+def test_ranks_share_the_best_rank_on_ties_and_skip_missing_values():
+    index = StatRankIndex([('a', 'A', 10), ('b', 'B', 30), ('c', 'C', 30), ('d', 'D', None), ('e', 'E', 20)])
+    assert len(index) == 4
+    assert [(entry['player_id'], entry['rank']) for entry in index.leaders(3)] == [('c', 1), ('b', 1), ('e', 3)]
+    assert index.player('e') == {'player_id': 'e', 'player_name': 'E', 'value': 20, 'rank': 3, 'percentile': 50.0}
+    assert index.player('e', descending=False)['rank'] == 2
+    assert index.player('d') is None
+
+
+def test_distribution_keeps_the_extremes_and_the_requested_player():
+    index = StatRankIndex([(str(i), str(i), i) for i in range(101)])
+    values = [entry['value'] for entry in index.distribution(5, include_player_id='33')]
+    assert values == [0, 25, 33, 50, 75, 100]
+
+
+def test_rank_index_cache_rebuilds_when_the_version_changes():
+    cache = RankIndexCache(2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return StatRankIndex([])
+
+    first = cache.get_or_build((2024, 'war'), 1, build)
+    assert cache.get_or_build((2024, 'war'), 1, build) is first
+    cache.get_or_build((2024, 'war'), 2, build)
+    assert len(builds) == 2
+    assert cache.stats()['hits'] == 1
+
+
+def test_rank_route_returns_leaders_and_the_players_rank(client):
+    response = client.get('/api/season_stats/2024/rank/home_runs?top=3&distribution=3')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert [leader['player_name'] for leader in result['leaders']] == ['Aaron Judge', 'Juan Soto*', 'José Ramírez#']
+    assert [entry['value'] for entry in result['distribution']][::2] == [10, 58]
+
+    soto = result['leaders'][1]['player_id']
+    player = client.get(f'/api/season_stats/2024/rank/home_runs?player_id={soto}').get_json()['player']
+    assert (player['value'], player['rank']) == (41, 2)
+
+
+def test_rank_route_uses_the_combined_line_of_traded_players(client):
+    response = client.get('/api/season_stats/2024/rank/home_runs?top=3&player_id=chishja01&distribution=3')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['count'] == 6
+    assert [leader['player_id'] for leader in result['leaders']] == ['judgeaa01', 'sotoju01', 'ramirjo01']
+    assert result['player']['value'] == 24
+    assert result['player']['rank'] == 4
+    assert any(entry['player_id'] == 'chishja01' for entry in result['distribution'])
+
+
+def test_rank_route_validates_its_parameters(client):
+    assert client.get('/api/season_stats/2024/rank/player_name').status_code == 400
+    assert client.get('/api/season_stats/2024/rank/war?order=up').status_code == 400
+    assert client.get('/api/season_stats/2024/rank/war?top=100000').status_code == 400
+    assert client.get('/api/season_stats/1901/rank/war').status_code == 404
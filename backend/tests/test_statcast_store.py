@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from statcast_store import EMPTY_CHUNK_SETTLE_DAYS, StatcastStore, clean_pitches
+
+
+def raw_pitches(game_date, pitcher=1, pitches=3):
+    return pd.DataFrame({
+        'game_date': [game_date] * pitches,
+        'game_pk': [100] * pitches,
+        'at_bat_number': [1] * pitches,
+        'pitch_number': list(range(1, pitches + 1)),
+        'pitcher': [pitcher] * pitches,
+        'pitch_type': ['FF'] * pitches,
+        'release_speed': [95.0] * pitches,
+        'stand': ['R'] * pitches
+    })
+
+
+def test_fetch_covers_chunks_and_skips_them_next_time(tmp_path):
+    store = StatcastStore(str(tmp_path))
+    requests = []
+
+    def fetcher(start_dt, end_dt):
+        requests.append((start_dt, end_dt))
+        return raw_pitches(start_dt)
+
+    assert store.fetch('2023-04-01', '2023-04-10', fetcher) == {'pitches': 6, 'chunks': 2, 'empty_chunks': 0}
+    assert requests == [('2023-04-01', '2023-04-07'), ('2023-04-08', '2023-04-10')]
+    assert store.covered_ranges() == [(date(2023, 4, 1), date(2023, 4, 10))]
+
+    assert store.fetch('2023-04-01', '2023-04-10', fetcher) == {'pitches': 0, 'chunks': 0, 'empty_chunks': 0}
+    assert len(requests) == 2
+
+
+def test_fetch_covers_empty_chunks_once_they_have_settled(tmp_path):
+    store = StatcastStore(str(tmp_path))
+    requests = []
+
+    def fetcher(start_dt, end_dt):
+        requests.append((start_dt, end_dt))
+        return pd.DataFrame()
+
+    # An off-season week is covered, so the next fetch skips it
+    assert store.fetch('2023-12-01', '2023-12-07', fetcher) == {'pitches': 0, 'chunks': 1, 'empty_chunks': 1}
+    assert store.covered_ranges() == [(date(2023, 12, 1), date(2023, 12, 7))]
+    assert store.fetch('2023-12-01', '2023-12-07', fetcher)['chunks'] == 0
+
+    # Recent days may not be published yet, so they stay uncovered
+    recent = date.today() - timedelta(days=EMPTY_CHUNK_SETTLE_DAYS - 1)
+    assert store.fetch(recent, recent, fetcher)['empty_chunks'] == 1
+    assert store.fetch(recent, recent, fetcher)['empty_chunks'] == 1
+    assert len(requests) == 3
+    assert store.covered_ranges() == [(date(2023, 12, 1), date(2023, 12, 7))]
+
+
+def test_fetch_stops_before_today(tmp_path):
+    store = StatcastStore(str(tmp_path))
+    requests = []
+
+    def fetcher(start_dt, end_dt):
+        requests.append((start_dt, end_dt))
+        return raw_pitches(start_dt)
+
+    yesterday = date.today() - timedelta(days=1)
+    store.fetch(yesterday - timedelta(days=2), date.today() + timedelta(days=3), fetcher)
+    assert requests[-1][1] == yesterday.isoformat()
+    assert store.covered_ranges()[-1][1] == yesterday
+
+
+def test_append_replaces_pitches_already_stored(tmp_path):
+    store = StatcastStore(str(tmp_path))
+    store.append(clean_pitches(raw_pitches('2023-04-01')))
+    replacement = raw_pitches('2023-04-01', pitches=1).assign(release_speed=99.0)
+    store.append(clean_pitches(replacement))
+
+    pitches = store.scan(2023, ['pitch_number', 'release_speed'])
+    assert sorted(pitches['pitch_number']) == [1, 2, 3]
+    assert pitches.set_index('pitch_number')['release_speed'][1] == 99.0
+    assert store.season_version(2023)[0] == 2
+
+
+def test_import_csv_skips_identical_files_and_only_covers_complete_exports(tmp_path):
+    store = StatcastStore(str(tmp_path / 'store'))
+    path = tmp_path / 'savant.csv'
+    raw_pitches('2023-04-02').to_csv(path, index=False)
+
+    assert store.import_csv(str(path)) == 3
+    assert store.covered_ranges() == []
+    assert store.import_csv(str(path), complete=True) == 0
+
+
+def test_scan_reads_one_season_and_filters_by_pitcher(tmp_path):
+    store = StatcastStore(str(tmp_path))
+    pitches = pd.concat([raw_pitches('2023-04-01', pitcher=1),
+                         raw_pitches('2023-04-01', pitcher=2).assign(game_pk=101),
+                         raw_pitches('2024-04-01', pitcher=1)])
+    store.append(clean_pitches(pitches))
+
+    assert len(store.scan(2023, ['pitcher'])) == 6
+    assert store.scan(2023, ['pitcher'], pitcher=2)['pitcher'].unique().tolist() == [2]
+    assert store.scan(2022, ['pitcher']).empty
+
+
+def test_pitch_mix_route(client):
+    import app
+
+    left = raw_pitches('2023-04-01', pitcher=7, pitches=2).assign(stand='L', pitch_type='SL', release_speed=85.0)
+    app.statcast_store.append(clean_pitches(pd.concat([raw_pitches('2023-04-01', pitcher=7),
+                                                       left.assign(at_bat_number=2)])))
+
+    response = client.get('/api/statcast/pitchers/7/2023/pitch_mix')
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['pitches'] == 5
+    assert [(pitch['pitch_type'], pitch['pitches'], pitch['usage_vs_lhb']) for pitch in result['pitch_mix']] == \
+        [('FF', 3, 0.0), ('SL', 2, 1.0)]
+    assert client.get('/api/statcast/pitchers/7/2023/pitch_mix',
+                      headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/api/statcast/pitchers/8/2023/pitch_mix').status_code == 404
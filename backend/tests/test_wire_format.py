@@ -0,0 +1,61 @@
+import gzip
+import io
+import json
+from decimal import Decimal
+
+import msgpack
+import pyarrow as pa
+
+from wire_format import MIN_COMPRESS_BYTES, compress, encode_columns, to_native
+
+
+def test_decimals_become_floats():
+    assert to_native(Decimal('0.305')) == 0.305
+    assert to_native(7) == 7
+
+
+def test_small_bodies_are_not_compressed():
+    assert compress(b'x' * (MIN_COMPRESS_BYTES - 1), 'gzip') == (b'x' * (MIN_COMPRESS_BYTES - 1), None)
+    body, encoding = compress(b'x' * MIN_COMPRESS_BYTES, 'gzip')
+    assert encoding == 'gzip' and gzip.decompress(body) == b'x' * MIN_COMPRESS_BYTES
+
+
+def test_columnar_formats_carry_the_same_columns():
+    columns = {'player_id': ['a', 'b'], 'war': [1.5, None]}
+    assert json.loads(encode_columns(columns, 2, 'columns')) == {'row_count': 2, 'columns': columns}
+    assert msgpack.unpackb(encode_columns(columns, 2, 'msgpack')) == {'row_count': 2, 'columns': columns}
+    table = pa.ipc.open_stream(io.BytesIO(encode_columns(columns, 2, 'arrow'))).read_all()
+    assert table.to_pydict() == columns
+
+
+def test_season_stats_formats(client):
+    rows = client.get('/api/season_stats/2024?fields=player_id,home_runs,obp')
+    assert rows.mimetype == 'application/json'
+    assert b', ' not in rows.data and b'": ' not in rows.data # compact, like jsonify
+    by_row = {(row['player_id'], row['home_runs']): row['obp'] for row in rows.get_json()}
+    assert [obp for (_, home_runs), obp in by_row.items() if home_runs == 58] == [0.36] # Aaron Judge
+
+    columns = client.get('/api/season_stats/2024?format=columns&fields=player_id,home_runs,obp').get_json()
+    assert columns['row_count'] == len(by_row)
+    assert dict(zip(zip(columns['columns']['player_id'], columns['columns']['home_runs']),
+                    columns['columns']['obp'])) == by_row
+
+    packed = client.get('/api/season_stats/2024?fields=player_id,home_runs', headers={'Accept': 'application/msgpack'})
+    assert packed.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(packed.data)['row_count'] == len(by_row)
+
+    arrow = client.get('/api/season_stats/2024?format=arrow&fields=player_id,home_runs')
+    assert arrow.mimetype == 'application/vnd.apache.arrow.stream'
+    assert pa.ipc.open_stream(io.BytesIO(arrow.data)).read_all().num_rows == len(by_row)
+
+
+def test_season_stats_are_compressed_when_accepted(client):
+    response = client.get('/api/season_stats/2024', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.data))) == 8
+
+
+def test_season_stats_reject_unknown_formats_and_fields(client):
+    assert client.get('/api/season_stats/2024?format=xml').status_code == 400
+    assert client.get('/api/season_stats/2024?fields=player_id,nope').status_code == 400
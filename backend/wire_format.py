@@ -0,0 +1,96 @@
+import gzip
+import io
+import json
+from decimal import Decimal
+
+# Response formats for season-wide stats and their content types.
+# 'rows' is the original array of objects; the others are column-oriented.
+WIRE_FORMATS = {
+    'rows': 'application/json',
+    'columns': 'application/json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream'
+}
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+class FormatUnavailable(Exception):
+    """
+    Raised when a binary format's optional dependency is not installed.
+    """
+
+
+def to_native(value):
+    """
+    Converts DECIMAL column values to floats; other values pass through.
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def encode_columns(columns, row_count, fmt, dumps=json.dumps):
+    """
+    Serializes {column name: list of values} in one of the columnar formats.
+    'columns' and 'msgpack' carry {"row_count": n, "columns": {...}}; 'arrow'
+    is an Arrow IPC stream with one field per column.
+    """
+    if fmt == 'columns':
+        return dumps({'row_count': row_count, 'columns': columns}).encode('utf-8')
+    if fmt == 'msgpack':
+        try:
+            import msgpack
+        except ImportError:
+            raise FormatUnavailable("msgpack is not installed on the server.")
+        return msgpack.packb({'row_count': row_count, 'columns': columns})
+    if fmt == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise FormatUnavailable("pyarrow is not installed on the server.")
+        table = pa.table(columns)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    raise ValueError(f"Unknown columnar format: {fmt}")
+
+
+def available_encodings():
+    """
+    Content-Encodings this server can produce, most preferred first.
+    """
+    encodings = []
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        pass
+    encodings.append('gzip')
+    return encodings
+
+
+def negotiate_encoding(accept_encodings):
+    """
+    Picks the Content-Encoding for a response from the request's
+    Accept-Encoding (a werkzeug MIMEAccept-like object), or None.
+    """
+    for encoding in available_encodings():
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    """
+    Compresses body with encoding ('br', 'gzip' or None). Returns the body and
+    the encoding actually applied (None if the body was left as-is).
+    """
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(body, quality=5), 'br'
+    return gzip.compress(body, compresslevel=6), 'gzip'
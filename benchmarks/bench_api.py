@@ -0,0 +1,178 @@
+"""
+API benchmark: load tests each app.py route on its own at a fixed
+concurrency, so a regression shows up against the route that caused it.
+
+Starts gunicorn against --db-url (e.g. a database loaded by
+bench_loader.py) unless --url points at a running server. Sample player,
+season and search values are read from the database so every route returns
+data. The Statcast routes are included when --statcast-store holds pitches
+(a pitcher is sampled from its latest season). Each route gets a short
+warm-up run first, so the figures are for warm caches.
+
+    python benchmarks/bench_api.py --db-url sqlite:////tmp/bench.db --concurrency 8 --duration 5
+    python benchmarks/bench_api.py --db-url sqlite:////tmp/bench.db --statcast-store backend/statcast_data
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import BACKEND_DIR, build_request, run_load, start_gunicorn  # noqa: E402
+
+WARMUP_SECONDS = 1.0
+
+# Players per /api/player_stats/batch request
+BATCH_PLAYERS = 20
+
+
+def sample_values(db_url, statcast_store=None):
+    """
+    The players with the most seasons (the first one, with its latest
+    season and a three-letter prefix of its name, is used by the single
+    player routes), a player with a contract if any are loaded, and a
+    pitcher and season from the Statcast store if it has pitches.
+    """
+    engine = create_engine(db_url)
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT s.player_id, MAX(s.season) AS season, COUNT(DISTINCT s.season) AS seasons, MIN(p.player_name) AS name "
+            "FROM player_stats s JOIN players p ON p.player_id = s.player_id "
+            "GROUP BY s.player_id ORDER BY seasons DESC, s.player_id LIMIT :limit"
+        ), {'limit': BATCH_PLAYERS}).fetchall()
+        contract_player_id = connection.execute(text(
+            "SELECT MIN(player_id) FROM player_contracts"
+        )).scalar()
+    engine.dispose()
+    if not rows:
+        sys.exit(f"No player_stats rows in {db_url}; load data first.")
+    row = rows[0]
+    sample = {'player_id': row.player_id, 'season': row.season, 'prefix': row.name[:3].lower(),
+              'batch_ids': [r.player_id for r in rows], 'contract_player_id': contract_player_id}
+    if statcast_store:
+        sample.update(statcast_sample(statcast_store))
+    return sample
+
+
+def statcast_sample(root):
+    """
+    The pitcher with the most pitches in the store's latest season, as
+    {'pitcher_id', 'pitcher_season'}, or {} if the store is empty.
+    """
+    sys.path.insert(0, BACKEND_DIR)
+    from statcast_store import StatcastStore
+
+    store = StatcastStore(root)
+    seasons = sorted(store.manifest()['seasons'])
+    if not seasons:
+        return {}
+    pitchers = store.scan(int(seasons[-1]), ['pitcher'])['pitcher'].dropna()
+    if pitchers.empty:
+        return {}
+    return {'pitcher_id': int(pitchers.mode()[0]), 'pitcher_season': int(seasons[-1])}
+
+
+def route_paths(sample):
+    """
+    (name, target) for every route that reads loader-maintained tables or
+    the Statcast store; a target is a GET path or a (path, JSON body) POST.
+    """
+    player_id, season = sample['player_id'], sample['season']
+    routes = [
+        ('players', '/api/players'),
+        ('players_page', '/api/players?limit=100'),
+        ('players_search', f"/api/players/search?q={sample['prefix']}"),
+        ('player_stats', f'/api/player_stats/{player_id}/{season}'),
+        ('player_stats_batch', ('/api/player_stats/batch',
+                                {'player_ids': sample['batch_ids'], 'season_from': season - 5, 'season_to': season})),
+        ('player_career', f'/api/players/{player_id}/career'),
+        ('player_compare', f'/api/player_stats/{player_id}/{season}/compare?scope=league'),
+        ('player_detail', f'/api/player_detail/{player_id}/{season}'),
+        ('player_similar', f'/api/players/{player_id}/similar?season={season}'),
+        ('player_similar_all', f'/api/players/{player_id}/similar?season={season}&scope=all'),
+        ('season_stats', f'/api/season_stats/{season}'),
+        ('season_stats_columns', f'/api/season_stats/{season}?format=columns&fields=player_id,war'),
+        ('season_rank', f'/api/season_stats/{season}/rank/war?player_id={player_id}'),
+        ('season_aggregates', f'/api/season_aggregates/{season}')
+    ]
+    if sample['contract_player_id']:
+        routes.append(('player_contracts', f"/api/player_contracts/{sample['contract_player_id']}"))
+    if 'pitcher_id' in sample:
+        pitcher = f"/api/statcast/pitchers/{sample['pitcher_id']}/{sample['pitcher_season']}"
+        routes += [
+            ('statcast_pitch_mix', f'{pitcher}/pitch_mix'),
+            ('statcast_distributions', f'{pitcher}/distributions')
+        ]
+    return routes
+
+
+def check_route(base_url, target):
+    """
+    Fails early if a route does not answer 200, since the load test only
+    counts errors.
+    """
+    try:
+        with urllib.request.urlopen(build_request(base_url, target), timeout=30) as response:
+            response.read()
+    except (urllib.error.URLError, OSError) as e:
+        sys.exit(f"{target} failed before the benchmark started: {e}")
+
+
+def benchmark_routes(base_url, routes, concurrency, duration):
+    results = {}
+    for name, target in routes:
+        check_route(base_url, target)
+        run_load(base_url, [target], concurrency, min(duration, WARMUP_SECONDS))
+        result = run_load(base_url, [target], concurrency, duration)
+        if isinstance(target, str):
+            result['path'] = target
+        else:
+            result['path'], result['method'] = target[0], 'POST'
+        results[name] = result
+        print(f"{name:22} {result['requests_per_s']:9.1f} req/s  p50 {result['latency_ms']['p50']:7.2f}ms  "
+              f"p99 {result['latency_ms']['p99']:7.2f}ms  errors {result['errors']}", file=sys.stderr)
+    return results
+
+
+def run(db_url, concurrency=8, duration=5.0, workers=1, port=5056, url=None, statcast_store=None):
+    """
+    The API section of a benchmark result.
+    """
+    routes = route_paths(sample_values(db_url, statcast_store))
+    if url:
+        return {'url': url, 'concurrency': concurrency, 'routes': benchmark_routes(url.rstrip('/'), routes,
+                                                                                 concurrency, duration)}
+    env = {'DATABASE_URL': db_url}
+    if statcast_store:
+        env['STATCAST_STORE_DIR'] = os.path.abspath(statcast_store)
+    server, base_url = start_gunicorn(workers, port, env)
+    try:
+        results = benchmark_routes(base_url, routes, concurrency, duration)
+    finally:
+        server.terminate()
+        server.wait()
+    return {'workers': workers, 'concurrency': concurrency, 'routes': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db-url', required=True, help='Loaded database to serve (and to pick sample values from).')
+    parser.add_argument('--url', help='Benchmark a running server instead of starting gunicorn.')
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers.')
+    parser.add_argument('--port', type=int, default=5056)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per route.')
+    parser.add_argument('--statcast-store', help='Statcast store to serve and benchmark (skipped if not given).')
+    args = parser.parse_args()
+    result = run(args.db_url, args.concurrency, args.duration, args.workers, args.port, args.url,
+                 args.statcast_store)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Loader benchmark: times MySQL_loader.py end to end and stage by stage.
+
+End to end runs the loader as a subprocess, as it runs in production: a
+first load into an empty database, then a forced reload of the same files
+(in sync mode that reload writes nothing, so it measures the diff cost).
+
+The stage timings call the loader's functions in-process on every file and
+add up each stage:
+  read           pd.read_csv with the loader's column filter
+  clean          clean_batting_dataframe (includes id_generation)
+  id_generation  generate_player_ids alone, on the cleaned frame
+  dedupe_hash    dedupe_stat_lines + add_row_hashes
+  identity       PlayerResolver over the cleaned rows
+  db_write       bulk_load or IncrementalStatSync into a fresh database
+  aggregates     refresh_season_aggregates for every season
+
+    python benchmarks/bench_loader.py /tmp/batting
+    python benchmarks/bench_loader.py /tmp/batting --db-url mysql+pymysql://root:pw@127.0.0.1:3307/bench --reset-db
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+import MySQL_loader as loader  # noqa: E402
+from migrations import migrations_metadata  # noqa: E402
+from player_identity import PlayerResolver  # noqa: E402
+
+STAGES = ['read', 'clean', 'id_generation', 'dedupe_hash', 'identity', 'db_write', 'aggregates']
+
+
+def fresh_database(db_url, reset_db):
+    """
+    Returns a URL for an empty database: a new SQLite file in a temporary
+    directory when db_url is None, else db_url after dropping the loader's
+    tables (only with reset_db, since that deletes data).
+    """
+    if db_url is None:
+        return 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='loader_bench_'), 'bench.db')
+    if not reset_db:
+        sys.exit("Benchmarks write to the database; pass --reset-db to let them drop the loader's tables at "
+                 f"{db_url}.")
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine, tables = loader.setup_database_schema(None, db_url)
+    next(iter(tables.values())).metadata.drop_all(engine)
+    migrations_metadata.drop_all(engine)
+    engine.dispose()
+    return db_url
+
+
+def run_loader(db_url, csv_dir, mode, workers=1, force=False):
+    """
+    Runs MySQL_loader.py as a subprocess and returns its wall time and the
+    row count it reports.
+    """
+    command = [sys.executable, 'MySQL_loader.py', '--db-url', db_url, '--mode', mode,
+               '--workers', str(workers), os.path.abspath(csv_dir)]
+    if force:
+        command.append('--force')
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    match = re.search(r'Processed (\d+) stat rows', completed.stdout)
+    if completed.returncode or not match:
+        sys.exit(f"Loader run failed:\n{completed.stdout[-2000:]}\n{completed.stderr[-2000:]}")
+    rows = int(match.group(1))
+    return {'seconds': round(elapsed, 3), 'rows': rows, 'rows_per_s': round(rows / elapsed, 1)}
+
+
+def end_to_end(csv_dir, db_url, reset_db, modes, workers):
+    """
+    For each mode: a first load into an empty database and a forced reload.
+    Returns ({mode: {'first_load': ..., 'reload': ...}}, url of the last database).
+    """
+    results = {}
+    url = None
+    for mode in modes:
+        url = fresh_database(db_url, reset_db)
+        results[mode] = {
+            'first_load': run_loader(url, csv_dir, mode, workers),
+            'reload': run_loader(url, csv_dir, mode, workers, force=True)
+        }
+    return results, url
+
+
+def timed(timings, stage, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    timings[stage] += time.perf_counter() - started
+    return result
+
+
+def stage_timings(csv_dir, db_url, reset_db, mode):
+    """
+    Runs each loader stage over every file in csv_dir, writing into a fresh
+    database with mode ('bulk' or 'sync'). Returns per-stage seconds and rows/s.
+    """
+    paths = loader.expand_csv_paths([csv_dir])
+    url = fresh_database(db_url, reset_db)
+    timings = dict.fromkeys(STAGES, 0.0)
+    rows = 0
+    resolver = PlayerResolver()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine, tables = loader.setup_database_schema(None, url)
+        with engine.connect() as connection:
+            sync = loader.IncrementalStatSync(connection, tables['players'], tables['player_stats'],
+                                              loader.DEFAULT_CHUNK_SIZE) if mode == 'sync' else None
+            seasons = set()
+            for path in paths:
+                raw = timed(timings, 'read', lambda csv_path: pd.read_csv(csv_path, usecols=loader.csv_usecols), path)
+                df = timed(timings, 'clean', loader.clean_batting_dataframe, raw, loader.infer_season_from_path(path))
+                timed(timings, 'id_generation', loader.generate_player_ids, df)
+                df = timed(timings, 'dedupe_hash', lambda frame: loader.add_row_hashes(loader.dedupe_stat_lines(frame)), df)
+                df = timed(timings, 'identity', loader.resolve_player_ids, df, resolver)
+                if sync:
+                    timed(timings, 'db_write', sync.apply, df)
+                else:
+                    timed(timings, 'db_write', loader.bulk_load, connection, tables['players'],
+                          tables['player_stats'], df, loader.DEFAULT_CHUNK_SIZE)
+                rows += len(df)
+                seasons.update(df['season'].unique().tolist())
+            if sync:
+                timed(timings, 'db_write', sync.finish)
+            timed(timings, 'aggregates', loader.refresh_season_aggregates, connection, tables['player_stats'],
+                  tables['season_aggregates'], seasons)
+        engine.dispose()
+    return {
+        'mode': mode,
+        'rows': rows,
+        'stages': {stage: {'seconds': round(seconds, 4), 'rows_per_s': round(rows / seconds, 1) if seconds else None}
+                   for stage, seconds in timings.items()}
+    }
+
+
+def run(csv_dir, db_url=None, reset_db=False, modes=('sync', 'bulk'), workers=1, stage_mode='bulk'):
+    """
+    The loader section of a benchmark result, plus the URL of a database
+    the end to end run left loaded (for the API benchmark).
+    """
+    e2e, loaded_url = end_to_end(csv_dir, db_url, reset_db, modes, workers)
+    result = {'workers': workers, 'end_to_end': e2e, 'stages': stage_timings(csv_dir, db_url, reset_db, stage_mode)}
+    if db_url is not None:
+        # The stage run reused (and reset) the same database, so reload it for the API benchmark
+        loaded_url = fresh_database(db_url, reset_db)
+        run_loader(loaded_url, csv_dir, modes[-1], workers)
+    return result, loaded_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_dir', help='Directory of season CSVs (see generate_batting.py).')
+    parser.add_argument('--db-url', help='Database to benchmark against (default: a temporary SQLite file).')
+    parser.add_argument('--reset-db', action='store_true', help="Allow dropping the loader's tables at --db-url.")
+    parser.add_argument('--modes', default='sync,bulk', help='Loader modes to time end to end.')
+    parser.add_argument('--workers', type=int, default=1, help='Loader --workers for the end to end runs.')
+    parser.add_argument('--stage-mode', choices=['bulk', 'sync'], default='bulk', help='Write path for db_write.')
+    args = parser.parse_args()
+    result, _ = run(args.csv_dir, args.db_url, args.reset_db, tuple(args.modes.split(',')), args.workers, args.stage_mode)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Micro-benchmark for the loader's cleaning stage.
+
+Compares the original per-row path (column-by-column coercion followed by
+df.apply(generate_player_id, axis=1)) with the vectorized
+clean_batting_dataframe(), checks that both produce identical player_ids and
+reports wall time and peak traced memory for each.
+
+    python benchmarks/bench_player_id.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from MySQL_loader import COLUMN_RENAMES, clean_batting_dataframe, generate_player_id  # noqa: E402
+
+FIRST_NAMES = ['Mike', 'José', 'Shohei', 'Aaron', 'Juan', 'J.D.', "Ke'Bryan", 'Luis', 'Bobby', 'Ronald']
+LAST_NAMES = ['Trout', 'Ramírez', 'Ohtani', 'Judge', 'Soto', 'Martinez', 'Hayes', 'García', 'Witt Jr.', 'Acuña Jr.']
+TEAMS = ['LAA', 'NYY', 'SDP', 'LAD', '2TM', '3TM', None]
+
+
+def synthetic_batting_frame(rows, seed=0):
+    """
+    Builds a raw (pre-rename) Baseball-Reference style batting frame.
+    """
+    rng = random.Random(seed)
+    raw = {header: [rng.randint(0, 600) for _ in range(rows)] for header in COLUMN_RENAMES}
+    raw['Player'] = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.choice(['', '*', '#'])}"
+                     for _ in range(rows)]
+    raw['Team'] = [rng.choice(TEAMS) for _ in range(rows)]
+    raw['Lg'] = [rng.choice(['AL', 'NL', '2LG']) for _ in range(rows)]
+    raw['Pos'] = [rng.choice(['*8/H', '6', 'D', None]) for _ in range(rows)]
+    for header in ['OBP', 'SLG', 'OPS', 'rOBA']:
+        raw[header] = [round(rng.uniform(0.1, 0.6), 3) for _ in range(rows)]
+    raw['WAR'] = [round(rng.uniform(-2, 10), 1) for _ in range(rows)]
+    raw['Age'] = [rng.choice([rng.randint(19, 42), None]) for _ in range(rows)]
+    raw['OPS+'] = [rng.choice([rng.randint(0, 200), '']) for _ in range(rows)]
+    return pd.DataFrame(raw)
+
+
+def apply_path(df):
+    """
+    The loader's original cleaning stage, kept here as the reference.
+    """
+    df = df.rename(columns=COLUMN_RENAMES)
+    if 'season' not in df.columns:
+        df['season'] = 2023
+    numerical_cols_to_fill = [
+        'games_played', 'at_bats', 'runs', 'hits', 'doubles', 'triples',
+        'home_runs', 'rbi', 'walks', 'strikeouts', 'sb', 'cs', 'tb',
+        'gidp', 'hbp', 'sh', 'sf', 'ibb', 'age', 'season'
+    ]
+    decimal_cols_to_fill = ['obp', 'slg', 'ops', 'war', 'ops_plus', 'roba', 'rbat_plus']
+    for col in numerical_cols_to_fill:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    for col in decimal_cols_to_fill:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(float)
+    for col in ['player_name', 'team', 'lg', 'position_played']:
+        if col in df.columns:
+            df[col] = df[col].fillna('N/A').astype(str)
+    df['player_id'] = df.apply(
+        lambda row: generate_player_id(row['player_name'], row.get('age'), row.get('team'), row.get('season')),
+        axis=1
+    )
+    df.dropna(subset=['player_id', 'player_name'], inplace=True)
+    return df
+
+
+def measure(func, df):
+    """
+    Returns func(df), its wall time and its peak traced memory. Timing and
+    memory come from separate runs because tracemalloc slows allocation down.
+    """
+    started = time.perf_counter()
+    result = func(df)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    raw = synthetic_batting_frame(args.rows, args.seed)
+    reference, apply_time, apply_peak = measure(apply_path, raw)
+    vectorized, vector_time, vector_peak = measure(clean_batting_dataframe, raw)
+
+    if not reference['player_id'].equals(vectorized['player_id']):
+        mismatches = (reference['player_id'] != vectorized['player_id']).sum()
+        sys.exit(f"player_id mismatch in {mismatches} of {len(reference)} rows")
+
+    print(f"rows:        {args.rows}")
+    print(f"apply path:  {apply_time:8.3f}s  peak {apply_peak / 2**20:8.1f} MiB")
+    print(f"vectorized:  {vector_time:8.3f}s  peak {vector_peak / 2**20:8.1f} MiB")
+    print(f"speedup:     {apply_time / vector_time:8.1f}x  (identical player_ids)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Compares two run_benchmarks.py result files and flags regressions.
+
+Every timing (lower is better) and throughput (higher is better) in the
+loader and API sections is compared; a change worse than --threshold
+percent is a regression and makes the script exit with status 1.
+
+    python benchmarks/compare_results.py benchmarks/results/before.json benchmarks/results/after.json
+"""
+import argparse
+import json
+import sys
+
+# Leaf keys compared, and whether a larger value is better
+METRICS = {'seconds': False, 'rows_per_s': True, 'requests_per_s': True, 'p50': False, 'p95': False, 'p99': False}
+
+
+def flatten(section, prefix=''):
+    """
+    {'loader.stages.stages.read.seconds': 0.07, ...} for the compared leaves.
+    """
+    values = {}
+    for key, value in section.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            values.update(flatten(value, path))
+        elif key in METRICS and isinstance(value, (int, float)):
+            values[path] = value
+    return values
+
+
+def compare(before, after, threshold):
+    """
+    Returns [(metric, before, after, change %, regressed)] for metrics in both files.
+    """
+    old = flatten({key: before[key] for key in ('loader', 'api') if key in before})
+    new = flatten({key: after[key] for key in ('loader', 'api') if key in after})
+    rows = []
+    for path in sorted(old.keys() & new.keys()):
+        if not old[path]:
+            continue
+        change = (new[path] - old[path]) / old[path] * 100
+        higher_is_better = METRICS[path.rsplit('.', 1)[1]]
+        worse = -change if higher_is_better else change
+        rows.append((path, old[path], new[path], change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Percent change counted as a regression.')
+    parser.add_argument('--all', action='store_true', help='Print every metric, not only regressions.')
+    args = parser.parse_args()
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    for label, result in (('before', before), ('after', after)):
+        meta = result.get('meta', {})
+        print(f"{label:7} {meta.get('commit')}{' (dirty)' if meta.get('dirty') else ''}  "
+              f"{meta.get('database')}  {result.get('data', {}).get('stat_rows')} rows  {meta.get('created_at')}")
+    if before.get('data') != after.get('data'):
+        print("Warning: the runs used different data sets; figures are not directly comparable.")
+
+    rows = compare(before, after, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    for path, old, new, change, regressed in rows:
+        if args.all or regressed:
+            print(f"{'REGRESSION ' if regressed else '           '}{path:70} {old:>12} -> {new:<12} {change:+7.1f}%")
+    print(f"{len(regressions)} regression(s) over {args.threshold:g}% in {len(rows)} metrics.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Synthetic Baseball-Reference batting CSVs for benchmarks.
+
+Writes one <season>MLB_STD_Batting.csv per season with the export's headers,
+including Player-additional IDs. Players have multi-season careers, so the
+same player appears across files, and a share of them are traded each
+season (a combined "2TM" line plus one line per team), like the real data.
+Output is deterministic for a given seed.
+
+    python benchmarks/generate_batting.py --seasons 150 --players 1200 --out /tmp/batting
+"""
+import argparse
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+HEADERS = ['Rk', 'Player', 'Age', 'Team', 'Lg', 'WAR', 'G', 'PA', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI',
+           'SB', 'CS', 'BB', 'SO', 'BA', 'OBP', 'SLG', 'OPS', 'OPS+', 'rOBA', 'Rbat+', 'TB', 'GIDP', 'HBP',
+           'SH', 'SF', 'IBB', 'Pos', 'Player-additional']
+
+FIRST_NAMES = ['Mike', 'José', 'Shohei', 'Aaron', 'Juan', 'J.D.', "Ke'Bryan", 'Luis', 'Bobby', 'Ronald',
+               'Freddie', 'Mookie', 'Vladimir', 'Yordan', 'Corey', 'Kyle', 'Julio', 'Adley', 'Gunnar', 'Elly']
+LAST_NAMES = ['Trout', 'Ramírez', 'Ohtani', 'Judge', 'Soto', 'Martinez', 'Hayes', 'García', 'Witt Jr.',
+              'Acuña Jr.', 'Freeman', 'Betts', 'Guerrero Jr.', 'Álvarez', 'Seager', 'Tucker', 'Rodríguez',
+              'Rutschman', 'Henderson', 'De La Cruz']
+TEAMS = {'AL': ['BAL', 'BOS', 'NYY', 'TBR', 'TOR', 'CHW', 'CLE', 'DET', 'KCR', 'MIN', 'HOU', 'LAA', 'OAK',
+                'SEA', 'TEX'],
+         'NL': ['ATL', 'MIA', 'NYM', 'PHI', 'WSN', 'CHC', 'CIN', 'MIL', 'PIT', 'STL', 'ARI', 'COL', 'LAD',
+                'SDP', 'SFG']}
+POSITIONS = ['*2', '*3/H', '*4', '*5/H', '*6', '*7/D', '*8/H9', '*9', 'D', 'H']
+
+# Share of active players replaced each season, and traded within a season
+TURNOVER = 0.12
+TRADED_SHARE = 0.08
+
+
+class PlayerPool:
+    """
+    The league's active players; each season some retire and rookies debut.
+    """
+
+    def __init__(self, size, first_season, rng):
+        self.rng = rng
+        self.next_id = 0
+        self.players = [self.new_player(first_season, self.rng.randint(21, 36)) for _ in range(size)]
+
+    def new_player(self, season, age=None):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        slug = ''.join(ch for ch in last.lower() if ch.isascii() and ch.isalpha())[:5]
+        self.next_id += 1
+        lg = self.rng.choice(['AL', 'NL'])
+        return {
+            'name': f"{first} {last}{self.rng.choice(['', '', '*', '#'])}",
+            'bbref_id': f"{slug}{first.lower()[:2]}{self.next_id:05d}",
+            'birth_year': season - (age or self.rng.randint(21, 25)),
+            'lg': lg,
+            'team': self.rng.choice(TEAMS[lg]),
+            'pos': self.rng.choice(POSITIONS)
+        }
+
+    def advance(self, season):
+        for i, player in enumerate(self.players):
+            if self.rng.random() < TURNOVER or season - player['birth_year'] > 40:
+                self.players[i] = self.new_player(season)
+
+
+def stat_block(rng, count):
+    """
+    Plausible counting stats and rates for count lines, as columns.
+    """
+    pa = rng.integers(1, 720, count)
+    bb = (pa * rng.uniform(0.04, 0.15, count)).astype(int)
+    hbp = rng.integers(0, 12, count)
+    sf = rng.integers(0, 8, count)
+    sh = rng.integers(0, 4, count)
+    ab = np.maximum(pa - bb - hbp - sf - sh, 1)
+    h = (ab * rng.uniform(0.18, 0.33, count)).astype(int)
+    doubles = (h * rng.uniform(0.1, 0.25, count)).astype(int)
+    triples = (h * rng.uniform(0, 0.03, count)).astype(int)
+    hr = (h * rng.uniform(0, 0.2, count)).astype(int)
+    tb = h + doubles + 2 * triples + 3 * hr
+    obp = (h + bb + hbp) / np.maximum(ab + bb + hbp + sf, 1)
+    slg = tb / ab
+    return {
+        'G': np.maximum(pa // 4, 1), 'PA': pa, 'AB': ab, 'R': (h * rng.uniform(0.3, 0.7, count)).astype(int),
+        'H': h, '2B': doubles, '3B': triples, 'HR': hr, 'RBI': (h * rng.uniform(0.3, 0.8, count)).astype(int),
+        'SB': rng.integers(0, 40, count), 'CS': rng.integers(0, 10, count), 'BB': bb,
+        'SO': (pa * rng.uniform(0.1, 0.35, count)).astype(int), 'BA': h / ab, 'OBP': obp, 'SLG': slg,
+        'OPS': obp + slg, 'OPS+': (100 * (obp / 0.32 + slg / 0.41 - 1)).round(),
+        'rOBA': obp * 0.9 + slg * 0.1, 'Rbat+': (100 * (obp / 0.32 + slg / 0.41 - 1)).round(),
+        'TB': tb, 'GIDP': rng.integers(0, 25, count), 'HBP': hbp, 'SH': sh, 'SF': sf, 'IBB': rng.integers(0, 15, count),
+        'WAR': rng.uniform(-2, 9, count).round(1)
+    }
+
+
+def format_rates(values):
+    """
+    Rates the way Baseball-Reference prints them: ".250", "1.032".
+    """
+    text = np.char.mod('%.3f', values)
+    return np.where(values < 1, np.char.lstrip(text, '0'), text)
+
+
+def season_frame(pool, season, rng, np_rng):
+    """
+    The CSV rows of one season: one line per player, or a combined line plus
+    one line per team for traded players.
+    """
+    lines = []
+    for player in pool.players:
+        if rng.random() < TRADED_SHARE:
+            other_lg = rng.choice(['AL', 'NL'])
+            other_team = rng.choice([team for team in TEAMS[other_lg] if team != player['team']])
+            lg = '2LG' if other_lg != player['lg'] else player['lg']
+            lines.append((player, '2TM', lg))
+            lines.append((player, player['team'], player['lg']))
+            lines.append((player, other_team, other_lg))
+            player['team'], player['lg'] = other_team, other_lg
+        else:
+            lines.append((player, player['team'], player['lg']))
+    columns = {
+        'Rk': np.arange(1, len(lines) + 1),
+        'Player': [player['name'] for player, _, _ in lines],
+        'Age': [season - player['birth_year'] for player, _, _ in lines],
+        'Team': [team for _, team, _ in lines],
+        'Lg': [lg for _, _, lg in lines],
+        'Pos': [player['pos'] for player, _, _ in lines],
+        'Player-additional': [player['bbref_id'] for player, _, _ in lines]
+    }
+    for header, values in stat_block(np_rng, len(lines)).items():
+        if header in ('BA', 'OBP', 'SLG', 'OPS', 'rOBA'):
+            values = format_rates(values)
+        elif header in ('OPS+', 'Rbat+'):
+            values = values.astype(int)
+        columns[header] = values
+    return pd.DataFrame(columns)[HEADERS]
+
+
+def generate(out_dir, seasons, players, first_season=None, seed=0):
+    """
+    Writes seasons season files of about players players each (plus traded
+    players' extra lines) to out_dir. Returns the list of paths.
+    """
+    first_season = first_season if first_season is not None else 2024 - seasons + 1
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    pool = PlayerPool(players, first_season, rng)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for season in range(first_season, first_season + seasons):
+        if season > first_season:
+            pool.advance(season)
+        path = os.path.join(out_dir, f'{season}MLB_STD_Batting.csv')
+        season_frame(pool, season, rng, np_rng).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=1, help='Number of seasons (1-150).')
+    parser.add_argument('--players', type=int, default=1200, help='Active players per season.')
+    parser.add_argument('--first-season', type=int, help='First season (default: ends at 2024).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help='Output directory.')
+    args = parser.parse_args()
+    if not 1 <= args.seasons <= 150:
+        parser.error('--seasons must be between 1 and 150')
+    paths = generate(args.out, args.seasons, args.players, args.first_season, args.seed)
+    print(f"Wrote {len(paths)} season file(s) to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+HTTP load test for the Flask API.
+
+Sends GET requests to a fixed set of API paths from --concurrency client
+threads for --duration seconds and reports throughput and latency
+percentiles (run_load() also takes (path, JSON body) pairs, sent as
+POSTs). Run it against an already running server:
+
+    python benchmarks/load_test.py --url http://localhost:5001
+
+or let it start gunicorn itself once per worker count, to check that
+throughput scales with the number of workers:
+
+    DATABASE_URL=sqlite:////tmp/api.db python benchmarks/load_test.py --workers 1,2,4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+DEFAULT_PATHS = [
+    '/api/players',
+    '/api/season_stats/2023',
+    '/api/season_stats/2023?format=columns&fields=player_id,war',
+    '/api/season_stats/2023/rank/war?top=10'
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_request(base_url, target):
+    """
+    A request for target: a path (GET) or a (path, JSON body) pair (POST).
+    """
+    if isinstance(target, str):
+        return urllib.request.Request(base_url + target)
+    path, body = target
+    return urllib.request.Request(base_url + path, data=json.dumps(body).encode('utf-8'), method='POST',
+                                  headers={'Content-Type': 'application/json'})
+
+
+def run_load(base_url, paths, concurrency, duration):
+    """
+    Hammers base_url + paths (round-robin per client) until duration elapses;
+    see build_request() for what an entry of paths can be.
+    Returns a dict of request counts, errors, requests/second and latencies (ms).
+    """
+    requests = [build_request(base_url, target) for target in paths]
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def client(offset):
+        opener = urllib.request.build_opener()
+        local_latencies = []
+        local_errors = 0
+        i = offset
+        while time.perf_counter() < deadline:
+            request = requests[i % len(requests)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                with opener.open(request, timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                local_errors += 1
+                continue
+            local_latencies.append((time.perf_counter() - started) * 1000.0)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        }
+    }
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + '/api/cache_stats', timeout=2):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not come up within {timeout}s")
+
+
+def start_gunicorn(workers, port, extra_env=None):
+    """
+    Starts gunicorn serving app.py with the given worker count and returns
+    (process, base_url) once it answers requests.
+    """
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_BIND=f'127.0.0.1:{port}')
+    env.update(extra_env or {})
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', '/dev/null', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_up(base_url)
+    except RuntimeError:
+        server.terminate()
+        server.wait()
+        raise
+    return server, base_url
+
+
+def run_with_gunicorn(workers, port, args):
+    """
+    Starts gunicorn with the given worker count, load tests it and stops it.
+    """
+    server, base_url = start_gunicorn(workers, port)
+    try:
+        run_load(base_url, args.paths, args.concurrency, min(args.duration, 2)) # warm caches
+        result = run_load(base_url, args.paths, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+    result['workers'] = workers
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5001', help='Base URL of a running server.')
+    parser.add_argument('--workers', help='Comma separated gunicorn worker counts to start and compare, e.g. 1,2,4.')
+    parser.add_argument('--port', type=int, default=5055, help='Port for the gunicorn servers started by --workers.')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run.')
+    parser.add_argument('--path', dest='paths', action='append', help='API path to request (repeatable).')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+    args = parser.parse_args()
+    args.paths = args.paths or DEFAULT_PATHS
+
+    if args.workers:
+        results = [run_with_gunicorn(int(count), args.port, args) for count in args.workers.split(',')]
+    else:
+        results = [run_load(args.url.rstrip('/'), args.paths, args.concurrency, args.duration)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        label = f"workers={result['workers']:<3} " if 'workers' in result else ''
+        latency = result['latency_ms']
+        print(f"{label}concurrency={result['concurrency']:<4} {result['requests_per_s']:8.1f} req/s  "
+              f"p50 {latency['p50']:7.2f}ms  p95 {latency['p95']:7.2f}ms  p99 {latency['p99']:7.2f}ms  "
+              f"errors {result['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Runs the benchmark suite and writes one JSON result file.
+
+Generates synthetic season CSVs (generate_batting.py), benchmarks the loader
+(bench_loader.py), then load tests the API routes against the database the
+loader filled (bench_api.py). Everything runs offline: by default against
+temporary SQLite files, or against a local MySQL container with --db-url
+and --reset-db. Compare two result files with compare_results.py.
+
+    python benchmarks/run_benchmarks.py --seasons 20
+    python benchmarks/run_benchmarks.py --seasons 150 --skip-api --output /tmp/full.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import bench_api  # noqa: E402
+import bench_loader  # noqa: E402
+from generate_batting import generate  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+
+def git_revision():
+    """
+    (commit, dirty) of the working tree, or (None, None) outside git.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BENCHMARKS_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seasons', type=int, default=10, help='Synthetic seasons to generate (1-150).')
+    parser.add_argument('--players', type=int, default=1200, help='Active players per season.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='Reuse (or create) the CSVs here instead of a temporary directory.')
+    parser.add_argument('--db-url', help='Database to use instead of temporary SQLite files, e.g. a local '
+                                         'MySQL container.')
+    parser.add_argument('--reset-db', action='store_true', help="Allow dropping the loader's tables at --db-url.")
+    parser.add_argument('--loader-workers', type=int, default=1)
+    parser.add_argument('--api-workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds of load per API route.')
+    parser.add_argument('--skip-api', action='store_true')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<time>-<commit>.json).')
+    args = parser.parse_args()
+    if not 1 <= args.seasons <= 150:
+        parser.error('--seasons must be between 1 and 150')
+
+    commit, dirty = git_revision()
+    started = time.perf_counter()
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='batting_bench_')
+    paths = [os.path.join(data_dir, name) for name in os.listdir(data_dir)] if args.data_dir and os.listdir(data_dir) \
+        else generate(data_dir, args.seasons, args.players, seed=args.seed)
+    print(f"Benchmarking with {len(paths)} season file(s) in {data_dir}", file=sys.stderr)
+
+    loader_result, loaded_url = bench_loader.run(data_dir, args.db_url, args.reset_db,
+                                                 workers=args.loader_workers)
+    result = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'database': 'sqlite' if args.db_url is None else args.db_url.split(':', 1)[0]
+        },
+        'data': {'seasons': len(paths), 'players_per_season': args.players, 'seed': args.seed,
+                 'stat_rows': loader_result['stages']['rows']},
+        'loader': loader_result
+    }
+    if not args.skip_api:
+        result['api'] = bench_api.run(loaded_url, args.concurrency, args.duration, args.api_workers)
+    result['meta']['total_seconds'] = round(time.perf_counter() - started, 1)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
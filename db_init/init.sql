@@ -42,7 +42,10 @@ CREATE TABLE IF NOT EXISTS player_stats (
     ibb INT,
     position_played VARCHAR(50),
     lg VARCHAR(10),
-    FOREIGN KEY (player_id) REFERENCES players(player_id)
+    row_hash CHAR(40),
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    UNIQUE KEY uq_player_stats_line (player_id, season, team, lg),
+    INDEX ix_player_stats_season (season, player_id)
 );
 
 CREATE TABLE IF NOT EXISTS player_contracts (
@@ -55,5 +58,67 @@ CREATE TABLE IF NOT EXISTS player_contracts (
     current_year_salary_usd BIGINT,
     year_in_contract INT,
     contract_notes TEXT,
-    FOREIGN KEY (player_id) REFERENCES players(player_id)
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    INDEX ix_player_contracts_player_start (player_id, contract_start_year)
+);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    file_id INT AUTO_INCREMENT PRIMARY KEY,
+    file_name VARCHAR(255) NOT NULL,
+    file_sha256 CHAR(64) NOT NULL,
+    seasons VARCHAR(1000),
+    row_count INT NOT NULL,
+    rows_inserted INT NOT NULL,
+    rows_updated INT NOT NULL,
+    rows_deleted INT NOT NULL,
+    rows_unchanged INT NOT NULL,
+    loaded_at DATETIME NOT NULL,
+    INDEX ix_ingested_files_file_sha256 (file_sha256)
+);
+
+CREATE TABLE IF NOT EXISTS season_versions (
+    season INT PRIMARY KEY,
+    version INT NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+
+-- Applied by backend/migrations.py; the tables above already include every migration
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at DATETIME NOT NULL
+);
+
+-- Per-season summaries by league and primary position ('*' = all), rebuilt by the loader
+CREATE TABLE IF NOT EXISTS season_aggregates (
+    season INT NOT NULL,
+    lg VARCHAR(10) NOT NULL,
+    position VARCHAR(10) NOT NULL,
+    stat VARCHAR(20) NOT NULL,
+    n INT NOT NULL,
+    total DOUBLE,
+    mean DOUBLE,
+    stddev DOUBLE,
+    min_value DOUBLE,
+    p10 DOUBLE,
+    p25 DOUBLE,
+    median DOUBLE,
+    p75 DOUBLE,
+    p90 DOUBLE,
+    max_value DOUBLE,
+    league_rate DOUBLE,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (season, lg, position, stat)
+);
+
+-- Identifiers resolved to a canonical player_id (legacy generated IDs, name|birth year), written by the loader
+CREATE TABLE IF NOT EXISTS player_aliases (
+    alias_type VARCHAR(20) NOT NULL,
+    alias VARCHAR(100) NOT NULL,
+    player_id VARCHAR(50) NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    score DOUBLE,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (alias_type, alias),
+    INDEX ix_player_aliases_player_id (player_id)
 );
@@ -9,10 +9,15 @@ const DEFAULT_SEASON = 2025; // Default is current season
 
 const App = () => {
   const [selectedPlayerId, setSelectedPlayerId] = useState(null);
+  const [selectedPlayerName, setSelectedPlayerName] = useState('');
   const [selectedSeason, setSelectedSeason] = useState(DEFAULT_SEASON);
 
-  const handleSelectPlayer = (playerId) => {
+  // Season is only passed when the selection is a specific player season
+  // (e.g. a similar player from another year)
+  const handleSelectPlayer = (playerId, playerName, season) => {
     setSelectedPlayerId(playerId);
+    setSelectedPlayerName(playerName || '');
+    if (season) setSelectedSeason(season);
   };
 
   const handleSeasonChange = (season) => {
@@ -24,7 +29,11 @@ const App = () => {
       <Header />
       <div className="main-layout-content">
         <aside className="sidebar"> 
-          <PlayerList onSelectPlayer={handleSelectPlayer} selectedPlayerId={selectedPlayerId} />
+          <PlayerList
+            onSelectPlayer={handleSelectPlayer}
+            selectedPlayerId={selectedPlayerId}
+            selectedPlayerName={selectedPlayerName}
+          />
           <div className="season-selector">
             <h3>Select Season:</h3>
             <input
@@ -38,7 +47,7 @@ const App = () => {
           </div>
         </aside>
         <main className="main-content-area"> 
-          <PlayerDetail playerId={selectedPlayerId} selectedSeason={selectedSeason} />
+          <PlayerDetail playerId={selectedPlayerId} selectedSeason={selectedSeason} onSelectPlayer={handleSelectPlayer} />
         </main>
       </div>
       <Footer />
@@ -19,6 +19,19 @@ export const getAllPlayers = async () => {
   }
 };
 
+// Typeahead search over player names (accent and case insensitive).
+export const searchPlayers = async (query, { limit = 10, cursor = null } = {}) => {
+  try {
+    const params = new URLSearchParams({ q: query, limit });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${FLASK_API_URL}/api/players/search?${params}`);
+    return await handleApiResponse(response, `Error searching players for "${query}".`);
+  } catch (error) {
+    console.error(`Failed to search players for "${query}":`, error);
+    throw error;
+  }
+};
+
 export const getPlayerStatsForSeason = async (playerId, season) => {
   try {
     const response = await fetch(`${FLASK_API_URL}/api/player_stats/${playerId}/${season}`);
@@ -29,6 +42,22 @@ export const getPlayerStatsForSeason = async (playerId, season) => {
   }
 };
 
+// Fetches everything the player detail page shows in one request: the
+// season stats, the comparison with the season's averages and the latest
+// contract (null if none). The server runs the three queries in parallel.
+export const getPlayerDetail = async (playerId, season) => {
+  try {
+    const response = await fetch(`${FLASK_API_URL}/api/player_detail/${playerId}/${season}`);
+    if (response.status === 404) {
+      return null; // No stats for this player in the season
+    }
+    return await handleApiResponse(response, `Error fetching details for ${playerId} in ${season}.`);
+  } catch (error) {
+    console.error(`Failed to fetch player details for ${playerId} in ${season}:`, error);
+    throw error;
+  }
+};
+
 // Uncommenting if I add contract data in the future
 /*
 export const getPlayerContracts = async (playerId) => {
@@ -57,4 +86,37 @@ export const getAllPlayerStatsForSeason = async (season) => {
     console.error(`Failed to fetch all player stats for season ${season}:`, error);
     throw error;
   }
-};
\ No newline at end of file
+};
+
+// Fetches leaders for one stat in a season, plus the given player's rank and
+// percentile and (optionally) a down-sampled distribution sorted by value.
+export const getStatRanking = async (season, stat, playerId, { top = 10, distribution = 0 } = {}) => {
+  try {
+    const params = new URLSearchParams({ top, distribution });
+    if (playerId) params.set('player_id', playerId);
+    const response = await fetch(`${FLASK_API_URL}/api/season_stats/${season}/rank/${stat}?${params}`);
+    if (response.status === 404) {
+      return null; // No values for this stat in the season
+    }
+    return await handleApiResponse(response, `Error fetching ${stat} ranking for season ${season}.`);
+  } catch (error) {
+    console.error(`Failed to fetch ${stat} ranking for season ${season}:`, error);
+    throw error;
+  }
+};
+
+// Fetches the k player seasons most like a player's season, by standardized
+// rate stats. scope is 'season' (that season's players) or 'all' (every season).
+export const getSimilarPlayers = async (playerId, season, { k = 10, scope = 'season' } = {}) => {
+  try {
+    const params = new URLSearchParams({ season, k, scope });
+    const response = await fetch(`${FLASK_API_URL}/api/players/${playerId}/similar?${params}`);
+    if (response.status === 404) {
+      return null; // No stats for this player in the season
+    }
+    return await handleApiResponse(response, `Error fetching players similar to ${playerId} in ${season}.`);
+  } catch (error) {
+    console.error(`Failed to fetch players similar to ${playerId} in ${season}:`, error);
+    throw error;
+  }
+};
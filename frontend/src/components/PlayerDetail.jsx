@@ -1,10 +1,18 @@
 import React, { useState, useEffect } from 'react';
-import { getPlayerStatsForSeason, getAllPlayerStatsForSeason } from '../api/api.js';
+import { getPlayerDetail, getSimilarPlayers, getStatRanking } from '../api/api.js';
 import ScatterPlot from './ScatterPlot.jsx'; 
 
-const PlayerDetail = ({ playerId, selectedSeason }) => {
+const PLOT_POINTS = 200; // Max points requested for the distribution plot
+const SIMILAR_PLAYERS = 5; // Most similar player seasons listed
+
+const PlayerDetail = ({ playerId, selectedSeason, onSelectPlayer }) => {
   const [playerStats, setPlayerStats] = useState(null);
   const [allPlayersStats, setAllPlayersStats] = useState([]);
+  const [statRanking, setStatRanking] = useState(null);
+  const [leagueComparison, setLeagueComparison] = useState(null);
+  const [playerContract, setPlayerContract] = useState(null);
+  const [similarPlayers, setSimilarPlayers] = useState(null);
+  const [similarScope, setSimilarScope] = useState('season');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [selectedStatForPlot, setSelectedStatForPlot] = useState(null);
@@ -51,11 +59,11 @@ const PlayerDetail = ({ playerId, selectedSeason }) => {
     }
   };
 
-  // UseEffect to fetch player's individual stats and all players' stats for the season
+  // UseEffect to fetch player's individual stats for the season
   useEffect(() => {
     if (!playerId) {
       setPlayerStats(null);
-      //setPlayerContract(null); Update when contracts are implemented
+      setPlayerContract(null);
       setAllPlayersStats([]); // Reset all players stats
       setLoading(false);
       return;
@@ -65,22 +73,14 @@ const PlayerDetail = ({ playerId, selectedSeason }) => {
       setLoading(true);
       setError(null);
       try {
-        // Fetch individual player stats
-        const stats = await getPlayerStatsForSeason(playerId, selectedSeason);
-        setPlayerStats(stats);
-
-        // Fetch contract data (even if not displayed, it's good to have the function ready)
-        //const contract = await getPlayerContracts(playerId);
-        //setPlayerContract(contract); 
-        
-        //More contract data handling when implemented ^^
-
-        // Fetch all player stats for the selected season for the scatterplot
-        const allStats = await getAllPlayerStatsForSeason(selectedSeason);
-        setAllPlayersStats(allStats);
-
+        // Stats, league averages and contract in one request; the server
+        // queries them in parallel. Comparison and contract may be null.
+        const detail = await getPlayerDetail(playerId, selectedSeason);
+        setPlayerStats(detail?.stats ?? null);
+        setLeagueComparison(detail?.comparison ?? null);
+        setPlayerContract(detail?.contract ?? null);
       } catch (err) {
-        console.error("Error fetching player details or all season stats:", err);
+        console.error("Error fetching player details:", err);
         setError(err.message);
       } finally {
         setLoading(false);
@@ -90,6 +90,49 @@ const PlayerDetail = ({ playerId, selectedSeason }) => {
     fetchDetailData();
   }, [playerId, selectedSeason]); // Re-run effect when playerId or selectedSeason changes
 
+  // Fetch the player's rank and a down-sampled, pre-sorted distribution of the plotted stat
+  useEffect(() => {
+    if (!playerId || !selectedStatForPlot) {
+      setAllPlayersStats([]);
+      setStatRanking(null);
+      return;
+    }
+
+    let cancelled = false;
+    getStatRanking(selectedSeason, selectedStatForPlot, playerId, { distribution: PLOT_POINTS })
+      .then(ranking => {
+        if (cancelled) return;
+        setStatRanking(ranking);
+        setAllPlayersStats((ranking?.distribution || []).map(point => ({
+          player_id: point.player_id,
+          player_name: point.player_name,
+          [selectedStatForPlot]: point.value
+        })));
+      })
+      .catch(err => {
+        if (!cancelled) setError(err.message);
+      });
+    return () => { cancelled = true; };
+  }, [playerId, selectedSeason, selectedStatForPlot]);
+
+  // Players most like this one; optional, so failures just hide the section
+  useEffect(() => {
+    if (!playerId) {
+      setSimilarPlayers(null);
+      return;
+    }
+
+    let cancelled = false;
+    getSimilarPlayers(playerId, selectedSeason, { k: SIMILAR_PLAYERS, scope: similarScope })
+      .then(result => {
+        if (!cancelled) setSimilarPlayers(result);
+      })
+      .catch(() => {
+        if (!cancelled) setSimilarPlayers(null);
+      });
+    return () => { cancelled = true; };
+  }, [playerId, selectedSeason, similarScope]);
+
   if (!playerId) {
     return <div className="info-message">Please select a player from the sidebar to view details.</div>;
   }
@@ -197,6 +240,47 @@ const PlayerDetail = ({ playerId, selectedSeason }) => {
         )}
       </div>
 
+      {playerContract && (
+        <div className="section-card contract-details">
+          <h3 className="section-title">Contract</h3>
+          <p>
+            <strong>{playerContract.contract_start_year}-{playerContract.contract_end_year}</strong>
+            {playerContract.year_in_contract && <> (year {playerContract.year_in_contract})</>}
+          </p>
+          {playerContract.total_value_usd && <p>Total value: <strong>${playerContract.total_value_usd.toLocaleString()}</strong></p>}
+          {playerContract.avg_annual_value_usd && <p>Average annual value: <strong>${playerContract.avg_annual_value_usd.toLocaleString()}</strong></p>}
+          {playerContract.current_year_salary_usd && <p>Current salary: <strong>${playerContract.current_year_salary_usd.toLocaleString()}</strong></p>}
+          {playerContract.contract_notes && <p>{playerContract.contract_notes}</p>}
+        </div>
+      )}
+
+      {similarPlayers?.similar?.length > 0 && (
+        <div className="section-card">
+          <h3 className="section-title">
+            Most Similar Players
+            <select
+              className="similar-scope-select"
+              value={similarScope}
+              onChange={(e) => setSimilarScope(e.target.value)}
+            >
+              <option value="season">{selectedSeason} season</option>
+              <option value="all">All seasons</option>
+            </select>
+          </h3>
+          <ol className="similar-players-list">
+            {similarPlayers.similar.map(player => (
+              <li key={`${player.player_id}-${player.season}`}>
+                <button className="similar-player-button" onClick={() => onSelectPlayer?.(player.player_id, player.player_name, player.season)}>
+                  {player.player_name}
+                </button>
+                <span> {player.season} {player.team}: {player.stats.obp.toFixed(3)} OBP, {player.stats.slg.toFixed(3)} SLG, {player.pa} PA</span>
+                <span className="similar-distance"> (distance {player.distance.toFixed(2)})</span>
+              </li>
+            ))}
+          </ol>
+        </div>
+      )}
+
       {/* Scatterplot Section, conditionally rendered */}
       {selectedStatForPlot && allPlayersStats.length > 0 && (
         <div className="section-card scatterplot-section">
@@ -206,6 +290,21 @@ const PlayerDetail = ({ playerId, selectedSeason }) => {
               &times; Close Plot
             </button>
           </h3>
+          {statRanking?.player && (
+            <p className="stat-rank-info">
+              Ranked <strong>#{statRanking.player.rank}</strong> of {statRanking.count} players
+              ({statRanking.player.percentile.toFixed(1)} percentile)
+            </p>
+          )}
+          {leagueComparison?.stats?.[selectedStatForPlot] && (
+            <p className="stat-rank-info">
+              League average: <strong>{leagueComparison.stats[selectedStatForPlot].league_rate !== null && ['obp', 'slg', 'ops', 'roba'].includes(selectedStatForPlot)
+                ? leagueComparison.stats[selectedStatForPlot].league_rate.toFixed(3)
+                : leagueComparison.stats[selectedStatForPlot].mean.toFixed(1)}</strong>
+              {leagueComparison.stats[selectedStatForPlot].z_score !== null &&
+                <> (z-score {leagueComparison.stats[selectedStatForPlot].z_score.toFixed(2)})</>}
+            </p>
+          )}
           <ScatterPlot
             data={allPlayersStats}
             statisticKey={selectedStatForPlot}
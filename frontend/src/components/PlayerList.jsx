@@ -1,64 +1,95 @@
 import React, { useState, useEffect } from 'react';
-import { getAllPlayers } from '../api/api.js';
+import { searchPlayers } from '../api/api.js';
 
-const PlayerList = ({ onSelectPlayer, selectedPlayerId }) => {
-  const [players, setPlayers] = useState([]);
-  const [loading, setLoading] = useState(true);
+const SEARCH_DELAY_MS = 150; // Wait for a pause in typing before searching
+const RESULTS_PER_PAGE = 15;
+
+const PlayerList = ({ onSelectPlayer, selectedPlayerId, selectedPlayerName }) => {
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
 
+  // Search as the user types, ignoring responses to outdated queries
   useEffect(() => {
-    const fetchPlayersData = async () => {
+    if (!query.trim()) {
+      setResults([]);
+      setNextCursor(null);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      setLoading(true);
+      setError(null);
       try {
-        const data = await getAllPlayers();
-        setPlayers(data);
+        const data = await searchPlayers(query, { limit: RESULTS_PER_PAGE });
+        if (cancelled) return;
+        setResults(data.results);
+        setNextCursor(data.next_cursor);
       } catch (err) {
-        setError(err.message);
+        if (!cancelled) setError(err.message);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
+    }, SEARCH_DELAY_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
     };
+  }, [query]);
 
-    fetchPlayersData();
-  }, []);
-
-  // Prepare options for the select dropdown
-  const playerOptions = players.map(p => ({
-    label: p.player_name,
-    value: p.player_id
-  }));
-
-  // Find the selected player's name for display in the dropdown
-  const currentSelectedLabel = playerOptions.find(opt => opt.value === selectedPlayerId)?.label || '';
+  const loadMore = async () => {
+    try {
+      const data = await searchPlayers(query, { limit: RESULTS_PER_PAGE, cursor: nextCursor });
+      setResults(prev => [...prev, ...data.results]);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError(err.message);
+    }
+  };
 
   return (
     <div className="player-list-sidebar">
       <h3 className="sidebar-heading">Select Player:</h3>
-      {loading && <p className="loading-message">Loading players...</p>}
+      <input
+        type="search"
+        className="player-select-dropdown"
+        placeholder="Search players..."
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+      />
+      {loading && <p className="loading-message">Searching...</p>}
       {error && (
         <div className="error-message" role="alert">
           <strong>Error!</strong>
           <span> {error}</span>
         </div>
       )}
-      {!loading && !error && players.length === 0 && (
-        <p className="no-players-message">No players found. Check your Flask API.</p>
+      {!loading && !error && query.trim() && results.length === 0 && (
+        <p className="no-players-message">No players match "{query}".</p>
       )}
-      {!loading && !error && players.length > 0 && (
-        <select
-          className="player-select-dropdown"
-          onChange={(e) => onSelectPlayer(e.target.value)}
-          value={selectedPlayerId || ''} // Set value to control the select component
-        >
-          <option value="">-- Select a player --</option>
-          {playerOptions.map(option => (
-            <option key={option.value} value={option.value}>
-              {option.label}
-            </option>
+      {results.length > 0 && (
+        <ul className="player-search-results">
+          {results.map(player => (
+            <li
+              key={player.player_id}
+              className={player.player_id === selectedPlayerId ? 'selected' : ''}
+              onClick={() => onSelectPlayer(player.player_id, player.player_name)}
+              title={player.player_id}
+            >
+              {player.player_name}
+              {player.match === 'fuzzy' && <span className="player-search-hint"> (similar)</span>}
+            </li>
           ))}
-        </select>
+          {nextCursor && (
+            <li className="player-search-more" onClick={loadMore}>Show more...</li>
+          )}
+        </ul>
       )}
       {selectedPlayerId && (
-        <p className="selected-player-info">Selected: <strong>{currentSelectedLabel}</strong></p>
+        <p className="selected-player-info">Selected: <strong>{selectedPlayerName || selectedPlayerId}</strong></p>
       )}
     </div>
   );
@@ -4,7 +4,7 @@ import * as d3 from 'd3';
 // Note: Used Google Gemini to assist with this component. Wrote initial structure then refined the UI using the AI's suggestions.
 
 const ScatterPlot = ({
-  data, // Array of { player_id, player_name, [statisticKey]: value, ... } for all players in the season
+  data, // Array of { player_id, player_name, [statisticKey]: value }, already sorted ascending by value (see /rank endpoint)
   statisticKey,
   statisticLabel, // for axis label and tooltips
   selectedPlayerId, 
@@ -20,16 +20,8 @@ const ScatterPlot = ({
       return;
     }
 
-    // Filter out data points where the statisticKey value is null or undefined
-    const validData = data.filter(d => d[statisticKey] !== null && d[statisticKey] !== undefined);
-
-    if (validData.length === 0) {
-      d3.select(svgReference.current).selectAll('*').remove();
-      return;
-    }
-
-    // Copy the data and sort it by statisticKey
-    const sortedData = [...validData].sort((a, b) => (a[statisticKey] || 0) - (b[statisticKey] || 0));
+    // The server returns the distribution without nulls and sorted by value
+    const sortedData = data;
 
     const margin = { top: 40, right: 30, bottom: 80, left: 70 }; // Increased bottom margin for player names
     const width = 800 - margin.left - margin.right;